@@ -0,0 +1,209 @@
+"""
+Archival of finished reminders.
+
+Reminders whose call is over (completed, busy, no-answer, failed, missed)
+are moved from ``reminders`` to ``reminders_archive`` once they are
+ARCHIVE_AFTER_DAYS old, so the live table and its indexes only hold what
+the scheduler and the API still work on. The read API falls back to the
+archive (GET /api/reminders/{id}, lists that can match finished
+reminders, export), so archiving changes no response.
+
+The Archiver thread runs in the process that runs the scheduler, every
+ARCHIVE_INTERVAL_SECONDS. Each batch is one short transaction: DELETE
+... RETURNING of up to ARCHIVE_BATCH_SIZE rows, then an INSERT of the
+same rows into the archive, with a pause between batches so other writers
+get the lock. Several processes may archive at once: a row is only
+inserted by the transaction that deleted it.
+
+Kept in the live table regardless of age:
+- reminders with a dead letter that has not been replayed
+- recurring series that live occurrences still point at
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.orm import aliased
+
+from app.database import DATABASE_URL, SessionLocal, is_sqlite
+from app.models import ArchivedReminder, DeadLetter, Reminder
+from app.timezones import utcnow
+
+
+logger = logging.getLogger(__name__)
+
+
+# Days after its due time (and last update) a finished reminder is archived
+# (0 turns archival off)
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+
+# How often the archiver runs; the first run is at most a minute after startup
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+# Rows moved per transaction, and the pause between transactions
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+ARCHIVE_BATCH_PAUSE_SECONDS = float(os.getenv("ARCHIVE_BATCH_PAUSE_SECONDS", "0.05"))
+
+# Statuses a reminder does not leave again
+ARCHIVABLE_STATUSES = ("completed", "busy", "no-answer", "failed", "missed")
+
+# Columns copied to the archive (archived_at is set by the database)
+ARCHIVED_COLUMNS = [column.name for column in ArchivedReminder.__table__.columns if column.name != "archived_at"]
+
+
+def _archivable(cutoff) -> tuple:
+    """WHERE clauses for reminders that may be archived."""
+    occurrence = aliased(Reminder)
+    return (
+        Reminder.status.in_(ARCHIVABLE_STATUSES),
+        Reminder.scheduled_time < cutoff,
+        Reminder.updated_at < cutoff,
+        ~exists().where(DeadLetter.reminder_id == Reminder.id, DeadLetter.replayed_at.is_(None)),
+        ~exists().where(occurrence.series_id == Reminder.id),
+    )
+
+
+def archive_batch(db, cutoff, limit: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Move up to ``limit`` archivable reminders older than ``cutoff`` to the
+    archive, in one transaction (commits).
+
+    Args:
+        db: Session
+        cutoff: Naive UTC; reminders due and last updated before it move
+        limit: Rows moved at most
+
+    Returns:
+        Number of reminders archived
+    """
+    candidates = select(Reminder.id).where(*_archivable(cutoff)).limit(limit)
+    if not is_sqlite(DATABASE_URL):
+        # Archivers running at the same moment split the rows
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    # One statement, so the rows are picked under the write lock; the outer
+    # WHERE is only the id, so the delete goes by primary key
+    table = Reminder.__table__
+    rows = db.execute(
+        delete(table)
+        .where(table.c.id.in_(candidates))
+        .returning(*(table.c[name] for name in ARCHIVED_COLUMNS))
+    ).mappings().all()
+
+    if rows:
+        archived_ids = [row["id"] for row in rows]
+        # Replayed dead letters go with their reminder (ON DELETE CASCADE,
+        # when the database enforces it)
+        db.execute(delete(DeadLetter).where(DeadLetter.reminder_id.in_(archived_ids)))
+        db.execute(insert(ArchivedReminder.__table__), [dict(row) for row in rows])
+    db.commit()
+    return len(rows)
+
+
+class Archiver:
+    """
+    Background thread moving old finished reminders to the archive.
+
+    Every ``interval`` seconds it archives in batches until nothing older
+    than ``after_days`` is left, or it is stopped. One runs per shard, on
+    ``session_factory``.
+    """
+
+    def __init__(self, after_days: float = ARCHIVE_AFTER_DAYS,
+                 interval: float = ARCHIVE_INTERVAL_SECONDS,
+                 batch_size: int = ARCHIVE_BATCH_SIZE,
+                 pause: float = ARCHIVE_BATCH_PAUSE_SECONDS,
+                 session_factory=SessionLocal):
+        self.after_days = after_days
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause = pause
+        self.thread = None
+        self.stopped = threading.Event()
+
+        # Metrics
+        self.runs = 0
+        self.archived = 0
+        self.last_run_seconds = None
+        self.max_batch_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.after_days > 0
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running or not self.enabled:
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, name="archiver", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.stopped.set()
+        self.thread.join()
+
+    def _run(self):
+        delay = min(60.0, self.interval)
+        while not self.stopped.wait(delay):
+            delay = self.interval
+            try:
+                self.run()
+            except Exception:
+                logger.exception("Archiving reminders failed")
+
+    def run(self) -> int:
+        """
+        Archive everything past the retention window, batch by batch.
+
+        Returns:
+            Number of reminders archived
+        """
+        cutoff = utcnow() - timedelta(days=self.after_days)
+        started = time.perf_counter()
+        archived = 0
+
+        while not self.stopped.is_set():
+            batch_started = time.perf_counter()
+            db = self.session_factory()
+            try:
+                moved = archive_batch(db, cutoff, self.batch_size)
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+            self.max_batch_seconds = max(self.max_batch_seconds, time.perf_counter() - batch_started)
+
+            archived += moved
+            self.archived += moved
+            if moved < self.batch_size:
+                break
+            self.stopped.wait(self.pause)
+
+        self.runs += 1
+        self.last_run_seconds = time.perf_counter() - started
+        if archived:
+            logger.info("Archived %d reminders older than %s in %.1fs", archived, cutoff, self.last_run_seconds)
+        return archived
+
+    def stats(self) -> dict:
+        """Counters for debugging."""
+        return {
+            "running": self.running,
+            "after_days": self.after_days,
+            "runs": self.runs,
+            "archived": self.archived,
+            "last_run_seconds": self.last_run_seconds,
+            "max_batch_seconds": self.max_batch_seconds,
+        }
@@ -0,0 +1,268 @@
+"""
+Read-through cache for reminder responses.
+
+Entries hold the serialized JSON body and its ETag, so a hit is served
+(or answered with 304 Not Modified) without touching the database or
+re-serializing ReminderResponse. Two kinds of keys are stored:
+
+- ``("id", reminder_id)``: GET /api/reminders/{id}
+- ``("list", filters, page)``: GET /api/reminders/ for one filter and page
+
+Writers invalidate precisely: the id entry of the changed reminder, plus
+every list entry whose filters match the reminder before or after the
+change. Entries expire after CACHE_TTL seconds and the least recently
+used ones are evicted beyond CACHE_MAX_ENTRIES or CACHE_MAX_BYTES.
+
+Each process has its own cache. With ``shared`` set (CACHE_SHARED, on
+by default) every invalidation is also queued for the other API processes
+(uvicorn --workers, replicas): app/scheduler.py sends the queue through
+the notifications table and applies what the others sent, dropping the
+reminder's entry and every list. Writes made outside the app are only
+picked up when the TTL expires.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+# Seconds a cached response stays valid
+CACHE_TTL = float(os.getenv("CACHE_TTL", "60"))
+
+# Caps on cached responses (count and total body size)
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Send invalidations to the other API processes through the notifications table
+CACHE_SHARED = os.getenv("CACHE_SHARED", "true").lower() == "true"
+
+# Above this many queued invalidations the other processes clear their whole cache
+SHARED_QUEUE_CLEAR = 1000
+
+
+class CachedResponse:
+    """A serialized response body with its ETag and extra headers."""
+
+    __slots__ = ("body", "etag", "headers", "expires")
+
+    def __init__(self, body: bytes, headers: dict, expires: float):
+        self.body = body
+        self.headers = headers
+        self.expires = expires
+        digest = hashlib.blake2b(body, digest_size=16)
+        for name, value in sorted(headers.items()):
+            digest.update(f"\n{name}:{value}".encode())
+        self.etag = f'"{digest.hexdigest()}"'
+
+
+def snapshot(reminder) -> tuple:
+    """The fields list filters match on: (status, phone_number, scheduled_time)."""
+    return (reminder.status, reminder.phone_number, reminder.scheduled_time)
+
+
+def _matches(filters: tuple, state: tuple) -> bool:
+    """Whether a reminder in ``state`` can appear in a list with ``filters``."""
+    # The series filter is not part of the state; matching more is safe
+    status, phone_number, scheduled_after, scheduled_before = filters[:4]
+    state_status, state_phone, state_time = state
+
+    if status and status != state_status:
+        return False
+    if phone_number and phone_number != state_phone:
+        return False
+
+    try:
+        if scheduled_after and state_time < scheduled_after:
+            return False
+        if scheduled_before and state_time >= scheduled_before:
+            return False
+    except TypeError:
+        # Naive vs aware datetimes; assume it matches
+        pass
+
+    return True
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU of CachedResponse with TTL, entry and byte caps.
+
+    Readers call ``token()`` before querying the database and pass it to
+    ``put()``; if anything was invalidated in between, the (possibly stale)
+    result is not stored.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES,
+                 max_bytes: int = CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.size = 0
+        self.generation = 0
+
+        # Invalidations for the other processes: (action, reminder_id)
+        self.shared = False
+        self.outbox = []
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.shared_sent = 0
+        self.shared_received = 0
+
+    def get(self, key):
+        """Return the live CachedResponse for key, or None (counts hit/miss)."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires <= time.monotonic():
+                self._drop(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def token(self) -> int:
+        """Invalidation generation to pass to put()."""
+        return self.generation
+
+    def put(self, key, body: bytes, headers: dict = None, token: int = None) -> CachedResponse:
+        """
+        Cache a serialized response and return it.
+
+        The entry is built (and returned) either way, but only stored if
+        nothing was invalidated since ``token`` was taken.
+        """
+        entry = CachedResponse(body, headers or {}, time.monotonic() + self.ttl)
+
+        with self.lock:
+            if token is not None and token != self.generation:
+                return entry
+            if len(body) > self.max_bytes:
+                return entry
+
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = entry
+            self.size += len(body)
+
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.evictions += 1
+
+        return entry
+
+    def invalidate(self, reminder_id: int, *states, share: bool = True):
+        """
+        Drop the entry for reminder_id and every list whose filters match
+        any of ``states`` (see snapshot(); pass the before and after states).
+
+        ``share=False`` keeps the invalidation from the other processes
+        (for changes every process hears about anyway).
+        """
+        with self.lock:
+            self._drop_where(
+                lambda key: (key[0] == "id" and key[1] == reminder_id)
+                or (key[0] == "list" and any(_matches(key[1], state) for state in states))
+            )
+            if share:
+                self._share("invalidate", reminder_id)
+
+    def invalidate_lists(self, share: bool = True):
+        """Drop every list entry (for bulk writes)."""
+        with self.lock:
+            self._drop_where(lambda key: key[0] == "list")
+            if share:
+                self._share("invalidate", None)
+
+    def clear(self, share: bool = True):
+        """Drop everything (for writes that touch unknown rows)."""
+        with self.lock:
+            self.generation += 1
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            self.size = 0
+            if share:
+                self._share("clear", None)
+
+    def take_shared(self) -> list:
+        """Return and empty the queued (action, reminder_id) invalidations."""
+        with self.lock:
+            outbox, self.outbox = self.outbox, []
+            self.shared_sent += len(outbox)
+        return outbox
+
+    def apply_shared(self, invalidations):
+        """
+        Apply (action, reminder_id) invalidations from another process.
+        Their states are not sent, so every list is dropped.
+        """
+        invalidations = list(invalidations)
+        with self.lock:
+            self.shared_received += len(invalidations)
+            if any(action == "clear" for action, _ in invalidations):
+                self.generation += 1
+                self.invalidations += len(self.entries)
+                self.entries.clear()
+                self.size = 0
+                return
+            ids = {reminder_id for _, reminder_id in invalidations}
+            self._drop_where(lambda key: key[0] == "list" or (key[0] == "id" and key[1] in ids))
+
+    def _share(self, action: str, reminder_id):
+        """Queue an invalidation for the other processes (caller holds the lock)."""
+        if not self.shared:
+            return
+        if self.outbox and self.outbox[-1][0] == "clear":
+            return
+        if action == "clear" or len(self.outbox) >= SHARED_QUEUE_CLEAR:
+            self.outbox = [("clear", None)]
+        else:
+            self.outbox.append((action, reminder_id))
+
+    def _drop_where(self, stale):
+        """Remove the keys ``stale(key)`` is true for (caller holds the lock)."""
+        self.generation += 1
+        keys = [key for key in self.entries if stale(key)]
+        for key in keys:
+            self._drop(key)
+        self.invalidations += len(keys)
+
+    def _drop(self, key):
+        """Remove key (caller holds the lock)."""
+        self.size -= len(self.entries.pop(key).body)
+
+    def stats(self) -> dict:
+        """Counters for debugging."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "shared": self.shared,
+            "shared_sent": self.shared_sent,
+            "shared_received": self.shared_received,
+        }
+
+
+# Shared cache for reminder responses
+reminder_cache = ResponseCache()
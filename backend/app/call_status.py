@@ -0,0 +1,295 @@
+"""
+Call lifecycle tracking from Twilio status callbacks.
+
+Twilio POSTs call progress (initiated, ringing, in-progress, completed,
+busy, no-answer, failed, canceled) to the webhook in
+app/routes/twilio_webhooks.py instead of us polling each call. Updates
+are buffered here and applied to ``reminders`` in one transaction per
+flush (per shard), so a burst of calls costs a few batched writes rather than one
+write per callback:
+
+- updates for the same call within a flush collapse to the furthest state
+- states only move forward, so late or out-of-order callbacks are ignored
+- callbacks that arrive before the call SID is stored are retried for
+  STATUS_UNMATCHED_SECONDS
+- a call placed for several coalesced reminders updates all of them
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy import select, update
+
+from app.database import shards
+from app.models import Reminder
+
+
+logger = logging.getLogger(__name__)
+
+
+# Flush buffered updates every STATUS_FLUSH_SECONDS or at STATUS_BATCH_SIZE
+STATUS_FLUSH_SECONDS = float(os.getenv("STATUS_FLUSH_SECONDS", "0.5"))
+STATUS_BATCH_SIZE = int(os.getenv("STATUS_BATCH_SIZE", "500"))
+
+# How long a callback for an unknown call SID is kept and retried
+STATUS_UNMATCHED_SECONDS = float(os.getenv("STATUS_UNMATCHED_SECONDS", "30"))
+
+# Twilio CallStatus -> reminder status
+TWILIO_STATUSES = {
+    "queued": "calling",
+    "initiated": "calling",
+    "ringing": "ringing",
+    "in-progress": "answered",
+    "completed": "completed",
+    "busy": "busy",
+    "no-answer": "no-answer",
+    "failed": "failed",
+    "canceled": "failed",
+}
+
+# Order of reminder statuses along a call; terminal states share a rank
+STATUS_RANK = {
+    "scheduled": 0,
+    "retrying": 0,
+    "calling": 1,
+    "ringing": 2,
+    "answered": 3,
+    "completed": 4,
+    "busy": 4,
+    "no-answer": 4,
+    "failed": 4,
+    "missed": 4,
+}
+
+
+class CallStatusUpdate:
+    """The furthest state seen for one call SID since the last flush."""
+
+    __slots__ = ("call_sid", "status", "error_message", "received")
+
+    def __init__(self, call_sid: str, status: str, error_message: str = None):
+        self.call_sid = call_sid
+        self.status = status
+        self.error_message = error_message
+        self.received = time.monotonic()
+
+
+class StatusIngestor:
+    """
+    Buffers status callbacks and applies them in batched transactions.
+
+    add() is called from the webhook and only touches an in-memory dict;
+    a background thread flushes it.
+    """
+
+    def __init__(self, flush_seconds: float = STATUS_FLUSH_SECONDS,
+                 batch_size: int = STATUS_BATCH_SIZE):
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.pending = {}
+        self.condition = threading.Condition()
+        self.thread = None
+        self._running = False
+
+        # Metrics
+        self.received = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.applied = 0
+        self.stale = 0
+        self.expired = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self.thread = threading.Thread(target=self._run, name="call-status", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Flush what is buffered and stop the flush thread."""
+        if not self._running:
+            return
+
+        with self.condition:
+            self._running = False
+            self.condition.notify()
+
+        self.thread.join()
+        self.flush()
+
+    def add(self, call_sid: str, twilio_status: str, error_message: str = None) -> bool:
+        """
+        Buffer a callback.
+
+        Args:
+            call_sid: Twilio CallSid
+            twilio_status: Twilio CallStatus
+            error_message: Failure details, if any
+
+        Returns:
+            False if the status is not one we track
+        """
+        status = TWILIO_STATUSES.get(twilio_status)
+        if status is None:
+            return False
+
+        with self.condition:
+            self.received += 1
+            current = self.pending.get(call_sid)
+            if current is not None:
+                self.coalesced += 1
+                if STATUS_RANK[status] <= STATUS_RANK[current.status]:
+                    return True
+
+            self.pending[call_sid] = CallStatusUpdate(call_sid, status, error_message)
+            if len(self.pending) >= self.batch_size:
+                self.condition.notify()
+
+        return True
+
+    def _run(self):
+        while True:
+            with self.condition:
+                if self._running and len(self.pending) < self.batch_size:
+                    self.condition.wait(self.flush_seconds)
+                if not self._running:
+                    return
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Error applying call status updates")
+
+    def flush(self) -> int:
+        """
+        Apply buffered updates, in one transaction per shard.
+
+        Returns:
+            Number of reminders updated
+        """
+        with self.condition:
+            if not self.pending:
+                return 0
+            batch, self.pending = self.pending, {}
+
+        changes = 0
+        matched = set()
+        unmatched = []
+
+        try:
+            # A call SID isn't tied to a shard: look it up on each, one
+            # transaction per shard
+            for shard in shards:
+                changes += self._apply(shard, batch, matched)
+
+            self.flushes += 1
+            self.applied += changes
+            unmatched = [pending for call_sid, pending in batch.items() if call_sid not in matched]
+
+        except Exception:
+            # Put the batch back; newer updates already buffered win (and
+            # those already applied are skipped as stale)
+            unmatched = list(batch.values())
+            raise
+        finally:
+            self._requeue(unmatched)
+
+        if changes:
+            logger.debug("Applied %d call status updates", changes)
+
+        return changes
+
+    def _apply(self, shard, batch: dict, matched: set) -> int:
+        """
+        Apply the updates of a batch whose call SIDs are on ``shard`` in one
+        transaction, adding the SIDs found to ``matched``.
+
+        Returns:
+            Number of reminders updated
+        """
+        from app.cache import reminder_cache, snapshot
+        from app.events import publish_reminder
+
+        db = shard.SessionLocal()
+        changes = []
+
+        try:
+            # Coalesced reminders share one call SID
+            reminders = defaultdict(list)
+            call_sids = [call_sid for call_sid in batch if call_sid not in matched]
+            for start in range(0, len(call_sids), 500):
+                for reminder in db.scalars(
+                    select(Reminder).where(Reminder.call_sid.in_(call_sids[start:start + 500]))
+                ):
+                    reminders[reminder.call_sid].append(reminder)
+
+            for call_sid, found in reminders.items():
+                matched.add(call_sid)
+                pending = batch[call_sid]
+                for reminder in found:
+                    if STATUS_RANK[pending.status] <= STATUS_RANK.get(reminder.status, 0):
+                        self.stale += 1
+                        continue
+
+                    changes.append((reminder, snapshot(reminder), pending))
+
+            if changes:
+                # One executemany UPDATE by primary key
+                db.execute(update(Reminder), [
+                    {
+                        "id": reminder.id,
+                        "status": pending.status,
+                        "error_message": pending.error_message or reminder.error_message,
+                    }
+                    for reminder, _, pending in changes
+                ])
+                db.commit()
+
+            for reminder, before, pending in changes:
+                reminder_cache.invalidate(reminder.id, before, (pending.status,) + before[1:])
+                # Reloads the row, so only done while someone is listening
+                publish_reminder("status", reminder, before[0])
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        return len(changes)
+
+    def _requeue(self, updates):
+        """Keep updates for not-yet-known call SIDs until they expire."""
+        now = time.monotonic()
+        with self.condition:
+            for pending in updates:
+                if now - pending.received > STATUS_UNMATCHED_SECONDS:
+                    self.expired += 1
+                    continue
+                current = self.pending.get(pending.call_sid)
+                if current is None or STATUS_RANK[current.status] < STATUS_RANK[pending.status]:
+                    self.pending[pending.call_sid] = pending
+
+    def stats(self) -> dict:
+        """Counters for debugging."""
+        return {
+            "running": self._running,
+            "pending": len(self.pending),
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "applied": self.applied,
+            "stale": self.stale,
+            "expired": self.expired,
+        }
+
+
+# Shared ingestor fed by the status callback webhook
+status_ingestor = StatusIngestor()
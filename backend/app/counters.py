@@ -0,0 +1,61 @@
+"""
+Cached row counts for list endpoints.
+
+An exact COUNT(*) walks every matching index entry, which on a large
+table costs more than the page itself. List responses report a total that
+is at most COUNT_CACHE_TTL seconds stale instead.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+# Seconds a cached count stays valid
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "30"))
+
+# Distinct filter combinations kept
+COUNT_CACHE_SIZE = 256
+
+
+class CountCache:
+    """Small LRU of counts keyed by filter tuple, each valid for ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL, max_entries: int = COUNT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def lookup(self, key):
+        """Return the cached count for key, or None if missing or expired."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                self.entries.move_to_end(key)
+                return entry[0]
+        return None
+
+    def store(self, key, count: int):
+        """Cache count for key for the next ``ttl`` seconds."""
+        with self.lock:
+            self.entries[key] = (count, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get(self, key, compute) -> int:
+        """
+        Return the cached count for key, calling compute() if it is missing
+        or expired.
+        """
+        count = self.lookup(key)
+        if count is None:
+            count = compute()
+            self.store(key, count)
+        return count
+
+
+# Shared cache for reminder list totals
+reminder_counts = CountCache()
@@ -1,25 +1,291 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.schema import CreateColumn
+from app.metrics import instrument_engine
 import os
+import zlib
 
 
 
 # Database URL from .env
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./reminders.db")
 
-# Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+# Further reminder databases, comma-separated. Shard 0 is DATABASE_URL;
+# with none set everything lives in DATABASE_URL as before. Use one kind
+# of database (all SQLite or all Postgres) for every shard.
+SHARD_DATABASE_URLS = [url.strip() for url in os.getenv("SHARD_DATABASE_URLS", "").split(",") if url.strip()]
+
+# Reminder and dead letter ids count up from shard << SHARD_ID_BITS, so an
+# id names its shard (2**40 ids per shard; ids stay below 2**53 for
+# JavaScript clients up to 8192 shards)
+SHARD_ID_BITS = 40
+
+# Tables whose ids are offset per shard
+SHARDED_ID_TABLES = ("reminders", "dead_letters")
+
+# Engine profile: "tuned" (pooling + SQLite PRAGMAs below) or "basic"
+# (SQLAlchemy defaults, as before)
+DB_PROFILE = os.getenv("DB_PROFILE", "tuned")
+
+# Connection pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Test connections on checkout. Defaults to on for server databases, where
+# connections can be dropped; a local SQLite file never goes away.
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING")
+
+# SQLite PRAGMAs applied to every new connection
+SQLITE_PRAGMAS = {
+    # Readers don't block the writer and vice versa
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    # Safe with WAL; fsync only at checkpoints
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    # Wait for the write lock instead of failing with "database is locked"
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "foreign_keys": "ON",
+}
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL to its asyncio driver (aiosqlite / asyncpg)."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    if url.startswith(("postgresql:", "postgres:", "postgresql+psycopg2:")):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+
+def _engine_options(url: str, profile: str) -> dict:
+    """create_engine() keyword arguments for url under profile."""
+    if profile == "basic":
+        return {"connect_args": {"check_same_thread": False} if is_sqlite(url) else {}}
+
+    if DB_POOL_PRE_PING is not None:
+        pre_ping = DB_POOL_PRE_PING.lower() in ("1", "true", "yes")
+    else:
+        pre_ping = not is_sqlite(url)
+
+    options = {"pool_pre_ping": pre_ping}
+
+    if is_sqlite(url):
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": SQLITE_PRAGMAS["busy_timeout"] / 1000,
+        }
+    if ":memory:" not in url and not url.endswith("://"):
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+
+    return options
+
+
+def _apply_sqlite_pragmas(sync_engine):
+    """Run SQLITE_PRAGMAS on every new connection of sync_engine."""
+    @event.listens_for(sync_engine, "connect")
+    def apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_db_engine(url: str, profile: str = DB_PROFILE):
+    """
+    Create an engine for url using the configured profile.
+
+    Shared by the reminders database and the scheduler job store so both
+    get the same pooling and PRAGMAs.
+    """
+    new_engine = create_engine(url, **_engine_options(url, profile))
+
+    if is_sqlite(url) and profile != "basic":
+        _apply_sqlite_pragmas(new_engine)
+
+    return new_engine
+
+
+def create_async_db_engine(url: str, profile: str = DB_PROFILE):
+    """Async counterpart of create_db_engine (url must use an async driver)."""
+    options = _engine_options(url, profile)
+
+    # aiosqlite defaults to NullPool (a new connection per session)
+    if is_sqlite(url) and "pool_size" in options:
+        options["poolclass"] = AsyncAdaptedQueuePool
+
+    new_engine = create_async_engine(url, **options)
+
+    if is_sqlite(url) and profile != "basic":
+        _apply_sqlite_pragmas(new_engine.sync_engine)
+
+    return new_engine
+
+
+class Shard:
+    """
+    One reminders database: its sync engine and sessions (scheduler,
+    threads) and async ones (API routes).
+
+    A reminder is created on the shard its phone number hashes to
+    (shard_for_phone) and stays there; its id tells which one that is
+    (shard_of).
+    """
+
+    def __init__(self, index: int, url: str, async_url: str):
+        self.index = index
+        self.url = url
+        self.first_id = index << SHARD_ID_BITS
+
+        self.engine = create_db_engine(url)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.async_engine = create_async_db_engine(async_url)
+        self.AsyncSessionLocal = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+
+        # Connection hold times for /metrics
+        suffix = f"-{index}" if index else ""
+        instrument_engine(self.engine, "sync" + suffix)
+        instrument_engine(self.async_engine.sync_engine, "async" + suffix)
+
+    def __repr__(self):
+        return f"<Shard({self.index})>"
+
+
+# Async URL of shard 0; the other shards derive theirs from the sync URL
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+shards = [
+    Shard(0, DATABASE_URL, ASYNC_DATABASE_URL),
+    *(Shard(index, url, to_async_url(url)) for index, url in enumerate(SHARD_DATABASE_URLS, start=1)),
+]
+
+# Shard 0 also holds what isn't sharded (notifications, destination
+# buckets); these are its engines and sessions
+engine = shards[0].engine
+SessionLocal = shards[0].SessionLocal
+async_engine = shards[0].async_engine
+AsyncSessionLocal = shards[0].AsyncSessionLocal
+
+
+def shard_of(record_id: int):
+    """The shard a reminder or dead letter id belongs to (None for an id no shard hands out)."""
+    index = record_id >> SHARD_ID_BITS
+    return shards[index] if 0 <= index < len(shards) else None
+
+
+def shard_for_phone(phone_number: str) -> Shard:
+    """The shard new reminders for a phone number are created on."""
+    if len(shards) == 1:
+        return shards[0]
+    # crc32, unlike hash(), is the same in every process
+    return shards[zlib.crc32(phone_number.encode()) % len(shards)]
+
+
+def by_shard(items, key=None) -> dict:
+    """
+    Group ids, or items whose key(item) is an id, by shard.
+
+    Returns:
+        {Shard: [items]}; items of unknown shards are left out
+    """
+    groups = {}
+    for item in items:
+        shard = shard_of(key(item) if key else item)
+        if shard is not None:
+            groups.setdefault(shard, []).append(item)
+    return groups
 
-# Create session
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
 
+def init_db():
+    """
+    Create missing tables, columns and indexes, then apply pending data
+    migrations (app/migrations.py), on every shard.
+
+    create_all() skips tables that already exist, so columns and indexes
+    added to an existing model are created here explicitly. New columns
+    must be nullable or have a server_default.
+    """
+    import app.models  # noqa: F401 - register models on Base
+
+    for shard in shards:
+        _init_shard(shard)
+
+
+def _init_shard(shard: Shard):
+    """init_db() for one shard."""
+    from app.migrations import apply_data_migrations
+
+    engine = shard.engine
+    Base.metadata.create_all(bind=engine)
+
+    existing = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            columns = {column["name"] for column in existing.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in columns:
+                    ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    if shard.index:
+        _seed_ids(shard)
+
+    apply_data_migrations(engine)
+
+
+def _seed_ids(shard: Shard):
+    """
+    Start the id sequences of SHARDED_ID_TABLES at shard.first_id (once;
+    sequences already past it are left alone).
+
+    On SQLite this needs the tables' AUTOINCREMENT sequence: a shard file
+    whose reminders table was created before sharding is rejected.
+    """
+    with shard.engine.begin() as connection:
+        for table in SHARDED_ID_TABLES:
+            if is_sqlite(shard.url):
+                ddl = connection.execute(
+                    text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table}
+                ).scalar()
+                if "AUTOINCREMENT" not in ddl.upper():
+                    raise RuntimeError(
+                        f"Shard {shard.index}: table {table} has no AUTOINCREMENT, so its ids can't be "
+                        "offset; point SHARD_DATABASE_URLS at a new database file"
+                    )
+                connection.execute(
+                    text("INSERT INTO sqlite_sequence (name, seq) SELECT :name, :seq "
+                         "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = :name)"),
+                    {"name": table, "seq": shard.first_id},
+                )
+            else:
+                sequence = connection.execute(
+                    text("SELECT pg_get_serial_sequence(:name, 'id')"), {"name": table}
+                ).scalar()
+                last_value = connection.execute(text(f"SELECT last_value FROM {sequence}")).scalar()
+                if last_value < shard.first_id:
+                    connection.execute(text("SELECT setval(:sequence, :seq)"),
+                                       {"sequence": sequence, "seq": shard.first_id})
+
 # Dependency for routes
 def get_db():
     """
@@ -30,4 +296,13 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """
+    Async database session dependency for FastAPI routes.
+    Yields an AsyncSession and closes it after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Per-destination call pacing.
+
+Each phone number gets a token bucket holding up to DESTINATION_BURST
+calls that refills at one call per DESTINATION_MIN_INTERVAL_SECONDS, so
+however many reminders a number has, it is not called more often than
+that. The dispatcher asks delay() before placing a call and waits (while
+collecting more reminders for the number, see app/dispatcher.py), then
+take()s a token.
+
+Buckets live in memory on the dispatcher's event loop. Those that are not
+full are saved to the destination_buckets table every
+DESTINATION_SAVE_SECONDS and when the dispatcher stops, and loaded when
+it starts, so a restart does not hand every number a fresh burst. Times
+are wall-clock (POSIX) seconds for the same reason.
+"""
+
+import logging
+import os
+
+from sqlalchemy import delete, insert, select
+
+from app.database import SessionLocal
+from app.models import DestinationBucket
+from app.timezones import epoch, from_epoch
+
+
+logger = logging.getLogger(__name__)
+
+
+# Minimum seconds between calls to the same number (0 turns pacing off)
+DESTINATION_MIN_INTERVAL_SECONDS = float(os.getenv("DESTINATION_MIN_INTERVAL_SECONDS", "0"))
+
+# Calls a number may receive back to back before the interval applies
+DESTINATION_BURST = int(os.getenv("DESTINATION_BURST", "1"))
+
+# How often bucket state is saved to the database
+DESTINATION_SAVE_SECONDS = float(os.getenv("DESTINATION_SAVE_SECONDS", "10"))
+
+# Rows written or deleted per statement when saving
+SAVE_CHUNK = 500
+
+
+class DestinationLimiter:
+    """
+    Token buckets keyed by phone number.
+
+    Not thread-safe: used from the dispatcher's event loop only (load()
+    and save() run before it starts, after it stops, or on a snapshot).
+    """
+
+    def __init__(self, min_interval: float = DESTINATION_MIN_INTERVAL_SECONDS,
+                 burst: int = DESTINATION_BURST):
+        self.min_interval = min_interval
+        self.burst = max(1, burst)
+        # phone number -> [tokens, updated (POSIX seconds)]
+        self.buckets = {}
+        self.dirty = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.min_interval > 0
+
+    def _tokens(self, phone_number: str, now: float) -> float:
+        bucket = self.buckets.get(phone_number)
+        if bucket is None:
+            return float(self.burst)
+        tokens, updated = bucket
+        return min(self.burst, tokens + (now - updated) / self.min_interval)
+
+    def delay(self, phone_number: str, now: float) -> float:
+        """Seconds until a call to ``phone_number`` may be placed (0 if now)."""
+        if not self.enabled:
+            return 0.0
+        tokens = self._tokens(phone_number, now)
+        return 0.0 if tokens >= 1 else (1 - tokens) * self.min_interval
+
+    def take(self, phone_number: str, now: float):
+        """Spend a token for a call placed at ``now``."""
+        if not self.enabled:
+            return
+        self.buckets[phone_number] = [self._tokens(phone_number, now) - 1, now]
+        self.dirty.add(phone_number)
+
+    def snapshot(self, now: float):
+        """
+        Collect the changes to save and forget full buckets.
+
+        Returns:
+            (rows to write, phone numbers whose row is deleted)
+        """
+        full = [number for number in self.buckets if self._tokens(number, now) >= self.burst]
+        for number in full:
+            del self.buckets[number]
+
+        changed, self.dirty = self.dirty, set()
+        rows = [
+            {"phone_number": number, "tokens": tokens, "updated_at": from_epoch(updated)}
+            for number, (tokens, updated) in self.buckets.items()
+            if number in changed
+        ]
+        return rows, [*full, *(number for number in changed if number not in self.buckets)]
+
+    def save(self, rows: list, removed: list):
+        """Write a snapshot() to destination_buckets (replacing changed rows)."""
+        if not rows and not removed:
+            return
+
+        stale = [*removed, *(row["phone_number"] for row in rows)]
+        db = SessionLocal()
+        try:
+            for start in range(0, len(stale), SAVE_CHUNK):
+                db.execute(delete(DestinationBucket).where(
+                    DestinationBucket.phone_number.in_(stale[start:start + SAVE_CHUNK])
+                ))
+            for start in range(0, len(rows), SAVE_CHUNK):
+                db.execute(insert(DestinationBucket), rows[start:start + SAVE_CHUNK])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        logger.debug("Saved %d destination buckets (%d removed)", len(rows), len(removed))
+
+    def load(self) -> int:
+        """Replace the in-memory buckets with the saved ones; returns how many."""
+        if not self.enabled:
+            return 0
+
+        db = SessionLocal()
+        try:
+            saved = db.execute(select(
+                DestinationBucket.phone_number, DestinationBucket.tokens, DestinationBucket.updated_at
+            )).all()
+        finally:
+            db.close()
+
+        self.buckets = {row.phone_number: [row.tokens, epoch(row.updated_at)] for row in saved}
+        self.dirty = set()
+        logger.info("Loaded %d destination buckets", len(self.buckets))
+        return len(self.buckets)
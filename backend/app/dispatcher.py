@@ -0,0 +1,470 @@
+"""
+Asynchronous call dispatcher.
+
+Scheduler jobs hand reminders to a single asyncio event loop running in a
+background thread instead of blocking a scheduler worker for the whole
+Twilio round-trip. All calls share one pooled aiohttp session; the number
+of calls in flight is capped, and calls are paced per Twilio account to
+stay under its calls-per-second limit.
+
+Reminders for the same number can be coalesced: the first one is held for
+COALESCE_WINDOW_SECONDS (and for as long as the number's pacing, see
+app/destinations.py, makes it wait), and every reminder for that number
+submitted meanwhile joins it. They are placed as one call that speaks
+each message in turn, and each reminder gets the call's outcome.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from app.destinations import DESTINATION_SAVE_SECONDS, DestinationLimiter
+from app.metrics import (
+    COALESCED_REMINDERS, DISPATCH_HOLD_SECONDS, DISPATCH_IN_FLIGHT, DISPATCH_QUEUED,
+    TRIGGER_LAG_SECONDS, TWILIO_CALL_SECONDS, TWILIO_ERRORS,
+)
+from app.timezones import to_utc, utcnow
+from app.twilio import TWILIO_ACCOUNT_SID, TWIML_MAX_LENGTH, CallError, build_twiml, make_call_async
+
+
+logger = logging.getLogger(__name__)
+
+
+# Maximum number of calls in flight at once
+DISPATCH_CONCURRENCY = int(os.getenv("DISPATCH_CONCURRENCY", "100"))
+
+# Twilio's outbound calls-per-second cap for the account (1 by default)
+TWILIO_CALLS_PER_SECOND = float(os.getenv("TWILIO_CALLS_PER_SECOND", "1"))
+
+# HTTP connection pool size for the shared session
+DISPATCH_POOL_SIZE = int(os.getenv("DISPATCH_POOL_SIZE", "100"))
+
+# Number of recent lag samples kept for percentiles
+LAG_SAMPLES = 1000
+
+# Batched result writes: flush every RESULT_FLUSH_SECONDS or at RESULT_BATCH_SIZE
+RESULT_FLUSH_SECONDS = float(os.getenv("RESULT_FLUSH_SECONDS", "0.5"))
+RESULT_BATCH_SIZE = int(os.getenv("RESULT_BATCH_SIZE", "1000"))
+
+# Seconds a reminder waits for others to the same number before they are
+# placed as one call (0 turns coalescing off)
+COALESCE_WINDOW_SECONDS = float(os.getenv("COALESCE_WINDOW_SECONDS", "0"))
+
+# Reminders spoken in one call, at most (the TwiML must also fit Twilio's limit)
+COALESCE_MAX_REMINDERS = int(os.getenv("COALESCE_MAX_REMINDERS", "10"))
+
+
+class RateLimiter:
+    """
+    Token bucket pacing calls for one Twilio account.
+
+    Allows bursts of up to ``burst`` calls, then ``rate`` calls per second.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a call may be placed."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class _Batch:
+    """Reminders for one number placed as one call."""
+
+    __slots__ = ("phone_number", "items", "held_until", "result")
+
+    def __init__(self, phone_number: str, loop):
+        self.phone_number = phone_number
+        # (message, scheduled_time, monotonic time submitted)
+        self.items = []
+        self.held_until = None
+        # Resolves to (call_sid, error) for every reminder in the batch
+        self.result = loop.create_future()
+
+    def fits(self, message: str) -> bool:
+        if len(self.items) >= COALESCE_MAX_REMINDERS:
+            return False
+        messages = [item[0] for item in self.items] + [message]
+        return len(build_twiml(messages)) <= TWIML_MAX_LENGTH
+
+
+class CallDispatcher:
+    """
+    Runs outbound calls on a dedicated event loop thread.
+
+    submit() is thread-safe and returns immediately; the completion
+    callback runs on the default executor so it may block on the database.
+    """
+
+    def __init__(self, concurrency: int = DISPATCH_CONCURRENCY,
+                 calls_per_second: float = TWILIO_CALLS_PER_SECOND,
+                 coalesce_window: float = COALESCE_WINDOW_SECONDS,
+                 destinations: DestinationLimiter = None):
+        self.concurrency = concurrency
+        self.calls_per_second = calls_per_second
+        self.coalesce_window = coalesce_window
+        self.destinations = destinations or DestinationLimiter()
+        self.loop = None
+        self.thread = None
+        self.session = None
+        self.semaphore = None
+        self.limiters = {}
+        # Phone number -> the batch still accepting reminders
+        self.batches = {}
+        self._save_task = None
+        self._start_lock = threading.Lock()
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.calls = 0
+        self.coalesced = 0
+        self.lag_samples = deque(maxlen=LAG_SAMPLES)
+        self.max_lag = None
+        self.hold_samples = deque(maxlen=LAG_SAMPLES)
+        self.max_hold = None
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """Start the event loop thread (no-op if already running)."""
+        with self._start_lock:
+            if self.running:
+                return
+
+            self.destinations.load()
+            ready = threading.Event()
+            self.loop = asyncio.new_event_loop()
+
+            def run():
+                asyncio.set_event_loop(self.loop)
+                self.loop.run_until_complete(self._open())
+                ready.set()
+                self.loop.run_forever()
+
+            self.thread = threading.Thread(target=run, name="call-dispatcher", daemon=True)
+            self.thread.start()
+            ready.wait()
+            logger.info("Call dispatcher started (concurrency=%d, cps=%s, coalesce=%ss, "
+                        "per-number interval=%ss)", self.concurrency, self.calls_per_second,
+                        self.coalesce_window, self.destinations.min_interval)
+
+    def stop(self):
+        """Close the HTTP session, stop the event loop thread and save pacing state."""
+        if not self.running:
+            return
+
+        asyncio.run_coroutine_threadsafe(self._close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.loop = None
+        self.thread = None
+        self.batches = {}
+        if self.destinations.enabled:
+            self.destinations.save(*self.destinations.snapshot(time.time()))
+        logger.info("Call dispatcher stopped")
+
+    async def _open(self):
+        import aiohttp
+
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=DISPATCH_POOL_SIZE),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+        if self.destinations.enabled:
+            self._save_task = asyncio.create_task(self._save_destinations())
+
+    async def _close(self):
+        if self._save_task:
+            self._save_task.cancel()
+            self._save_task = None
+        await self.session.close()
+
+    async def _save_destinations(self):
+        """Save changed pacing state every DESTINATION_SAVE_SECONDS."""
+        while True:
+            await asyncio.sleep(DESTINATION_SAVE_SECONDS)
+            rows, removed = self.destinations.snapshot(time.time())
+            try:
+                await self.loop.run_in_executor(None, self.destinations.save, rows, removed)
+            except Exception:
+                logger.exception("Error saving destination buckets")
+                self.destinations.dirty.update(row["phone_number"] for row in rows)
+
+    def _limiter_for(self, account_sid: str) -> RateLimiter:
+        limiter = self.limiters.get(account_sid)
+        if limiter is None:
+            limiter = self.limiters[account_sid] = RateLimiter(self.calls_per_second)
+        return limiter
+
+    def submit(self, reminder_id: int, phone_number: str, message: str,
+               scheduled_time: datetime, on_done):
+        """
+        Queue a call for a reminder.
+
+        Args:
+            reminder_id: Database ID of the reminder
+            phone_number: E.164 number to call
+            message: Text to speak
+            scheduled_time: When the reminder was due (for lag metrics)
+            on_done: Called as on_done(reminder_id, call_sid, error) when
+                finished; error is a CallError if no call was placed.
+                Coalesced reminders share the call_sid.
+
+        Returns:
+            concurrent.futures.Future resolving to the call SID (or None)
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(
+            self._dispatch(reminder_id, phone_number, message, scheduled_time, on_done),
+            self.loop,
+        )
+
+    async def _dispatch(self, reminder_id, phone_number, message, scheduled_time, on_done):
+        self.submitted += 1
+        item = (message, scheduled_time, time.monotonic())
+
+        batch = self.batches.get(phone_number)
+        if batch is not None and batch.fits(message):
+            # Spoken in the call the batch's first reminder is waiting to place
+            batch.items.append(item)
+        else:
+            batch = _Batch(phone_number, self.loop)
+            batch.items.append(item)
+            if self.coalesce_window > 0:
+                self.batches[phone_number] = batch
+            try:
+                await self._hold(batch)
+                await self._call(batch)
+            finally:
+                if self.batches.get(phone_number) is batch:
+                    del self.batches[phone_number]
+                if not batch.result.done():
+                    batch.result.set_result((None, CallError("Dispatch interrupted", transient=True)))
+
+        call_sid, error = await batch.result
+        if call_sid:
+            self.completed += 1
+        else:
+            self.failed += 1
+
+        await self.loop.run_in_executor(None, on_done, reminder_id, call_sid, error)
+        return call_sid
+
+    async def _hold(self, batch: _Batch):
+        """Wait out the coalescing window and the number's pacing, then take its token."""
+        if self.coalesce_window > 0:
+            await asyncio.sleep(self.coalesce_window)
+
+        while (delay := self.destinations.delay(batch.phone_number, time.time())) > 0:
+            await asyncio.sleep(delay)
+        self.destinations.take(batch.phone_number, time.time())
+        batch.held_until = time.monotonic()
+
+    async def _call(self, batch: _Batch):
+        """Place one call speaking every message in the batch; resolves batch.result."""
+        async with self.semaphore:
+            await self._limiter_for(TWILIO_ACCOUNT_SID).acquire()
+
+            # Closed once the call is placed; later reminders start a new batch
+            if self.batches.get(batch.phone_number) is batch:
+                del self.batches[batch.phone_number]
+
+            self.calls += 1
+            self.in_flight += len(batch.items)
+            for _, scheduled_time, submitted_at in batch.items:
+                self._record_lag(scheduled_time)
+                self._record_hold(max(0.0, batch.held_until - submitted_at))
+            if len(batch.items) > 1:
+                self.coalesced += len(batch.items) - 1
+                COALESCED_REMINDERS.inc(len(batch.items) - 1)
+                messages = [message for message, _, _ in batch.items]
+            else:
+                messages = batch.items[0][0]
+
+            call_sid = None
+            error = None
+            started = time.perf_counter()
+            try:
+                call_sid = await make_call_async(self.session, batch.phone_number, messages)
+            except CallError as e:
+                error = e
+            except Exception as e:
+                error = CallError(f"Unexpected error: {e!r}", transient=True)
+            finally:
+                self.in_flight -= len(batch.items)
+            self._record_call(time.perf_counter() - started, error)
+
+        batch.result.set_result((call_sid, error))
+
+    def _record_lag(self, scheduled_time: datetime):
+        """Record queue lag: actual fire time minus scheduled_time."""
+        lag = (utcnow() - to_utc(scheduled_time)).total_seconds()
+
+        self.lag_samples.append(lag)
+        self.max_lag = lag if self.max_lag is None else max(self.max_lag, lag)
+        TRIGGER_LAG_SECONDS.observe(lag)
+
+    def _record_hold(self, seconds: float):
+        """Record the delay coalescing and per-number pacing added to a reminder."""
+        self.hold_samples.append(seconds)
+        self.max_hold = seconds if self.max_hold is None else max(self.max_hold, seconds)
+        DISPATCH_HOLD_SECONDS.observe(seconds)
+
+    def _record_call(self, seconds: float, error):
+        """Record Twilio latency and, for failed calls, the error code."""
+        if error is None:
+            outcome = "placed"
+        else:
+            outcome = "transient_error" if error.transient else "permanent_error"
+            TWILIO_ERRORS.labels(str(error.code or "none")).inc()
+        TWILIO_CALL_SECONDS.labels(outcome).observe(seconds)
+
+    def stats(self) -> dict:
+        """Counters, queue lag and hold percentiles (seconds) for debugging."""
+
+        def percentiles(samples, maximum):
+            samples = sorted(samples)
+
+            def percentile(p):
+                if not samples:
+                    return None
+                return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+            return {"p50": percentile(0.50), "p99": percentile(0.99), "max": maximum}
+
+        return {
+            "running": self.running,
+            "concurrency": self.concurrency,
+            "calls_per_second": self.calls_per_second,
+            "coalesce_window": self.coalesce_window,
+            "destination_min_interval": self.destinations.min_interval,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "queued": self.submitted - self.completed - self.failed - self.in_flight,
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "paced_destinations": len(self.destinations.buckets),
+            "queue_lag": percentiles(self.lag_samples, self.max_lag),
+            "hold": percentiles(self.hold_samples, self.max_hold),
+        }
+
+
+class ResultBatcher:
+    """
+    Collects call outcomes and writes them in batches.
+
+    Pass ``add`` as a submit() on_done callback; ``write`` receives lists
+    of (reminder_id, call_sid, error) every ``flush_seconds``, or as soon
+    as ``batch_size`` outcomes are waiting, from a background thread.
+    """
+
+    def __init__(self, write, flush_seconds: float = RESULT_FLUSH_SECONDS,
+                 batch_size: int = RESULT_BATCH_SIZE):
+        self.write = write
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.pending = []
+        self.condition = threading.Condition()
+        self.thread = None
+        self._running = False
+
+        # Metrics
+        self.received = 0
+        self.flushes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self.thread = threading.Thread(target=self._run, name="call-results", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Write what is buffered and stop the flush thread."""
+        if not self._running:
+            return
+
+        with self.condition:
+            self._running = False
+            self.condition.notify()
+
+        self.thread.join()
+        self.flush()
+
+    def add(self, reminder_id: int, call_sid: str, error=None):
+        with self.condition:
+            self.received += 1
+            self.pending.append((reminder_id, call_sid, error))
+            if len(self.pending) >= self.batch_size:
+                self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                if self._running and len(self.pending) < self.batch_size:
+                    self.condition.wait(self.flush_seconds)
+                if not self._running:
+                    return
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Error writing call results")
+
+    def flush(self) -> int:
+        """Write buffered outcomes; returns how many were written."""
+        with self.condition:
+            if not self.pending:
+                return 0
+            batch, self.pending = self.pending, []
+
+        self.write(batch)
+        self.flushes += 1
+        return len(batch)
+
+    def stats(self) -> dict:
+        """Counters for debugging."""
+        return {
+            "pending": len(self.pending),
+            "received": self.received,
+            "flushes": self.flushes,
+        }
+
+
+# Shared dispatcher used by the scheduler
+dispatcher = CallDispatcher()
+DISPATCH_QUEUED.set_function(lambda: dispatcher.submitted - dispatcher.completed
+                             - dispatcher.failed - dispatcher.in_flight)
+DISPATCH_IN_FLIGHT.set_function(lambda: dispatcher.in_flight)
@@ -0,0 +1,210 @@
+"""
+Reminder change events for server-push clients.
+
+Routes and the scheduler publish an event whenever a reminder is created,
+updated, deleted or changes status; GET /api/reminders/events streams them
+to each subscriber as Server-Sent Events, filtered by status, phone number
+or id.
+
+Every subscriber has a bounded queue. Streams only pull from it as fast
+as the client reads (uvicorn pauses sends on a full socket), so a slow
+client fills its queue instead of server memory; when it overflows, the
+backlog is dropped and a single ``resync`` event tells the client to
+re-fetch the list.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+
+
+# Events buffered per subscriber before it has to resync
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "256"))
+
+# Seconds between keepalive comments on an idle stream
+EVENT_KEEPALIVE_SECONDS = float(os.getenv("EVENT_KEEPALIVE_SECONDS", "15"))
+
+
+class ReminderEvent:
+    """One change, serialized once as an SSE frame for every subscriber."""
+
+    __slots__ = ("type", "reminder_id", "statuses", "phone_number", "frame")
+
+    def __init__(self, sequence: int, event_type: str, data: dict, reminder_id: int = None,
+                 statuses: tuple = (), phone_number: str = None):
+        self.type = event_type
+        self.reminder_id = reminder_id
+        self.statuses = statuses
+        self.phone_number = phone_number
+        self.frame = f"id: {sequence}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+class Subscription:
+    """A client's filters and its bounded queue of pending frames."""
+
+    def __init__(self, status: str = None, phone_number: str = None, ids=None,
+                 maxsize: int = EVENT_QUEUE_SIZE):
+        self.status = status
+        self.phone_number = phone_number
+        self.ids = set(ids) if ids else None
+        self.queue = asyncio.Queue(maxsize)
+        self.resyncs = 0
+
+    def matches(self, event: ReminderEvent) -> bool:
+        # Broadcasts (no reminder id) go to everyone
+        if event.reminder_id is None:
+            return True
+        if self.ids is not None and event.reminder_id not in self.ids:
+            return False
+        if self.phone_number and self.phone_number != event.phone_number:
+            return False
+        # Status changes match both the old and the new status, so a client
+        # watching "scheduled" sees reminders leave it
+        if self.status and self.status not in event.statuses:
+            return False
+        return True
+
+    def offer(self, frame: bytes) -> bool:
+        """Queue a frame; on overflow replace the backlog with a resync."""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_FRAME)
+            self.resyncs += 1
+            return False
+
+
+RESYNC_FRAME = b'event: resync\ndata: {"reason": "lagged"}\n\n'
+
+# Pushed on shutdown to end every stream
+CLOSE = None
+
+
+class EventBroker:
+    """
+    Fans events out to subscriptions on the app's event loop.
+
+    publish() is thread-safe: scheduler threads hand events to the loop
+    with call_soon_threadsafe. Nothing is serialized or queued while there
+    are no subscribers.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.subscribers = set()
+        self.sequence = itertools.count(1)
+
+        # Metrics
+        self.published = 0
+        self.delivered = 0
+        self.resyncs = 0
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """Bind to the event loop serving the streams (app startup)."""
+        self.loop = loop
+
+    def close(self):
+        """End every open stream (app shutdown, on the loop)."""
+        for subscription in self.subscribers:
+            try:
+                subscription.queue.put_nowait(CLOSE)
+            except asyncio.QueueFull:
+                subscription.queue.get_nowait()
+                subscription.queue.put_nowait(CLOSE)
+        self.loop = None
+
+    def subscribe(self, status: str = None, phone_number: str = None, ids=None) -> Subscription:
+        subscription = Subscription(status, phone_number, ids)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscribers.discard(subscription)
+
+    @property
+    def active(self) -> bool:
+        return self.loop is not None and bool(self.subscribers)
+
+    def publish(self, event_type: str, data: dict, reminder_id: int = None,
+                statuses: tuple = (), phone_number: str = None):
+        """
+        Publish an event from any thread.
+
+        Args:
+            event_type: SSE event name (created, updated, deleted, status, ...)
+            data: JSON payload
+            reminder_id: Reminder the event is about (None broadcasts)
+            statuses: Statuses the event matches (old and new)
+            phone_number: Destination the event matches
+        """
+        loop = self.loop
+        if loop is None or not self.subscribers:
+            return
+
+        event = ReminderEvent(next(self.sequence), event_type, data, reminder_id, statuses, phone_number)
+
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+
+        if on_loop:
+            self._fanout(event)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._fanout, event)
+            except RuntimeError:
+                # Loop closed during shutdown
+                pass
+
+    def _fanout(self, event: ReminderEvent):
+        self.published += 1
+        for subscription in self.subscribers:
+            if subscription.matches(event):
+                if subscription.offer(event.frame):
+                    self.delivered += 1
+                else:
+                    self.resyncs += 1
+
+    def stats(self) -> dict:
+        """Counters for debugging."""
+        return {
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "resyncs": self.resyncs,
+            "queue_size": EVENT_QUEUE_SIZE,
+            "max_queued": max((s.queue.qsize() for s in self.subscribers), default=0),
+        }
+
+
+def publish_reminder(event_type: str, reminder, previous_status: str = None):
+    """
+    Publish a change to a reminder, with the full reminder as payload.
+
+    Args:
+        event_type: created, updated or status
+        reminder: Reminder ORM object (after the change)
+        previous_status: Status before the change, if it changed
+    """
+    if not event_broker.active:
+        return
+
+    from app.schemas import ReminderResponse
+
+    statuses = (reminder.status,) if previous_status is None else (previous_status, reminder.status)
+    event_broker.publish(
+        event_type,
+        ReminderResponse.model_validate(reminder).model_dump(mode="json"),
+        reminder_id=reminder.id,
+        statuses=statuses,
+        phone_number=reminder.phone_number,
+    )
+
+
+# Shared broker for the API process
+event_broker = EventBroker()
@@ -0,0 +1,407 @@
+"""
+Idempotency keys for the write endpoints.
+
+Clients retry writes on timeouts. A request sent with an
+``Idempotency-Key`` header runs once; a retry with the same key gets the
+stored response (with ``Idempotent-Replayed: true``) instead of creating
+the reminder, and its job and call, a second time. Keys are scoped per
+endpoint and kept for IDEMPOTENCY_TTL_SECONDS.
+
+- Lookup: an in-process LRU of recent responses first, then the
+  ``idempotency_keys`` table (on shard 0, like the other tables that are
+  not sharded). A hit never reaches the write path.
+- Claim: the first request inserts the key with no response yet. The
+  primary key (scope, key) is the unique index concurrent duplicates
+  collide on, so exactly one request per key runs.
+- Duplicates in the same process await the running request and get its
+  response. Duplicates in other processes poll the row for up to
+  IDEMPOTENCY_WAIT_SECONDS, then get 409.
+- Only successful responses are stored: when the request fails, its
+  claim is dropped and a retry runs again.
+- A key reused with a different request body is rejected with 422.
+
+While the request runs, its claim is a lease: expires_at is renewed
+every IDEMPOTENCY_LOCK_SECONDS / 3. A claim is only taken over once its
+lease has lapsed, i.e. the process holding it died or stalled. The
+response is stored after the write commits, so a crash between the two
+can still let a retry run again.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.database import AsyncSessionLocal
+from app.models import IdempotencyKey
+from app.timezones import utcnow
+
+
+logger = logging.getLogger(__name__)
+
+
+# How long a key and its response are kept
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+
+# Responses kept in the in-process LRU in front of the table
+IDEMPOTENCY_CACHE_ENTRIES = int(os.getenv("IDEMPOTENCY_CACHE_ENTRIES", "10000"))
+
+# How long a duplicate waits for the request holding the key before 409
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+
+# Lease of a running request's claim, renewed every third of it; a claim
+# whose lease lapsed (the process died) is taken over
+IDEMPOTENCY_LOCK_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+
+# How often a duplicate in another process checks for the response
+POLL_SECONDS = 0.05
+
+# How often expired keys are deleted (by the next request with a key)
+PRUNE_SECONDS = 60
+
+# Longest key accepted (the column width)
+MAX_KEY_LENGTH = 255
+
+# Response header marking a replayed response
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def fingerprint(*parts) -> str:
+    """Hash of a request (str or bytes parts), to tell a retry from a reused key."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class StoredResponse:
+    """A response stored under a key, with the request fingerprint it answered."""
+
+    __slots__ = ("fingerprint", "status_code", "body", "expires")
+
+    def __init__(self, fingerprint: str, status_code: int, body: bytes, expires: float):
+        self.fingerprint = fingerprint
+        self.status_code = status_code
+        self.body = body
+        self.expires = expires
+
+
+class IdempotencyStore:
+    """
+    Runs handlers at most once per (scope, key).
+
+    The LRU and the table of running requests belong to the event loop
+    the routes run on; the lock only guards the LRU against the stats()
+    reader.
+    """
+
+    def __init__(self, ttl: float = IDEMPOTENCY_TTL_SECONDS,
+                 max_entries: int = IDEMPOTENCY_CACHE_ENTRIES,
+                 wait: float = IDEMPOTENCY_WAIT_SECONDS,
+                 lock_timeout: float = IDEMPOTENCY_LOCK_SECONDS,
+                 session_factory=AsyncSessionLocal):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.wait = wait
+        self.lock_timeout = lock_timeout
+        self.session_factory = session_factory
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # (scope, key) -> Future of the StoredResponse (None if the request
+        # failed), for requests running in this process
+        self.running = {}
+        self.pruned_at = 0.0
+
+        # Metrics
+        self.executed = 0
+        self.replayed = 0
+        self.cache_hits = 0
+        self.collapsed = 0
+        self.waited = 0
+        self.conflicts = 0
+        self.mismatches = 0
+        self.pruned = 0
+
+    async def run(self, scope: str, key: str, request_fingerprint: str, handler,
+                  status_code: int = status.HTTP_200_OK) -> Response:
+        """
+        Run ``handler`` once for ``key``, or replay the response it gave.
+
+        Args:
+            scope: Endpoint the key belongs to, e.g. "POST /api/reminders/"
+            key: Idempotency-Key header value
+            request_fingerprint: fingerprint() of the request
+            handler: Coroutine function returning the JSON response body (bytes)
+            status_code: Status of a successful response
+
+        Returns:
+            JSON response (stored one marked with Idempotent-Replayed)
+
+        Raises:
+            HTTPException: 400 for a bad key, 409 while another process
+                still runs the key past the wait, 422 when the key was used
+                for a different request; anything ``handler`` raises
+        """
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"
+            )
+
+        name = (scope, key)
+        while True:
+            stored = self._cached(name)
+            if stored is not None:
+                self.cache_hits += 1
+                return self._replay(stored, request_fingerprint)
+
+            running = self.running.get(name)
+            if running is None:
+                break
+            # The same key is running in this process; share its outcome
+            self.collapsed += 1
+            stored = await asyncio.shield(running)
+            if stored is not None:
+                return self._replay(stored, request_fingerprint)
+            # It failed and dropped its claim; run the request ourselves
+
+        running = asyncio.get_running_loop().create_future()
+        self.running[name] = running
+        try:
+            stored, claimed_at = await self._claim(scope, key, request_fingerprint)
+            if stored is not None:
+                running.set_result(stored)
+                return self._replay(stored, request_fingerprint)
+
+            heartbeat = asyncio.ensure_future(self._heartbeat(scope, key, claimed_at))
+            try:
+                body = await handler()
+            except BaseException:
+                await self._release(scope, key, claimed_at)
+                raise
+            finally:
+                heartbeat.cancel()
+
+            stored = await self._save(scope, key, claimed_at, request_fingerprint, status_code, body)
+            self.executed += 1
+            running.set_result(stored)
+            return Response(body, status_code=status_code, media_type="application/json")
+        finally:
+            if not running.done():
+                running.set_result(None)
+            del self.running[name]
+
+    def _replay(self, stored: StoredResponse, request_fingerprint: str) -> Response:
+        """The stored response, or 422 if it answered a different request."""
+        self._check(stored.fingerprint, request_fingerprint)
+        self.replayed += 1
+        return Response(
+            stored.body,
+            status_code=stored.status_code,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+    def _check(self, stored_fingerprint: str, request_fingerprint: str):
+        """Raise 422 when a key comes back with a different request."""
+        if stored_fingerprint != request_fingerprint:
+            self.mismatches += 1
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request"
+            )
+
+    async def _claim(self, scope: str, key: str, request_fingerprint: str):
+        """
+        Insert the key, or find the response stored under it.
+
+        Returns:
+            (None, created_at of our claim) once the key is ours to run,
+            else (StoredResponse of the request that holds it, None),
+            waiting for it to finish
+        """
+        started = time.monotonic()
+        waiting = False
+
+        async with self.session_factory() as db:
+            await self._prune(db)
+
+            while True:
+                now = utcnow()
+                try:
+                    await db.execute(insert(IdempotencyKey).values(
+                        scope=scope, key=key, fingerprint=request_fingerprint,
+                        created_at=now, expires_at=now + timedelta(seconds=self.lock_timeout),
+                    ))
+                    await db.commit()
+                    return None, now
+                except IntegrityError:
+                    await db.rollback()
+
+                row = (await db.execute(
+                    select(
+                        IdempotencyKey.fingerprint, IdempotencyKey.status_code, IdempotencyKey.response,
+                        IdempotencyKey.created_at, IdempotencyKey.expires_at,
+                    ).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+                )).one_or_none()
+                # End the read, so the next poll sees new commits
+                await db.rollback()
+                if row is None:
+                    # Dropped meanwhile; claim it again
+                    continue
+
+                if row.status_code is not None and row.expires_at > now:
+                    return self._remember((scope, key), row), None
+
+                if row.expires_at <= now:
+                    # Expired, or the lease of its running request lapsed:
+                    # take it over. Only the taker whose DELETE matched the
+                    # row inserts next.
+                    await db.execute(delete(IdempotencyKey).where(
+                        IdempotencyKey.scope == scope, IdempotencyKey.key == key,
+                        IdempotencyKey.created_at == row.created_at,
+                        # Not if its lease was renewed meanwhile
+                        IdempotencyKey.expires_at <= now,
+                    ))
+                    await db.commit()
+                    if row.status_code is None:
+                        logger.warning("Taking over idempotency key %s of %s (claimed at %s)",
+                                       key, scope, row.created_at)
+                    continue
+
+                # Another process is running the key; a different request
+                # need not wait for it to finish
+                self._check(row.fingerprint, request_fingerprint)
+                if time.monotonic() - started >= self.wait:
+                    self.conflicts += 1
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="A request with this Idempotency-Key is still in progress",
+                        headers={"Retry-After": "1"},
+                    )
+                if not waiting:
+                    waiting = True
+                    self.waited += 1
+                await asyncio.sleep(POLL_SECONDS)
+
+    async def _heartbeat(self, scope: str, key: str, claimed_at):
+        """Renew the lease of our claim until cancelled."""
+        while True:
+            await asyncio.sleep(self.lock_timeout / 3)
+            try:
+                async with self.session_factory() as db:
+                    renewed = (await db.execute(
+                        update(IdempotencyKey)
+                        .where(*self._ours(scope, key, claimed_at), IdempotencyKey.status_code.is_(None))
+                        .values(expires_at=utcnow() + timedelta(seconds=self.lock_timeout))
+                    )).rowcount
+                    await db.commit()
+            except Exception:
+                logger.exception("Renewing idempotency key %s of %s failed", key, scope)
+                continue
+            if not renewed:
+                logger.warning("Idempotency key %s of %s was taken over while its request ran", key, scope)
+                return
+
+    @staticmethod
+    def _ours(scope: str, key: str, claimed_at) -> tuple:
+        """WHERE clauses for the row of our claim (not one that took it over)."""
+        return (
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key,
+            IdempotencyKey.created_at == claimed_at,
+        )
+
+    async def _save(self, scope: str, key: str, claimed_at, request_fingerprint: str,
+                    status_code: int, body: bytes) -> StoredResponse:
+        """Store the response under the claimed key, kept for the TTL from now."""
+        async with self.session_factory() as db:
+            await db.execute(
+                update(IdempotencyKey)
+                .where(*self._ours(scope, key, claimed_at))
+                .values(status_code=status_code, response=body,
+                        expires_at=utcnow() + timedelta(seconds=self.ttl))
+            )
+            await db.commit()
+
+        stored = StoredResponse(request_fingerprint, status_code, body, time.monotonic() + self.ttl)
+        self._put((scope, key), stored)
+        return stored
+
+    async def _release(self, scope: str, key: str, claimed_at):
+        """Drop the claim of a request that failed, so a retry runs again."""
+        try:
+            async with self.session_factory() as db:
+                await db.execute(delete(IdempotencyKey).where(
+                    *self._ours(scope, key, claimed_at), IdempotencyKey.status_code.is_(None),
+                ))
+                await db.commit()
+        except Exception:
+            # The lease lapses after IDEMPOTENCY_LOCK_SECONDS instead
+            logger.exception("Releasing idempotency key %s of %s failed", key, scope)
+
+    async def _prune(self, db):
+        """Delete expired keys, at most every PRUNE_SECONDS."""
+        if time.monotonic() - self.pruned_at < PRUNE_SECONDS:
+            return
+        self.pruned_at = time.monotonic()
+
+        result = await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= utcnow()))
+        await db.commit()
+        self.pruned += result.rowcount
+        if result.rowcount:
+            logger.debug("Pruned %d expired idempotency keys", result.rowcount)
+
+    def _remember(self, name: tuple, row) -> StoredResponse:
+        """Cache a completed row found in the table."""
+        remaining = (row.expires_at - utcnow()).total_seconds()
+        stored = StoredResponse(row.fingerprint, row.status_code, row.response, time.monotonic() + remaining)
+        self._put(name, stored)
+        return stored
+
+    def _cached(self, name: tuple):
+        with self.lock:
+            stored = self.entries.get(name)
+            if stored is None:
+                return None
+            if stored.expires <= time.monotonic():
+                del self.entries[name]
+                return None
+            self.entries.move_to_end(name)
+            return stored
+
+    def _put(self, name: tuple, stored: StoredResponse):
+        with self.lock:
+            self.entries[name] = stored
+            self.entries.move_to_end(name)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Counters for debugging."""
+        return {
+            "ttl": self.ttl,
+            "cached": len(self.entries),
+            "running": len(self.running),
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "cache_hits": self.cache_hits,
+            "collapsed": self.collapsed,
+            "waited": self.waited,
+            "conflicts": self.conflicts,
+            "mismatches": self.mismatches,
+            "pruned": self.pruned,
+        }
+
+
+# Shared store for the reminder routes
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,306 @@
+"""
+Trigger claims for running the scheduler in several processes.
+
+Every process (uvicorn worker, host) runs its own scheduler backend, so a
+due reminder may be triggered by more than one of them. Before dispatching,
+a process claims the reminder with a single conditional UPDATE:
+
+    UPDATE reminders SET claimed_by = :me, lease_expires_at = :now + LEASE
+    WHERE id = :id AND status IN ('scheduled', 'retrying') AND <due by :now>
+      AND (claimed_by IS NULL OR lease_expires_at < :now)
+
+Exactly one process gets rowcount 1 (the row lock on Postgres, the write
+lock on SQLite); the others skip it. A job that fires before the reminder
+is due (a stale job left behind when another process moved it) claims
+nothing; see due_at(). record_call_result() releases the
+claim when it stores the outcome.
+
+While a call is queued or in flight, the owner's heartbeat keeps renewing
+its leases. If the owner dies, its leases lapse and another process claims
+the rows back (SELECT ... FOR UPDATE SKIP LOCKED on Postgres, so recovering
+processes split the work) and dispatches them. A call Twilio accepted just
+before its worker died can therefore be placed again; that window is the
+only source of duplicates.
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, func, or_, select, update
+
+from app.database import DATABASE_URL, SessionLocal, is_sqlite
+from app.models import Reminder, Worker
+from app.timezones import utcnow
+
+
+logger = logging.getLogger(__name__)
+
+
+# Identifies this process in reminders.claimed_by and the workers table
+WORKER_ID = os.getenv("WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+# How long a claim lasts without renewal; must exceed a worker's longest
+# pause (call timeout, GC, ...)
+LEASE_SECONDS = float(os.getenv("LEASE_SECONDS", "60"))
+
+# How often a worker renews its leases and looks for expired ones
+HEARTBEAT_SECONDS = float(os.getenv("HEARTBEAT_SECONDS", "10"))
+
+# Expired claims taken over per heartbeat
+RECOVERY_BATCH_SIZE = int(os.getenv("RECOVERY_BATCH_SIZE", "500"))
+
+# Reminders that may be (re)claimed for a call
+CLAIMABLE_STATUSES = ("scheduled", "retrying")
+
+# Worker rows are kept this long after their last heartbeat
+WORKER_RETENTION = timedelta(days=1)
+
+
+def _due(now: datetime):
+    """
+    Pending reminders due by ``now``: scheduled ones at their
+    scheduled_time, and any at their next_attempt_at (retries, and
+    scheduled reminders a manual trigger made due early).
+    """
+    return or_(
+        and_(Reminder.status == "scheduled", Reminder.scheduled_time <= now),
+        and_(Reminder.status.in_(CLAIMABLE_STATUSES), Reminder.next_attempt_at <= now),
+    )
+
+
+def due_at(status: str, scheduled_time: datetime, next_attempt_at) -> datetime:
+    """When a pending reminder becomes due, by the rule of _due()."""
+    if status == "retrying" or (next_attempt_at is not None and next_attempt_at < scheduled_time):
+        return next_attempt_at
+    return scheduled_time
+
+
+def _claimable(now: datetime):
+    return and_(
+        Reminder.status.in_(CLAIMABLE_STATUSES),
+        or_(Reminder.claimed_by.is_(None), Reminder.lease_expires_at < now),
+    )
+
+
+def claim(db, reminder_id: int) -> bool:
+    """
+    Claim a due reminder for this worker (commits).
+
+    Returns:
+        True if this worker now owns the call, False if the reminder is
+        gone, not pending, not due yet or claimed by a live worker
+    """
+    now = utcnow()
+    claimed = db.execute(
+        update(Reminder)
+        .where(Reminder.id == reminder_id, _due(now), _claimable(now))
+        .values(claimed_by=WORKER_ID, lease_expires_at=now + timedelta(seconds=LEASE_SECONDS))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return claimed == 1
+
+
+def claim_due(db, now: datetime, limit: int) -> list:
+    """
+    Claim up to ``limit`` reminders due by ``now`` in one statement (commits).
+
+    Covers scheduled reminders past their scheduled_time and reminders
+    past their next_attempt_at (both naive UTC; see _due()).
+
+    Returns:
+        Rows with id, phone_number, message, scheduled_time,
+        next_attempt_at, status and recurrence
+    """
+    lease_now = utcnow()
+    candidates = (
+        select(Reminder.id)
+        .where(
+            _due(now),
+            or_(Reminder.claimed_by.is_(None), Reminder.lease_expires_at < lease_now),
+        )
+        .order_by(Reminder.scheduled_time)
+        .limit(limit)
+    )
+    if not is_sqlite(DATABASE_URL):
+        # Workers ticking at the same moment split the due rows
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    rows = db.execute(
+        update(Reminder)
+        .where(Reminder.id.in_(candidates), _claimable(lease_now))
+        .values(claimed_by=WORKER_ID, lease_expires_at=lease_now + timedelta(seconds=LEASE_SECONDS))
+        .returning(
+            Reminder.id,
+            Reminder.phone_number,
+            Reminder.message,
+            Reminder.scheduled_time,
+            Reminder.next_attempt_at,
+            Reminder.status,
+            Reminder.recurrence,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return rows
+
+
+def claim_expired(db, limit: int = RECOVERY_BATCH_SIZE) -> list:
+    """
+    Take over reminders whose owner stopped renewing its lease (commits).
+
+    Returns:
+        Ids of the reminders now claimed by this worker
+    """
+    now = utcnow()
+    candidates = (
+        select(Reminder.id)
+        .where(
+            Reminder.status.in_(CLAIMABLE_STATUSES),
+            Reminder.claimed_by.is_not(None),
+            Reminder.lease_expires_at < now,
+        )
+        .limit(limit)
+    )
+    if not is_sqlite(DATABASE_URL):
+        # Concurrent recoveries take disjoint rows instead of queueing
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    ids = list(db.scalars(candidates))
+    if not ids:
+        db.rollback()
+        return []
+
+    # The claim condition is repeated: on SQLite the SELECT took no lock
+    claimed = list(db.scalars(
+        update(Reminder)
+        .where(Reminder.id.in_(ids), _claimable(now))
+        .values(claimed_by=WORKER_ID, lease_expires_at=now + timedelta(seconds=LEASE_SECONDS))
+        .returning(Reminder.id)
+        .execution_options(synchronize_session=False)
+    ))
+    db.commit()
+    return claimed
+
+
+class LeaseKeeper:
+    """
+    Heartbeat thread for this worker.
+
+    Every HEARTBEAT_SECONDS it records the heartbeat, renews the leases of
+    calls this worker still owns and claims expired ones, handing their ids
+    to ``on_recovered``. One runs per shard, on ``session_factory``.
+    """
+
+    def __init__(self, on_recovered, interval: float = HEARTBEAT_SECONDS, session_factory=SessionLocal):
+        self.on_recovered = on_recovered
+        self.interval = interval
+        self.session_factory = session_factory
+        self.started_at = None
+        self.thread = None
+        self.stopped = threading.Event()
+
+        # Metrics
+        self.heartbeats = 0
+        self.renewed = 0
+        self.recovered = 0
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self.started_at = utcnow()
+        self.stopped.clear()
+        self.heartbeat()
+        self.thread = threading.Thread(target=self._run, name="lease-keeper", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.stopped.set()
+        self.thread.join()
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.heartbeat()
+                self.recover()
+            except Exception:
+                logger.exception("Lease heartbeat failed")
+
+    def heartbeat(self):
+        """Record this worker as alive and renew its leases."""
+        now = utcnow()
+        db = self.session_factory()
+
+        try:
+            db.merge(Worker(
+                id=WORKER_ID,
+                hostname=socket.gethostname(),
+                pid=os.getpid(),
+                started_at=self.started_at,
+                heartbeat_at=now,
+            ))
+            self.renewed += db.execute(
+                update(Reminder)
+                .where(Reminder.claimed_by == WORKER_ID, Reminder.status.in_(CLAIMABLE_STATUSES))
+                .values(lease_expires_at=now + timedelta(seconds=LEASE_SECONDS))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.execute(delete(Worker).where(Worker.heartbeat_at < now - WORKER_RETENTION))
+            db.commit()
+            self.heartbeats += 1
+        finally:
+            db.close()
+
+    def recover(self):
+        """Claim and dispatch reminders whose owner died."""
+        db = self.session_factory()
+
+        try:
+            ids = claim_expired(db)
+        finally:
+            db.close()
+
+        if ids:
+            self.recovered += len(ids)
+            logger.warning("Recovered %d reminders from expired leases", len(ids))
+            self.on_recovered(ids)
+
+    def stats(self) -> dict:
+        """Counters for debugging."""
+        return {
+            "worker_id": WORKER_ID,
+            "lease_seconds": LEASE_SECONDS,
+            "heartbeat_seconds": self.interval,
+            "heartbeats": self.heartbeats,
+            "renewed": self.renewed,
+            "recovered": self.recovered,
+        }
+
+
+def list_workers(db) -> list:
+    """Known workers with whether their heartbeat is current."""
+    cutoff = utcnow() - timedelta(seconds=LEASE_SECONDS)
+    return [
+        {
+            "id": worker.id,
+            "hostname": worker.hostname,
+            "pid": worker.pid,
+            "started_at": worker.started_at,
+            "heartbeat_at": worker.heartbeat_at,
+            "alive": worker.heartbeat_at >= cutoff,
+            "claimed": db.scalar(
+                select(func.count()).select_from(Reminder).where(Reminder.claimed_by == worker.id)
+            ),
+        }
+        for worker in db.scalars(select(Worker).order_by(Worker.started_at))
+    ]
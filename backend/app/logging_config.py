@@ -0,0 +1,105 @@
+"""
+Logging setup for the API and the worker.
+
+Modules log through ``logging.getLogger(__name__)``. configure_logging()
+(called once by app.main and app.worker) routes every record through a
+QueueHandler: the logging thread only merges the message and enqueues
+the record, and a QueueListener thread formats and writes it, so slow
+stdout never stalls a request or the scheduler.
+
+Fields passed with ``extra=`` (reminder_id, call_sid, ...) are kept as
+structured fields: keys of the JSON object with LOG_FORMAT=json (one
+object per line, for log aggregation), or ``key=value`` pairs after the
+message with LOG_FORMAT=text.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+
+# Minimum level written (DEBUG includes one line per call and per request)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# "text" for humans, "json" for log aggregation
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+
+# LogRecord attributes that are not extra= fields
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, extra= fields included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            **_extra_fields(record),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Classic log line followed by extra= fields as key=value."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _extra_fields(record)
+        if fields:
+            head, _, tail = line.partition("\n")
+            line = head + "".join(f" {key}={value}" for key, value in fields.items()) + (tail and "\n" + tail)
+        return line
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Merges args in the calling thread but leaves formatting to the listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks reference frames that may be gone by the time the listener runs
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging():
+    """Send all logging through a queue to stdout (idempotent)."""
+    global _listener
+
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.handlers = [_DeferredQueueHandler(log_queue)]
+
+    _listener = QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(_listener.stop)
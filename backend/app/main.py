@@ -1,25 +1,56 @@
 import app.load_env
-from fastapi import FastAPI
+from app.logging_config import configure_logging
+configure_logging()
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
-from app.routes import reminders
-from app.scheduler import scheduler, start_scheduler
+from app import metrics
+from app.database import init_db, shards
+from app.events import event_broker
+from app.routes import dead_letters, reminders, twilio_webhooks
+from app.cache import CACHE_SHARED, reminder_cache
+from app.call_status import status_ingestor
+from app.scheduler import SCHEDULER_MODE, api_listener, start_scheduler, stop_scheduler
 from contextlib import asynccontextmanager
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Create database tables and indexes
+init_db()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup code
-    start_scheduler()
-    print("Scheduler started at app startup")
+    event_broker.attach(asyncio.get_running_loop())
+    if SCHEDULER_MODE == "worker":
+        # python -m app.worker fires reminders; hear about what it changes
+        api_listener.start()
+        logger.info("Scheduler runs in the worker process")
+    else:
+        start_scheduler()
+        logger.info("Scheduler started at app startup")
+    if CACHE_SHARED:
+        # Other API processes drop the cached responses this one invalidates
+        reminder_cache.shared = True
+        api_listener.start()
+    status_ingestor.start()
 
     yield  # FastAPI runs here
 
     # Shutdown code
-    scheduler.shutdown()
-    print("Scheduler shut down at app shutdown")
+    event_broker.close()
+    if SCHEDULER_MODE != "worker":
+        stop_scheduler()
+        logger.info("Scheduler shut down at app shutdown")
+    status_ingestor.stop()
+    # Last, so it sends the invalidations of the writes flushed above
+    api_listener.stop()
+
+    # Close pooled async connections (aiosqlite runs a thread per connection)
+    for shard in shards:
+        await shard.async_engine.dispose()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -41,10 +72,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "Idempotent-Replayed"],  # Pagination, replayed writes
 )
 
+# Request latency by route for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Include routers
 app.include_router(reminders.router, prefix="/api/reminders", tags=["reminders"])
+app.include_router(dead_letters.router, prefix="/api/dead-letters", tags=["dead letters"])
+app.include_router(twilio_webhooks.router, prefix="/api/twilio", tags=["twilio"])
 
 # Health check endpoint
 @app.get("/")
@@ -57,4 +94,10 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint (see app/metrics.py)."""
+    body, content_type = metrics.render()
+    return Response(body, headers={"Content-Type": content_type})
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Prometheus metrics for the reminder pipeline.
+
+The API serves them at GET /metrics; python -m app.worker serves its own
+on WORKER_METRICS_PORT. Each process exports its own series, so scrape
+every API and worker process (with uvicorn --workers, one scrape reaches
+one of the workers).
+
+- reminders_http_request_duration_seconds{method, route, status}
+- reminders_trigger_lag_seconds: when a call was placed minus when it was due
+- reminders_twilio_call_duration_seconds{outcome} and
+  reminders_twilio_errors_total{code}: Twilio API latency and failures
+- reminders_coalesced_reminders_total and reminders_dispatch_hold_seconds:
+  calls saved by coalescing reminders to the same number, and the delay
+  coalescing and per-number pacing added
+- reminders_scheduler_pending_jobs, reminders_dispatch_queued_calls,
+  reminders_dispatch_in_flight_calls: queue depth (process running the scheduler)
+- reminders_db_connection_hold_seconds{engine}: how long each session
+  held its pooled connection
+"""
+
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+
+
+# Seconds; from a fast cached GET to a slow bulk import
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Seconds late; reminders are due to the second
+LAG_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 300, 900)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "reminders_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+TRIGGER_LAG_SECONDS = Histogram(
+    "reminders_trigger_lag_seconds",
+    "Time a call was placed minus the time it was due",
+    buckets=LAG_BUCKETS,
+)
+
+TWILIO_CALL_SECONDS = Histogram(
+    "reminders_twilio_call_duration_seconds",
+    "Twilio create-call request latency",
+    ["outcome"],  # placed, transient_error, permanent_error
+    buckets=LATENCY_BUCKETS,
+)
+
+TWILIO_ERRORS = Counter(
+    "reminders_twilio_errors_total",
+    "Calls Twilio did not place, by Twilio error code or HTTP status",
+    ["code"],
+)
+
+COALESCED_REMINDERS = Counter(
+    "reminders_coalesced_reminders_total",
+    "Reminders spoken in a call placed for another reminder to the same number",
+)
+
+DISPATCH_HOLD_SECONDS = Histogram(
+    "reminders_dispatch_hold_seconds",
+    "Time a reminder was held for coalescing or per-number pacing before its call",
+    buckets=LAG_BUCKETS,
+)
+
+SCHEDULER_PENDING = Gauge(
+    "reminders_scheduler_pending_jobs",
+    "Reminders waiting in the scheduler backend",
+)
+
+DISPATCH_QUEUED = Gauge(
+    "reminders_dispatch_queued_calls",
+    "Calls handed to the dispatcher, waiting for a concurrency or rate slot",
+)
+
+DISPATCH_IN_FLIGHT = Gauge(
+    "reminders_dispatch_in_flight_calls",
+    "Calls waiting on Twilio",
+)
+
+DB_CONNECTION_SECONDS = Histogram(
+    "reminders_db_connection_hold_seconds",
+    "Time a session held a pooled database connection",
+    ["engine"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def instrument_engine(engine, label: str):
+    """Record connection hold times for a (sync) engine's pool."""
+    histogram = DB_CONNECTION_SECONDS.labels(label)
+
+    @event.listens_for(engine, "checkout")
+    def checked_out(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def checked_in(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            histogram.observe(time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request by its route template
+    (/api/reminders/{reminder_id}, not the raw path). Streaming responses
+    (the event stream) are timed until the stream ends.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.routes = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], self._route_for(scope), str(status)
+            ).observe(time.perf_counter() - started)
+
+    def _route_for(self, scope) -> str:
+        if self.routes is None:
+            # Routing stores the endpoint in the scope, not the route
+            self.routes = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self.routes.get(scope.get("endpoint"), "unmatched")
+
+
+def render() -> tuple:
+    """The current metrics as (body, content type)."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,92 @@
+"""
+One-time data migrations, run by init_db() after the schema is in place.
+
+Each migration runs in one transaction together with the insert of its
+schema_migrations row, so it is applied exactly once even when the API
+and a worker start at the same time: the second process fails on the
+primary key, rolls back and moves on.
+"""
+
+import logging
+from datetime import timezone
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.models import Reminder, SchemaMigration
+from app.timezones import get_zone
+
+
+logger = logging.getLogger(__name__)
+
+
+# Rows converted per UPDATE batch
+BATCH_SIZE = 5000
+
+
+def scheduled_time_to_utc(connection) -> int:
+    """
+    Convert reminders stored before times were normalized to UTC.
+
+    scheduled_time held wall-clock time in the reminder's own timezone;
+    next_attempt_at held the server's local time. Both become naive UTC.
+
+    Returns:
+        Number of reminders converted
+    """
+    columns = (Reminder.id, Reminder.scheduled_time, Reminder.timezone, Reminder.next_attempt_at)
+    statement = (
+        update(Reminder.__table__)
+        .where(Reminder.__table__.c.id == bindparam("row_id"))
+        .values(scheduled_time=bindparam("utc_time"), next_attempt_at=bindparam("utc_attempt"))
+    )
+    converted = 0
+    last_id = 0
+
+    while True:
+        rows = connection.execute(
+            select(*columns).where(Reminder.id > last_id).order_by(Reminder.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return converted
+
+        batch = []
+        for row in rows:
+            try:
+                zone = get_zone(row.timezone or "UTC")
+            except ValueError:
+                zone = timezone.utc
+            batch.append({
+                "row_id": row.id,
+                "utc_time": row.scheduled_time.replace(tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None),
+                # astimezone() on a naive value reads it as the host's local time
+                "utc_attempt": row.next_attempt_at and row.next_attempt_at.astimezone(timezone.utc).replace(tzinfo=None),
+            })
+
+        connection.execute(statement, batch)
+        converted += len(batch)
+        last_id = rows[-1].id
+
+
+# Applied in order; never rename or reorder an entry
+DATA_MIGRATIONS = [
+    ("scheduled_time_utc", scheduled_time_to_utc),
+]
+
+
+def apply_data_migrations(engine):
+    """Run every migration in DATA_MIGRATIONS that has not been applied yet."""
+    with engine.connect() as connection:
+        applied = set(connection.execute(select(SchemaMigration.name)).scalars())
+
+    for name, migrate in DATA_MIGRATIONS:
+        if name in applied:
+            continue
+        try:
+            with engine.begin() as connection:
+                connection.execute(insert(SchemaMigration).values(name=name))
+                count = migrate(connection)
+        except IntegrityError:
+            # Another process applied it first
+            continue
+        logger.info("Applied data migration %s (%d rows)", name, count)
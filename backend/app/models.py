@@ -1,7 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import BigInteger, Column, ForeignKey, Float, Integer, LargeBinary, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
+# Reminder and dead letter ids carry their shard above SHARD_ID_BITS (see
+# app/database.py). SQLite's INTEGER is 64-bit already, and must stay
+# INTEGER to be the rowid.
+RecordId = BigInteger().with_variant(Integer, "sqlite")
+
 class Reminder(Base):
     """
     Reminder database model
@@ -10,14 +15,28 @@ class Reminder(Base):
     - Title and message
     - Phone number to call
     - Scheduled time and timezone
-    - Status (scheduled, completed, failed)
+    - Status (scheduled, missed, then the call lifecycle: calling, ringing,
+      answered, completed, busy, no-answer, failed; retrying between attempts)
     - Metadata (created_at, updated_at)
     - Call results (call_sid, error_message)
     """
     __tablename__ = "reminders"
+    __table_args__ = (
+        # Startup reload and due-time scans: WHERE status = ? AND scheduled_time < ?
+        Index("ix_reminders_status_scheduled_time", "status", "scheduled_time"),
+        # Keyset pagination over (scheduled_time, id), optionally per number
+        Index("ix_reminders_scheduled_time_id", "scheduled_time", "id"),
+        Index("ix_reminders_phone_scheduled_time", "phone_number", "scheduled_time", "id"),
+        # Status callbacks look reminders up by Twilio call SID
+        Index("ix_reminders_call_sid", "call_sid"),
+        # Heartbeats extend a worker's leases; recovery scans expired ones
+        Index("ix_reminders_claimed_by_lease", "claimed_by", "lease_expires_at"),
+        # Ids are never reused, and a shard's sequence can start at its first id
+        {"sqlite_autoincrement": True},
+    )
 
     # Primary key
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(RecordId, primary_key=True, index=True)
     
     # Reminder content
     title = Column(String(100), nullable=False)
@@ -29,14 +48,33 @@ class Reminder(Base):
     # Scheduling
     scheduled_time = Column(DateTime, nullable=False)
     timezone = Column(String(50), nullable=False, default="America/New_York")
+
+    # Recurrence (see app/recurrence.py): an RRULE makes this row a series
+    # whose scheduled_time is its next occurrence; each fired occurrence
+    # becomes a one-shot reminder pointing back at it with series_id
+    recurrence = Column(String(255), nullable=True)
+    recurrence_start = Column(DateTime, nullable=True)  # first occurrence (UTC)
+    series_id = Column(RecordId, ForeignKey("reminders.id", ondelete="SET NULL"), nullable=True, index=True)
     
     # Status tracking
     status = Column(
         String(20), 
         nullable=False, 
         default="scheduled",
-        # Possible values: scheduled, completed, failed
+        # Possible values: scheduled, missed, calling, ringing, answered,
+        # completed, busy, no-answer, failed, retrying
     )
+
+    # Retries (see app/retry.py)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    # When status is retrying; on a scheduled reminder, a manual trigger
+    # moving its call before scheduled_time (which is left as it was)
+    next_attempt_at = Column(DateTime, nullable=True)
+
+    # Trigger claim (see app/leases.py): the worker dispatching the call
+    # and when its claim lapses unless renewed by heartbeats (UTC)
+    claimed_by = Column(String(64), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
     
     # Metadata - USE func.now() instead of datetime.utcnow
     created_at = Column(DateTime, nullable=False, server_default=func.now())
@@ -47,4 +85,167 @@ class Reminder(Base):
     error_message = Column(Text, nullable=True)   # Error if failed
     
     def __repr__(self):
-        return f"<Reminder(id={self.id}, title='{self.title}', status='{self.status}')>"
\ No newline at end of file
+        return f"<Reminder(id={self.id}, title='{self.title}', status='{self.status}')>"
+
+
+class ArchivedReminder(Base):
+    """
+    A finished reminder moved out of the live table (see app/archive.py)
+
+    Same columns as Reminder, minus the trigger claim, plus archived_at.
+    Rows keep their original id, so GET /api/reminders/{id} finds them.
+    """
+    __tablename__ = "reminders_archive"
+    __table_args__ = (
+        # History lists: keyset pagination over (scheduled_time, id), per number or status
+        Index("ix_reminders_archive_scheduled_time_id", "scheduled_time", "id"),
+        Index("ix_reminders_archive_phone_scheduled_time", "phone_number", "scheduled_time", "id"),
+        Index("ix_reminders_archive_status_scheduled_time", "status", "scheduled_time"),
+    )
+
+    id = Column(RecordId, primary_key=True)
+    title = Column(String(100), nullable=False)
+    message = Column(Text, nullable=False)
+    phone_number = Column(String(20), nullable=False)
+    scheduled_time = Column(DateTime, nullable=False)
+    timezone = Column(String(50), nullable=False)
+    recurrence = Column(String(255), nullable=True)
+    recurrence_start = Column(DateTime, nullable=True)
+    series_id = Column(RecordId, nullable=True)  # no foreign key: the series may be live or archived
+    status = Column(String(20), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    call_sid = Column(String(50), nullable=True)
+    error_message = Column(Text, nullable=True)
+    archived_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<ArchivedReminder(id={self.id}, title='{self.title}', status='{self.status}')>"
+
+
+class Worker(Base):
+    """
+    A process running the scheduler, kept alive by heartbeats (UTC)
+    """
+    __tablename__ = "workers"
+
+    id = Column(String(64), primary_key=True)
+    hostname = Column(String(255), nullable=False)
+    pid = Column(Integer, nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    heartbeat_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<Worker(id='{self.id}', heartbeat_at={self.heartbeat_at})>"
+
+
+class DeadLetter(Base):
+    """
+    A reminder whose call failed for good
+
+    Written when a call fails permanently or runs out of retry attempts;
+    replaying it re-dispatches the reminder and sets replayed_at.
+    """
+    __tablename__ = "dead_letters"
+    __table_args__ = (
+        # Listing and replaying the ones not yet replayed
+        Index("ix_dead_letters_replayed_at_id", "replayed_at", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(RecordId, primary_key=True)
+    reminder_id = Column(RecordId, ForeignKey("reminders.id", ondelete="CASCADE"), nullable=False, index=True)
+    attempts = Column(Integer, nullable=False)
+    error_message = Column(Text, nullable=True)
+    error_code = Column(Integer, nullable=True)  # Twilio error code or HTTP status
+    failed_at = Column(DateTime, nullable=False, server_default=func.now())
+    replayed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<DeadLetter(id={self.id}, reminder_id={self.reminder_id})>"
+
+class Notification(Base):
+    """
+    A message between the API and scheduler worker processes
+
+    channel "scheduler": reminders the worker should (re)schedule or drop
+    channel "api": reminders the worker changed, for the API's cache and
+    event streams, and response cache invalidations between API processes
+    (see app/notifications.py)
+    """
+    __tablename__ = "notifications"
+    __table_args__ = (
+        # Each listener reads its channel past its cursor
+        Index("ix_notifications_channel_id", "channel", "id"),
+        # Ids must not be reused once pruning empties the table, or
+        # listeners whose cursor is past them skip the new messages
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    channel = Column(String(16), nullable=False)
+    action = Column(String(16), nullable=False)  # schedule, cancel, changed, resync, invalidate, clear
+    reminder_id = Column(RecordId, nullable=True)
+    run_at = Column(DateTime, nullable=True)
+    previous_status = Column(String(20), nullable=True)
+    origin = Column(String(64), nullable=True)  # leases.WORKER_ID of the sending API process
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<Notification(id={self.id}, channel='{self.channel}', action='{self.action}')>"
+
+
+class DestinationBucket(Base):
+    """
+    Saved state of a phone number's call token bucket (see
+    app/destinations.py), so pacing survives a restart. Numbers whose
+    bucket is full have no row.
+    """
+    __tablename__ = "destination_buckets"
+
+    phone_number = Column(String(20), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime, nullable=False)  # UTC
+
+    def __repr__(self):
+        return f"<DestinationBucket(phone_number='{self.phone_number}', tokens={self.tokens})>"
+
+
+class IdempotencyKey(Base):
+    """
+    The stored outcome of a write sent with an Idempotency-Key header (see
+    app/idempotency.py). status_code is NULL while the first request with
+    the key is still running.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Expired keys are pruned by expires_at
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    # The primary key is the unique index duplicates collide on
+    scope = Column(String(64), primary_key=True)  # route, e.g. "POST /api/reminders/"
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(32), nullable=True)  # hash of the request it was first used with
+    status_code = Column(Integer, nullable=True)
+    response = Column(LargeBinary, nullable=True)  # JSON body
+    created_at = Column(DateTime, nullable=False)  # UTC
+    expires_at = Column(DateTime, nullable=False)  # UTC; the lease of the claim until status_code is set
+
+    def __repr__(self):
+        return f"<IdempotencyKey(scope='{self.scope}', key='{self.key}', status_code={self.status_code})>"
+
+
+class SchemaMigration(Base):
+    """
+    A one-time data migration that has been applied (see app/migrations.py)
+    """
+    __tablename__ = "schema_migrations"
+
+    name = Column(String(100), primary_key=True)
+    applied_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<SchemaMigration(name='{self.name}')>"
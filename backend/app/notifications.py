@@ -0,0 +1,235 @@
+"""
+Notification table connecting the API and the scheduler worker.
+
+With SCHEDULER_MODE=worker the scheduler runs in its own process
+(python -m app.worker) instead of inside every API replica. The two sides
+talk through the ``notifications`` table, one channel per direction:
+
+- "scheduler": the API wrote a reminder; the worker adds, moves or drops
+  its job ("schedule" / "cancel")
+- "api": the worker changed a reminder (call placed, failed, missed); the
+  API invalidates its response cache and pushes the change to event
+  streams ("changed" / "resync"). API processes also send each other
+  their response cache invalidations here ("invalidate" / "clear", with
+  the sender as origin), in both modes.
+
+Every listener polls its channel past its own cursor, so several workers
+or API replicas each see every message. Messages are applied idempotently
+and the last NOTIFY_LOOKBACK ids are read again on each poll, so a row
+committed out of id order (possible on Postgres) is still picked up.
+Rows older than NOTIFY_RETENTION_SECONDS are pruned.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy import delete, func, insert, select
+
+from app.database import SessionLocal
+from app.models import Notification
+from app.timezones import utcnow
+
+
+logger = logging.getLogger(__name__)
+
+
+# Channels
+SCHEDULER = "scheduler"
+API = "api"
+
+# How often listeners poll (seconds); bounds the signalling delay
+NOTIFY_POLL_SECONDS = float(os.getenv("NOTIFY_POLL_SECONDS", "0.5"))
+
+# Messages read per poll
+NOTIFY_BATCH_SIZE = int(os.getenv("NOTIFY_BATCH_SIZE", "5000"))
+
+# Ids below the cursor read again, for rows that commit out of order
+NOTIFY_LOOKBACK = int(os.getenv("NOTIFY_LOOKBACK", "100"))
+
+# How long messages are kept
+NOTIFY_RETENTION_SECONDS = float(os.getenv("NOTIFY_RETENTION_SECONDS", "3600"))
+
+# How often each listener prunes expired messages
+PRUNE_SECONDS = 60
+
+
+def add(db, channel: str, **message):
+    """Add a message to ``db``'s transaction, so it commits with the change it reports."""
+    db.add(Notification(channel=channel, created_at=utcnow(), **message))
+
+
+def send(channel: str, messages: list):
+    """
+    Write messages to a channel in one transaction.
+
+    Args:
+        channel: SCHEDULER or API
+        messages: Dicts with action and optionally reminder_id, run_at,
+            previous_status, origin
+    """
+    if not messages:
+        return
+
+    now = utcnow()
+    rows = [
+        {"channel": channel, "reminder_id": None, "run_at": None, "previous_status": None,
+         "origin": None, "created_at": now, **message}
+        for message in messages
+    ]
+
+    with SessionLocal() as db:
+        db.execute(insert(Notification), rows)
+        db.commit()
+
+
+class Listener:
+    """
+    Polls one channel and hands new messages to ``handler`` in id order.
+    ``flush``, if given, is called before each poll (and once on stop) to
+    send what this process queued for the others.
+
+    The cursor starts at the newest message when the listener starts;
+    anything older is covered by the caller's own startup (the worker
+    reloads reminders from the table, the API starts with an empty cache).
+    """
+
+    def __init__(self, channel: str, handler, interval: float = NOTIFY_POLL_SECONDS, flush=None):
+        self.channel = channel
+        self.handler = handler
+        self.flush = flush
+        self.interval = interval
+        self.cursor = 0
+        self.seen = set()
+        self.thread = None
+        self.stopped = threading.Event()
+
+        # Metrics
+        self.polls = 0
+        self.received = 0
+        self.pruned = 0
+        self.pruned_at = time.monotonic()
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        with SessionLocal() as db:
+            self.cursor = db.scalar(
+                select(func.max(Notification.id)).where(Notification.channel == self.channel)
+            ) or 0
+            # Messages inside the lookback window are already accounted for
+            self.seen = set(db.scalars(
+                select(Notification.id).where(
+                    Notification.channel == self.channel,
+                    Notification.id > self.cursor - NOTIFY_LOOKBACK,
+                )
+            ))
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, name=f"notify-{self.channel}", daemon=True)
+        self.thread.start()
+        logger.info("Listening for %s notifications", self.channel)
+
+    def stop(self):
+        if not self.running:
+            return
+        self.stopped.set()
+        self.thread.join()
+        if self.flush:
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Error sending %s notifications", self.channel)
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                if self.flush:
+                    self.flush()
+                # Keep reading while a backlog drains
+                while self.poll():
+                    pass
+                if time.monotonic() - self.pruned_at > PRUNE_SECONDS:
+                    self.prune()
+            except Exception:
+                logger.exception("Error polling %s notifications", self.channel)
+
+    def poll(self) -> int:
+        """Read and handle new messages; returns how many were new."""
+        floor = self.cursor - NOTIFY_LOOKBACK
+
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(
+                    Notification.id,
+                    Notification.action,
+                    Notification.reminder_id,
+                    Notification.run_at,
+                    Notification.previous_status,
+                    Notification.origin,
+                )
+                .where(Notification.channel == self.channel, Notification.id > floor)
+                .order_by(Notification.id)
+                .limit(NOTIFY_BATCH_SIZE)
+            ).all()
+
+        self.polls += 1
+        if not rows and self._ids_restarted():
+            return self.poll()
+
+        fresh = [row for row in rows if row.id not in self.seen]
+        if fresh:
+            self.handler(fresh)
+            self.received += len(fresh)
+            self.seen.update(row.id for row in fresh)
+            self.cursor = max(self.cursor, fresh[-1].id)
+            self.seen = {seen_id for seen_id in self.seen if seen_id > self.cursor - NOTIFY_LOOKBACK}
+
+        return len(fresh)
+
+    def _ids_restarted(self) -> bool:
+        """
+        Start over from id 0 if the channel's ids went back below the cursor.
+
+        That happens when pruning emptied a table without AUTOINCREMENT
+        (SQLite databases created before notifications had it): SQLite then
+        hands out ids from 1 again.
+        """
+        with SessionLocal() as db:
+            newest = db.scalar(
+                select(func.max(Notification.id)).where(Notification.channel == self.channel)
+            )
+        if newest is None or newest >= self.cursor:
+            return False
+
+        logger.warning("%s notification ids restarted at %d (cursor %d); reading from the start",
+                       self.channel, newest, self.cursor)
+        self.cursor = 0
+        self.seen = set()
+        return True
+
+    def prune(self):
+        """Delete messages past NOTIFY_RETENTION_SECONDS."""
+        cutoff = utcnow() - timedelta(seconds=NOTIFY_RETENTION_SECONDS)
+        with SessionLocal() as db:
+            self.pruned += db.execute(
+                delete(Notification).where(Notification.created_at < cutoff)
+            ).rowcount
+            db.commit()
+        self.pruned_at = time.monotonic()
+
+    def stats(self) -> dict:
+        """Counters for debugging."""
+        return {
+            "channel": self.channel,
+            "running": self.running,
+            "cursor": self.cursor,
+            "polls": self.polls,
+            "received": self.received,
+            "pruned": self.pruned,
+        }
@@ -0,0 +1,182 @@
+"""
+Recurring reminders (RFC 5545 RRULE).
+
+A recurring reminder is one row, the series: ``recurrence`` holds the rule
+("FREQ=WEEKLY;BYDAY=MO,WE"), ``recurrence_start`` its first occurrence and
+``scheduled_time`` the next one. Occurrences are expanded lazily: only the
+next one is ever scheduled, and the rest are computed from the rule when
+asked for (see upcoming()).
+
+When the series fires, fire_series() copies the due occurrence into a
+regular one-shot reminder (``series_id`` points back at the series) that
+goes through the usual call lifecycle (status callbacks, retries, dead
+letters), and moves the series on to its next occurrence in the same
+transaction. A series with no occurrences left is marked completed.
+
+The rule is evaluated on wall-clock time in the reminder's timezone, so a
+daily 9:00 reminder stays at 9:00 across DST changes. UNTIL must be given
+in UTC ("UNTIL=20270101T000000Z").
+"""
+
+import heapq
+import itertools
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from dateutil.rrule import rrule, rrulestr
+from sqlalchemy import insert
+
+from app.models import Reminder
+from app.timezones import get_zone, to_local
+
+
+logger = logging.getLogger(__name__)
+
+
+# Longest rule text accepted (the column is String(255))
+MAX_RULE_LENGTH = 255
+
+# Occurrences returned by one upcoming-occurrences request, at most
+MAX_OCCURRENCES = int(os.getenv("MAX_OCCURRENCES", "1000"))
+
+
+def validate_rule(rule: str) -> str:
+    """
+    Normalize and check an RRULE.
+
+    Accepts the rule with or without the "RRULE:" prefix; DTSTART comes
+    from scheduled_time, so it may not be part of the rule.
+
+    Returns:
+        The rule without the prefix
+
+    Raises:
+        ValueError: Malformed rule, more than one line, DTSTART, or a
+            secondly frequency
+    """
+    rule = rule.strip()
+    if rule.upper().startswith("RRULE:"):
+        rule = rule[len("RRULE:"):]
+
+    if len(rule) > MAX_RULE_LENGTH or "\n" in rule or ":" in rule:
+        raise ValueError("Recurrence must be a single RRULE line, e.g. FREQ=DAILY;COUNT=10")
+    if "DTSTART" in rule.upper():
+        raise ValueError("Recurrence may not set DTSTART; it starts at scheduled_time")
+    if "FREQ=SECONDLY" in rule.upper():
+        raise ValueError("Recurrence may not repeat more than once a minute")
+
+    try:
+        _rule(rule, datetime(2000, 1, 1, tzinfo=timezone.utc))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid recurrence: {e}") from None
+
+    return rule
+
+
+@lru_cache(maxsize=4096)
+def _rule(rule: str, dtstart: datetime) -> rrule:
+    """Parsed rule anchored at an aware dtstart (rrule objects are immutable)."""
+    return rrulestr(rule, dtstart=dtstart)
+
+
+def occurrences(rule: str, start: datetime, zone: str, after: datetime):
+    """
+    Yield occurrences of ``rule`` later than ``after``, in order.
+
+    Args:
+        rule: RRULE text (validated)
+        start: First occurrence, naive UTC
+        zone: Timezone the rule is evaluated in
+        after: Naive UTC; only occurrences strictly after it are yielded
+
+    Yields:
+        Naive UTC datetimes (the sequence may be infinite)
+    """
+    parsed = _rule(rule, to_local(start, zone))
+    for current in parsed.xafter(after.replace(tzinfo=timezone.utc).astimezone(get_zone(zone))):
+        yield current.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def next_occurrence(reminder, after: datetime):
+    """Next occurrence of a series after ``after`` (naive UTC), or None."""
+    return next(occurrences(reminder.recurrence, reminder.recurrence_start, reminder.timezone, after), None)
+
+
+def fire_series(db, series: list, now: datetime) -> list:
+    """
+    Materialize the due occurrence of each series and advance the series.
+
+    The occurrences inherit the series' claim, so the worker that claimed
+    a series can dispatch its occurrence right away; the series are
+    released. Does not commit.
+
+    Args:
+        db: Session
+        series: Claimed Reminder rows with a recurrence
+        now: Naive UTC; occurrences missed before it are skipped
+
+    Returns:
+        The occurrence Reminder rows, in the order of ``series``
+    """
+    rows = [
+        {
+            "title": reminder.title,
+            "message": reminder.message,
+            "phone_number": reminder.phone_number,
+            "scheduled_time": reminder.scheduled_time,
+            "timezone": reminder.timezone,
+            "status": "scheduled",
+            "series_id": reminder.id,
+            "claimed_by": reminder.claimed_by,
+            "lease_expires_at": reminder.lease_expires_at,
+        }
+        for reminder in series
+    ]
+    created = db.scalars(
+        insert(Reminder).returning(Reminder, sort_by_parameter_order=True), rows
+    ).all()
+
+    for reminder in series:
+        upcoming_time = next_occurrence(reminder, max(reminder.scheduled_time, now))
+        reminder.claimed_by = None
+        reminder.lease_expires_at = None
+        # A manual trigger fired the pending occurrence early
+        reminder.next_attempt_at = None
+        if upcoming_time is None:
+            reminder.status = "completed"
+            logger.info("Reminder series %s has no occurrences left", reminder.id)
+        else:
+            reminder.scheduled_time = upcoming_time
+
+    return created
+
+
+def upcoming(series: list, one_shot, start: datetime, end: datetime, limit: int):
+    """
+    Merge occurrences in [start, end) across reminders, in time order.
+
+    Args:
+        series: Reminder rows with a recurrence
+        one_shot: Iterable of (scheduled_time, Reminder) for reminders
+            without one, already in time order
+        start: Window start, naive UTC
+        end: Window end, naive UTC (exclusive)
+        limit: Occurrences to return at most
+
+    Returns:
+        List of (occurrence time, Reminder) pairs
+    """
+    streams = [one_shot]
+    for reminder in series:
+        rule = (reminder.recurrence, reminder.recurrence_start, reminder.timezone)
+        if reminder.scheduled_time >= start:
+            # The pending occurrence, then the rule after it
+            times = itertools.chain([reminder.scheduled_time], occurrences(*rule, reminder.scheduled_time))
+        else:
+            times = occurrences(*rule, start - timedelta(microseconds=1))
+        streams.append(zip(times, itertools.repeat(reminder)))
+
+    merged = heapq.merge(*streams, key=lambda pair: pair[0])
+    return list(itertools.islice(itertools.takewhile(lambda pair: pair[0] < end, merged), limit))
@@ -0,0 +1,54 @@
+"""
+Retry policy for calls that could not be placed.
+
+A transient failure (network error, 429/5xx, rate-limit error codes; see
+CallError in app/twilio.py) puts the reminder in ``retrying`` and
+schedules another attempt after an exponential backoff with full jitter,
+so a burst of failures does not come back as a burst of retries. A
+permanent failure, or the last allowed attempt, marks it ``failed`` and
+writes a dead letter that can be replayed later at a controlled rate.
+"""
+
+import os
+import random
+from datetime import datetime, timedelta
+
+from app.timezones import utcnow
+
+
+# Calls placed per reminder before it is dead-lettered
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "5"))
+
+# Backoff: attempt n waits up to min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2^(n-1))
+RETRY_BASE_SECONDS = float(os.getenv("RETRY_BASE_SECONDS", "30"))
+RETRY_MAX_SECONDS = float(os.getenv("RETRY_MAX_SECONDS", "3600"))
+
+# Default rate (reminders per second) for dead-letter replays
+REPLAY_RATE = float(os.getenv("DEAD_LETTER_REPLAY_RATE", "1"))
+
+
+def backoff_delay(attempts: int, rng=random) -> float:
+    """
+    Seconds to wait before the next attempt ("full jitter").
+
+    Args:
+        attempts: Attempts made so far (>= 1)
+    """
+    ceiling = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return rng.uniform(0, ceiling)
+
+
+def should_retry(error, attempts: int) -> bool:
+    """Whether a failed attempt gets another try."""
+    return bool(getattr(error, "transient", False)) and attempts < RETRY_MAX_ATTEMPTS
+
+
+def next_attempt_time(attempts: int, now: datetime = None) -> datetime:
+    """When to make the next attempt after ``attempts`` failures."""
+    return (now or utcnow()) + timedelta(seconds=backoff_delay(attempts))
+
+
+def replay_times(count: int, rate: float, now: datetime = None) -> list:
+    """Fire times spacing ``count`` replays ``1 / rate`` seconds apart."""
+    now = now or utcnow()
+    return [now + timedelta(seconds=index / rate) for index in range(count)]
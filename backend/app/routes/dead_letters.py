@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from typing import List, Optional
+from app.database import SHARD_ID_BITS, shards
+from app.models import DeadLetter
+from app.retry import REPLAY_RATE
+from app.schemas import DeadLetterResponse, ReplayRequest, ReplayResponse
+from app.scheduler import replay_dead_letters
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[DeadLetterResponse])
+async def get_dead_letters(
+    replayed: bool = False,
+    after_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    List dead letters (reminders whose call failed for good), in id order:
+    oldest first on each shard, shard after shard
+
+    - replayed: false (default) for pending ones, true for replayed ones
+    - after_id: return dead letters with a larger id (pagination)
+    - limit: Max results (default: 100, max: 1000)
+    """
+    query = select(DeadLetter)
+    if replayed:
+        query = query.where(DeadLetter.replayed_at.is_not(None))
+    else:
+        query = query.where(DeadLetter.replayed_at.is_(None))
+    if after_id is not None:
+        query = query.where(DeadLetter.id > after_id)
+
+    query = query.order_by(DeadLetter.id)
+
+    # Ids carry their shard, so shards are read in order until the page is full
+    letters = []
+    for shard in shards:
+        if after_id is not None and shard.index < after_id >> SHARD_ID_BITS:
+            continue
+        async with shard.AsyncSessionLocal() as db:
+            letters.extend((await db.scalars(query.limit(limit - len(letters)))).all())
+        if len(letters) >= limit:
+            break
+
+    return letters
+
+
+@router.post("/replay", response_model=ReplayResponse)
+async def replay(request: ReplayRequest):
+    """
+    Re-dispatch dead-lettered reminders
+
+    - ids: dead letters to replay (default: every pending one)
+    - rate: reminders per second (default: DEAD_LETTER_REPLAY_RATE)
+    - Reminders are spaced 1/rate seconds apart through the scheduler and
+      get a fresh set of retry attempts
+    """
+    rate = request.rate or REPLAY_RATE
+    replayed = await run_in_threadpool(replay_dead_letters, request.ids, rate)
+
+    return {
+        "replayed": replayed,
+        "rate": rate,
+        "seconds": max(replayed - 1, 0) / rate,
+    }
@@ -1,22 +1,194 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
-from app.models import Reminder
-from app.schemas import ReminderCreate, ReminderUpdate, ReminderResponse
-from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import case, delete, func, insert, literal, select, tuple_, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from app.database import DATABASE_URL, by_shard, is_sqlite, shard_for_phone, shard_of, shards
+from app.models import ArchivedReminder, Reminder
+from app.archive import ARCHIVABLE_STATUSES
+from app.counters import reminder_counts
+from app.cache import reminder_cache, snapshot
+from app.events import CLOSE, EVENT_KEEPALIVE_SECONDS, event_broker, publish_reminder
+from app.idempotency import fingerprint, idempotency_store
+from app.recurrence import MAX_OCCURRENCES, upcoming
+from app.timezones import to_utc, utcnow
+from app.schemas import (
+    ReminderCreate,
+    ReminderUpdate,
+    ReminderResponse,
+    BulkCreateResponse,
+    ImportResponse,
+    OccurrenceResponse,
+    BulkSelection,
+    BulkRescheduleRequest,
+    BulkOperationResponse,
+)
+from datetime import datetime, timedelta
 from app.scheduler import (
     schedule_reminder,
+    schedule_reminders,
     delete_scheduled_reminder,
+    delete_scheduled_reminders,
     update_scheduled_reminder,
     get_scheduled_jobs
 )
+import asyncio
+import base64
+import codecs
+import csv
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import logging
+import orjson
+import os
+import queue
+import tempfile
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Upper bound on items accepted by a single bulk request
+MAX_BULK_ITEMS = int(os.getenv("MAX_BULK_ITEMS", "50000"))
+
+# Ids per UPDATE/DELETE when a bulk operation selects reminders by id
+BULK_ID_CHUNK = 500
+
+# How list pages are built: "orjson" selects ReminderResponse's columns
+# and encodes the rows as they are (they were validated on the way in);
+# "pydantic" loads ORM objects and runs them through ReminderResponse
+LIST_ENCODER = os.getenv("LIST_ENCODER", "orjson")
+
+# Rows fetched per round trip when streaming (NDJSON lists, exports)
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "1000"))
+
+# Imports commit every IMPORT_CHUNK_SIZE valid rows by default
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))
+
+# Failed import lines reported individually; the rest are only counted
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+# Occurrence windows without an end cover this many days
+OCCURRENCE_WINDOW_DAYS = float(os.getenv("OCCURRENCE_WINDOW_DAYS", "7"))
+
+_reminder_list = TypeAdapter(List[ReminderResponse])
+
+# Stored datetimes are naive UTC; orjson marks them "Z" like ReminderResponse
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+# ReminderResponse's fields as columns, in its field order
+_response_columns = [getattr(Reminder, field) for field in ReminderResponse.model_fields]
+_archived_columns = [getattr(ArchivedReminder, field) for field in ReminderResponse.model_fields]
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+async def _reminder_db(reminder_id: int):
+    """
+    Session on the shard holding reminder_id (route dependency).
+
+    Raises 404 for an id no shard hands out.
+    """
+    shard = shard_of(reminder_id)
+    if shard is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Reminder with id {reminder_id} not found"
+        )
+
+    async with shard.AsyncSessionLocal() as db:
+        yield db
+
+
+async def _fan_out(work, targets: dict = None) -> list:
+    """
+    Run ``await work(db, argument)`` for each shard in parallel, each in a
+    session of its own.
+
+    Args:
+        work: Coroutine function taking (AsyncSession, argument)
+        targets: {Shard: argument} (default: every shard, argument None)
+
+    Returns:
+        The results, in targets order
+    """
+    if targets is None:
+        targets = dict.fromkeys(shards)
+
+    async def run(shard, argument):
+        async with shard.AsyncSessionLocal() as db:
+            return await work(db, argument)
+
+    return await asyncio.gather(*(run(shard, argument) for shard, argument in targets.items()))
+
+
+def _selected_shards(ids: Optional[List[int]]) -> dict:
+    """_fan_out() targets for a selection: {shard: its ids}, or every shard when ids is None."""
+    return dict.fromkeys(shards) if ids is None else by_shard(ids)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _cached_response(request: Request, entry, headers: dict = None) -> Response:
+    """Serve a cache entry, or 304 if the client already has it."""
+    headers = {
+        "ETag": entry.etag,
+        # Clients may keep the body but must revalidate before using it
+        "Cache-Control": "no-cache",
+        **entry.headers,
+        **(headers or {}),
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        reminder_cache.not_modified += 1
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+async def _idempotent(idempotency_key: Optional[str], scope: str, request: tuple, work,
+                      response_model, status_code: int = status.HTTP_200_OK):
+    """
+    Run a write once per Idempotency-Key (see app/idempotency.py).
+
+    Args:
+        idempotency_key: Idempotency-Key header; without one work() just runs
+        scope: Endpoint, e.g. "POST /api/reminders/"
+        request: Parts identifying the request (validated body, path ids)
+        work: Coroutine function doing the write and returning the result
+        response_model: Schema the result is serialized with
+        status_code: Status of a successful response
+
+    Returns:
+        work()'s result, or a JSON Response (replayed for a known key)
+    """
+    if idempotency_key is None:
+        return await work()
+
+    async def handler():
+        return response_model.model_validate(await work()).model_dump_json().encode()
+
+    return await idempotency_store.run(
+        scope, idempotency_key, fingerprint(*request), handler, status_code
+    )
 
 
 @router.post("/", response_model=ReminderResponse, status_code=status.HTTP_201_CREATED)
-def create_reminder(reminder: ReminderCreate, db: Session = Depends(get_db)):
+async def create_reminder(reminder: ReminderCreate, idempotency_key: Optional[str] = Header(None)):
     """
     Create a new reminder
     
@@ -24,7 +196,18 @@ def create_reminder(reminder: ReminderCreate, db: Session = Depends(get_db)):
     - Ensures scheduled_time is in the future
     - Phone number must be in E.164 format (+14155552671)
     - Automatically schedules the reminder to trigger at specified time
+    - Stored on the shard its phone number hashes to (see app/database.py)
+    - A retry with the same Idempotency-Key header gets the first response
+      back instead of a second reminder
     """
+    return await _idempotent(
+        idempotency_key, "POST /api/reminders/", (reminder.model_dump_json(),),
+        lambda: _create_reminder(reminder), ReminderResponse, status.HTTP_201_CREATED,
+    )
+
+
+async def _create_reminder(reminder: ReminderCreate) -> Reminder:
+    """Insert and schedule one reminder."""
     # Create reminder in database
     db_reminder = Reminder(
         title=reminder.title,
@@ -32,76 +215,1058 @@ def create_reminder(reminder: ReminderCreate, db: Session = Depends(get_db)):
         phone_number=reminder.phone_number,
         scheduled_time=reminder.scheduled_time,
         timezone=reminder.timezone,
+        recurrence=reminder.recurrence,
+        recurrence_start=reminder.scheduled_time if reminder.recurrence else None,
         status="scheduled"
     )
     
-    db.add(db_reminder)
-    db.commit()
-    db.refresh(db_reminder)
+    async with shard_for_phone(reminder.phone_number).AsyncSessionLocal() as db:
+        db.add(db_reminder)
+        await db.commit()
+        await db.refresh(db_reminder)
     
-    print(f"✅ Created reminder: {db_reminder.id} - {db_reminder.title}")
+    reminder_cache.invalidate(db_reminder.id, snapshot(db_reminder))
+    publish_reminder("created", db_reminder)
     
-    # Schedule the job - use the datetime directly
-    success = schedule_reminder(db_reminder.id, db_reminder.scheduled_time)
+    logger.info("Created reminder %s - %s", db_reminder.id, db_reminder.title)
+    
+    # Schedule the job - job store writes block, so keep them off the loop
+    success = await run_in_threadpool(schedule_reminder, db_reminder.id, db_reminder.scheduled_time)
     
     if not success:
-        print(f"⚠️ Warning: Failed to schedule reminder {db_reminder.id}")
+        logger.warning("Failed to schedule reminder %s", db_reminder.id)
     
     return db_reminder
 
 
+def _parse_bulk_body(body: bytes, content_type: str) -> list:
+    """
+    Parse a bulk request body.
+
+    Accepts a JSON array (application/json) or one JSON object per line
+    (application/x-ndjson). Raises ValueError on malformed input.
+    """
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        return [json.loads(line) for line in body.splitlines() if line.strip()]
+
+    items = json.loads(body)
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array of reminders")
+    return items
+
+
+def _validate_bulk(items: list) -> tuple:
+    """
+    Validate bulk items with ReminderCreate.
+
+    Returns:
+        (rows, row_indexes, results): insertable rows, their positions in
+        items, and results for the invalid items
+    """
+    results = []
+    rows = []
+    row_indexes = []
+
+    for index, item in enumerate(items):
+        try:
+            reminder = ReminderCreate.model_validate(item)
+        except ValidationError as e:
+            results.append({
+                "index": index,
+                "status": "invalid",
+                "errors": [
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                    for err in e.errors()
+                ],
+            })
+            continue
+
+        rows.append({
+            "title": reminder.title,
+            "message": reminder.message,
+            "phone_number": reminder.phone_number,
+            "scheduled_time": reminder.scheduled_time,
+            "timezone": reminder.timezone,
+            "recurrence": reminder.recurrence,
+            "recurrence_start": reminder.scheduled_time if reminder.recurrence else None,
+            "status": "scheduled",
+        })
+        row_indexes.append(index)
+
+    return rows, row_indexes, results
+
+
+async def _bulk_create(items: list) -> dict:
+    """Validate, insert and schedule a batch of reminders."""
+    # Validating thousands of items is CPU work; keep it off the event loop
+    rows, row_indexes, results = await run_in_threadpool(_validate_bulk, items)
+
+    if rows:
+        groups = {}
+        for index, row in zip(row_indexes, rows):
+            groups.setdefault(shard_for_phone(row["phone_number"]), []).append((index, row))
+
+        async def insert_group(db, group):
+            # One transaction per shard, executemany with RETURNING for the new ids
+            result = await db.execute(
+                insert(Reminder).returning(
+                    Reminder.id, Reminder.scheduled_time, sort_by_parameter_order=True
+                ),
+                [row for _, row in group],
+            )
+            created = result.all()
+            await db.commit()
+            return [(index, row) for (index, _), row in zip(group, created)]
+
+        created = [pair for pairs in await _fan_out(insert_group, groups) for pair in pairs]
+        reminder_cache.invalidate_lists()
+        event_broker.publish("bulk_created", {"count": len(created)})
+
+        for index, row in created:
+            results.append({"index": index, "id": row.id, "status": "created"})
+
+        scheduled = await run_in_threadpool(
+            schedule_reminders, [(row.id, row.scheduled_time) for _, row in created]
+        )
+        if not scheduled:
+            logger.warning("Failed to schedule %d bulk reminders", len(created))
+
+    results.sort(key=lambda r: r["index"])
+
+    logger.info("Bulk created %d reminders (%d invalid)", len(rows), len(items) - len(rows))
+
+    return {
+        "created": len(rows),
+        "failed": len(items) - len(rows),
+        "results": results,
+    }
+
+
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def bulk_create_reminders(request: Request, idempotency_key: Optional[str] = Header(None)):
+    """
+    Create many reminders in one request
+
+    - Body is a JSON array, or NDJSON with Content-Type application/x-ndjson
+    - Every item is validated like POST /api/reminders/
+    - Valid items are inserted in a single transaction (one per shard, run
+      in parallel) and scheduled as a batch
+    - Invalid items are reported per index and do not block the rest
+    - Idempotency-Key: a retry gets the first response back
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+
+    async def create():
+        # Parsed here, so a replayed response skips it
+        try:
+            items = _parse_bulk_body(body, content_type)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Malformed bulk body: {e}"
+            )
+
+        if len(items) > MAX_BULK_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Bulk requests are limited to {MAX_BULK_ITEMS} reminders"
+            )
+
+        return await _bulk_create(items)
+
+    return await _idempotent(
+        idempotency_key, "POST /api/reminders/bulk", (content_type, body), create, BulkCreateResponse,
+    )
+
+
+@router.post("/bulk/reschedule", response_model=BulkOperationResponse)
+async def bulk_reschedule_reminders(request: BulkRescheduleRequest, idempotency_key: Optional[str] = Header(None)):
+    """
+    Move many scheduled reminders at once
+
+    - Select by ids and/or the list filters (status, phone_number,
+      scheduled_after, scheduled_before); at least one is required
+    - shift_minutes moves each reminder by N minutes (negative: earlier);
+      scheduled_time moves all of them to one time
+    - Only reminders with status scheduled are moved; recurring ones
+      restart from their new time. Reminders a negative shift would move
+      to now or earlier stay put and are counted as skipped
+    - One UPDATE ... RETURNING (per BULK_ID_CHUNK ids) on each shard
+      holding selected reminders, in parallel, then one batched scheduler
+      update
+    - Idempotency-Key: a retry gets the first response back instead of
+      shifting the reminders again
+    """
+    filters = _bulk_filters(request)
+
+    if (request.shift_minutes is None) == (request.scheduled_time is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Give exactly one of shift_minutes and scheduled_time"
+        )
+
+    if request.shift_minutes is not None:
+        new_time = _shifted(Reminder.scheduled_time, request.shift_minutes * 60)
+    else:
+        when = to_utc(request.scheduled_time, request.timezone or "UTC")
+        if when <= utcnow():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="scheduled_time must be in the future"
+            )
+        new_time = literal(when, Reminder.scheduled_time.type)
+
+    return await _idempotent(
+        idempotency_key, "POST /api/reminders/bulk/reschedule", (request.model_dump_json(),),
+        lambda: _bulk_reschedule(request, filters, new_time), BulkOperationResponse,
+    )
+
+
+async def _bulk_reschedule(request: BulkRescheduleRequest, filters: list, new_time) -> dict:
+    """
+    Move the selected scheduled reminders to new_time (SQL expression).
+
+    Reminders whose new time would not be in the future are left where
+    they are and counted as skipped.
+    """
+    now = literal(utcnow(), Reminder.scheduled_time.type)
+    skipped = select(func.count()).select_from(Reminder).where(
+        *filters, Reminder.status == "scheduled", new_time <= now
+    )
+    statement = (
+        update(Reminder)
+        .where(*filters, Reminder.status == "scheduled", new_time > now)
+        .values(
+            scheduled_time=new_time,
+            # A moved series starts over from its new time
+            recurrence_start=case((Reminder.recurrence.is_not(None), new_time), else_=None),
+        )
+        .returning(Reminder.id, Reminder.scheduled_time)
+        .execution_options(synchronize_session=False)
+    )
+
+    async def move(db, ids):
+        moved, left = [], 0
+        for id_filter in _id_chunks(ids):
+            left += await db.scalar(skipped.where(*id_filter))
+            moved.extend((await db.execute(statement.where(*id_filter))).all())
+        await db.commit()
+        return moved, left
+
+    results = await _fan_out(move, _selected_shards(request.ids))
+    moved = [row for rows, _ in results for row in rows]
+    left = sum(count for _, count in results)
+
+    if moved:
+        reminder_cache.clear()
+        event_broker.publish("bulk_rescheduled", {"count": len(moved)})
+
+    scheduled = await run_in_threadpool(schedule_reminders, [(row.id, row.scheduled_time) for row in moved])
+
+    logger.info("Bulk rescheduled %d reminders (%d skipped, would be in the past)", len(moved), left)
+
+    return {"affected": len(moved), "skipped": left, "scheduler_updated": scheduled}
+
+
+@router.post("/bulk/cancel", response_model=BulkOperationResponse)
+async def bulk_cancel_reminders(selection: BulkSelection, idempotency_key: Optional[str] = Header(None)):
+    """
+    Delete many reminders at once, like DELETE /{id} for each
+
+    - Same selection as POST /bulk/reschedule (ids and/or filters, at least
+      one); any status matches, pass status=scheduled for pending only
+    - One DELETE ... RETURNING (per BULK_ID_CHUNK ids) on each shard
+      holding selected reminders, in parallel, then one batched removal
+      from the scheduler
+    - Idempotency-Key: a retry gets the first response back
+    """
+    filters = _bulk_filters(selection)
+
+    return await _idempotent(
+        idempotency_key, "POST /api/reminders/bulk/cancel", (selection.model_dump_json(),),
+        lambda: _bulk_cancel(selection, filters), BulkOperationResponse,
+    )
+
+
+async def _bulk_cancel(selection: BulkSelection, filters: list) -> dict:
+    """Delete the selected reminders and drop their jobs."""
+    statement = (
+        delete(Reminder)
+        .where(*filters)
+        .returning(Reminder.id)
+        .execution_options(synchronize_session=False)
+    )
+
+    async def remove(db, ids):
+        deleted = []
+        for id_filter in _id_chunks(ids):
+            deleted.extend((await db.scalars(statement.where(*id_filter))).all())
+        await db.commit()
+        return deleted
+
+    deleted = [rid for ids in await _fan_out(remove, _selected_shards(selection.ids)) for rid in ids]
+
+    if deleted:
+        reminder_cache.clear()
+        event_broker.publish("bulk_deleted", {"count": len(deleted)})
+
+    removed = await run_in_threadpool(delete_scheduled_reminders, deleted)
+
+    logger.info("Bulk deleted %d reminders", len(deleted))
+
+    return {"affected": len(deleted), "scheduler_updated": removed}
+
+
+def _bulk_filters(selection: BulkSelection) -> list:
+    """WHERE clauses for a bulk selection (400 unless it selects something explicitly)."""
+    if selection.ids is None and not any((
+        selection.status, selection.phone_number, selection.scheduled_after, selection.scheduled_before
+    )):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Select reminders by ids or at least one filter"
+        )
+
+    if selection.ids is not None and len(selection.ids) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Bulk requests are limited to {MAX_BULK_ITEMS} reminders"
+        )
+
+    return _list_filters(
+        selection.status, selection.phone_number,
+        _as_utc(selection.scheduled_after), _as_utc(selection.scheduled_before),
+    )
+
+
+def _id_chunks(ids: Optional[List[int]]):
+    """Extra WHERE clauses splitting a statement into BULK_ID_CHUNK-id pieces."""
+    if ids is None:
+        yield []
+        return
+
+    for start in range(0, len(ids), BULK_ID_CHUNK):
+        yield [Reminder.id.in_(ids[start:start + BULK_ID_CHUNK])]
+
+
+def _shifted(column, seconds: int):
+    """SQL for ``column + seconds``."""
+    if is_sqlite(DATABASE_URL):
+        # Stored as text, "YYYY-MM-DD HH:MM:SS.ffffff": shift the whole
+        # seconds and keep the fraction as it was
+        return func.strftime("%Y-%m-%d %H:%M:%S", column, f"{seconds:+d} seconds").concat(func.substr(column, 20))
+    return column + timedelta(seconds=seconds)
+
+
+def _encode_cursor(scheduled_time: datetime, reminder_id: int) -> str:
+    """Opaque page token for the keyset position (scheduled_time, id)."""
+    raw = f"{scheduled_time.isoformat()}|{reminder_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Inverse of _encode_cursor; raises 400 on a malformed token."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        scheduled_time, reminder_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(scheduled_time), int(reminder_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+@router.get("/export")
+async def export_reminders(
+    format: Literal["csv", "ndjson"] = "csv",
+    status: Optional[str] = None,
+    phone_number: Optional[str] = None,
+    scheduled_after: Optional[datetime] = None,
+    scheduled_before: Optional[datetime] = None,
+):
+    """
+    Stream every matching reminder as CSV (with a header row) or NDJSON
+
+    Same filters as GET /api/reminders/. Rows are read in id order on a
+    server-side cursor, STREAM_CHUNK_ROWS at a time, so exports of any size
+    run in constant memory; ids carry their shard, so reading the shards
+    one after another keeps that order. Archived reminders follow the live
+    ones. The output can be fed to POST /import.
+    """
+    filters = (status, phone_number, _as_utc(scheduled_after), _as_utc(scheduled_before))
+    queries = [select(*_response_columns).where(*_list_filters(*filters)).order_by(Reminder.id)]
+    if _includes_archive(status):
+        queries.append(
+            select(*_archived_columns)
+            .where(*_list_filters(*filters, model=ArchivedReminder))
+            .order_by(ArchivedReminder.id)
+        )
+
+    if format == "csv":
+        body, media_type = _csv_reminders(_streamed_rows(*queries)), "text/csv"
+    else:
+        body, media_type = _ndjson_reminders(_streamed_rows(*queries)), "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="reminders.{format}"'},
+    )
+
+
+class _BodyLines:
+    """
+    Lines of a request body, for a parser running in a worker thread.
+
+    The event loop feeds raw chunks with put(); iterating (in the thread)
+    decodes them incrementally and yields complete lines. The queue is
+    bounded, so a slow parser holds back the upload instead of buffering it.
+    """
+
+    def __init__(self, max_chunks: int = 16):
+        self.chunks = queue.Queue(max_chunks)
+
+    def __iter__(self):
+        decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        pending = ""
+
+        while (chunk := self.chunks.get()) is not None:
+            pending += decoder.decode(chunk)
+            lines = pending.splitlines(keepends=True)
+            pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+            yield from lines
+
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+
+def _import_records(lines, format: str):
+    """Yield (line number, item or ValueError) for each record of an import."""
+    if format == "csv":
+        reader = csv.DictReader(lines)
+        try:
+            for record in reader:
+                # Empty cells are missing fields, not empty strings
+                yield reader.line_num, {key: value for key, value in record.items() if value not in ("", None)}
+        except csv.Error as e:
+            yield reader.line_num, ValueError(f"Malformed CSV: {e}")
+        return
+
+    for line, text in enumerate(lines, start=1):
+        if not text.strip():
+            continue
+        try:
+            item = json.loads(text)
+        except ValueError as e:
+            yield line, ValueError(f"Malformed JSON: {e}")
+            continue
+        yield line, item if isinstance(item, dict) else ValueError("Expected a JSON object")
+
+
+def _import_reminders(lines, format: str, chunk_size: int) -> dict:
+    """
+    Validate, insert and schedule an import, committing every chunk_size
+    valid rows (runs in a worker thread with a sync session).
+    """
+    report = {"created": 0, "failed": 0, "chunks": 0, "errors": [], "errors_truncated": False}
+
+    def fail(line: int, errors: list):
+        report["failed"] += 1
+        if len(report["errors"]) < IMPORT_MAX_ERRORS:
+            report["errors"].append({"line": line, "errors": errors})
+        else:
+            report["errors_truncated"] = True
+
+    def flush(items: list, lines: list):
+        rows, _, invalid = _validate_bulk(items)
+        for result in invalid:
+            fail(lines[result["index"]], result["errors"])
+        if not rows:
+            return
+
+        groups = {}
+        for row in rows:
+            groups.setdefault(shard_for_phone(row["phone_number"]), []).append(row)
+
+        created = []
+        for shard, shard_rows in groups.items():
+            with shard.SessionLocal() as db:
+                # Ids aren't matched back to lines, so rows can go in batched
+                # multi-row INSERTs instead of one statement per row
+                created.extend(db.execute(
+                    insert(Reminder).returning(Reminder.id, Reminder.scheduled_time), shard_rows
+                ).all())
+                db.commit()
+
+        report["created"] += len(created)
+        report["chunks"] += 1
+        reminder_cache.invalidate_lists()
+        event_broker.publish("bulk_created", {"count": len(created)})
+        if not schedule_reminders([(row.id, row.scheduled_time) for row in created]):
+            logger.warning("Failed to schedule %d imported reminders", len(created))
+
+    items, item_lines = [], []
+    for line, item in _import_records(lines, format):
+        if isinstance(item, ValueError):
+            fail(line, [str(item)])
+            continue
+        items.append(item)
+        item_lines.append(line)
+        if len(items) >= chunk_size:
+            flush(items, item_lines)
+            items, item_lines = [], []
+    flush(items, item_lines)
+
+    logger.info("Imported %d reminders in %d chunks (%d failed)",
+                report["created"], report["chunks"], report["failed"])
+    return report
+
+
+@router.post("/import", response_model=ImportResponse)
+async def import_reminders(
+    request: Request,
+    chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=MAX_BULK_ITEMS),
+    idempotency_key: Optional[str] = Header(None),
+):
+    """
+    Create reminders from a streamed CSV or NDJSON upload
+
+    - Content-Type text/csv (header row naming the fields) or
+      application/x-ndjson (one JSON object per line)
+    - Every record is validated like POST /api/reminders/; other columns
+      (such as those of an export) are ignored
+    - Parsed while the upload streams in, and committed (one transaction
+      per shard) and scheduled every chunk_size valid rows, so files of
+      millions of rows use constant memory
+    - Invalid or malformed lines are reported by line number and skipped;
+      chunks committed before a failure stay committed
+    - Idempotency-Key: the upload is first spooled to a temporary file
+      and hashed, so a retry of the same file gets the first report back
+      and another file under the same key gets 422 before anything is
+      committed
+    """
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        format = "csv"
+    elif "ndjson" in content_type or "jsonlines" in content_type:
+        format = "ndjson"
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson"
+        )
+
+    if idempotency_key is None:
+        return await _stream_import(request.stream(), format, chunk_size)
+
+    # The key must be checked against the whole file before the first chunk
+    # commits; a temporary file keeps memory constant meanwhile
+    with tempfile.TemporaryFile() as upload:
+        digest = hashlib.blake2b(digest_size=16)
+        async for chunk in request.stream():
+            digest.update(chunk)
+            await run_in_threadpool(upload.write, chunk)
+        upload.seek(0)
+
+        return await _idempotent(
+            idempotency_key, "POST /api/reminders/import", (format, chunk_size, digest.hexdigest()),
+            lambda: _stream_import(_file_chunks(upload), format, chunk_size), ImportResponse,
+        )
+
+
+async def _file_chunks(file, size: int = 64 * 1024):
+    """Read a file in chunks without blocking the event loop."""
+    while chunk := await run_in_threadpool(file.read, size):
+        yield chunk
+
+
+async def _stream_import(chunks, format: str, chunk_size: int) -> dict:
+    """Feed an upload (async iterable of byte chunks) to _import_reminders() in a worker thread."""
+    lines = _BodyLines()
+    importer = asyncio.ensure_future(
+        run_in_threadpool(_import_reminders, lines, format, chunk_size)
+    )
+
+    try:
+        async for chunk in chunks:
+            # Wait for room in the queue without blocking the event loop
+            while not importer.done():
+                try:
+                    lines.chunks.put_nowait(chunk)
+                    break
+                except queue.Full:
+                    await asyncio.sleep(0.005)
+    finally:
+        while not importer.done():
+            try:
+                lines.chunks.put_nowait(None)
+                break
+            except queue.Full:
+                await asyncio.sleep(0.005)
+
+    return await importer
+
+
 @router.get("/", response_model=List[ReminderResponse])
-def get_reminders(
+async def get_reminders(
+    request: Request,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    phone_number: Optional[str] = None,
+    scheduled_after: Optional[datetime] = None,
+    scheduled_before: Optional[datetime] = None,
+    order: Literal["asc", "desc"] = "asc",
+    cursor: Optional[str] = None,
+    include_occurrences: bool = False,
 ):
     """
-    Get all reminders
+    Get all reminders, ordered by (scheduled_time, id)
     
     Optional filters:
-    - skip: Pagination offset (default: 0)
-    - limit: Max results (default: 100)
-    - status: Filter by status (scheduled, completed, failed)
+    - status: Filter by status (scheduled, calling, ringing, answered,
+      completed, busy, no-answer, failed, missed)
+    - phone_number: Filter by destination number
+    - scheduled_after / scheduled_before: scheduled_time range [after, before)
+    - include_occurrences: Also list the reminders recurring series fired
+      (series_id set); by default only the series themselves are listed
+    - order: asc (default) or desc
+    - limit: Max results (default: 100, max: 1000)
+    - cursor: Page token from a previous X-Next-Cursor header
+    - skip: Legacy offset pagination; prefer cursor for deep pages
+
+    Response headers:
+    - X-Next-Cursor: token for the next page (absent on the last page)
+    - X-Total-Count: matching rows, cached for up to COUNT_CACHE_TTL seconds
+    - ETag: send it back as If-None-Match to get 304 if the page is unchanged
+
+    With Accept: application/x-ndjson every matching reminder after
+    cursor is streamed, one JSON object per line (limit and skip are
+    ignored, nothing is cached).
+
+    Unless status is one a reminder is still working through, archived
+    reminders are listed too (see app/archive.py). Every shard is queried
+    in parallel and the pages merged.
     """
-    query = db.query(Reminder)
+    scheduled_after, scheduled_before = _as_utc(scheduled_after), _as_utc(scheduled_before)
+    count_key = (status, phone_number, scheduled_after, scheduled_before, include_occurrences)
+
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _ndjson_reminders(_merged_rows(_list_query(count_key, order, cursor), order)),
+            media_type="application/x-ndjson",
+        )
+
+    cache_key = ("list", count_key, (order, limit, cursor, 0 if cursor else skip))
+
+    entry = reminder_cache.get(cache_key)
+    if entry is None:
+        entry = await _fetch_reminder_page(cache_key, count_key, order, limit, cursor, skip)
+
+    total = reminder_counts.lookup(count_key)
+    if total is None:
+        total = sum(await _fan_out(lambda db, _: _count(db, count_key)))
+        reminder_counts.store(count_key, total)
+
+    return _cached_response(request, entry, {"X-Total-Count": str(total)})
+
+
+async def _count(db: AsyncSession, filters: tuple) -> int:
+    """Reminders on db's shard matching the list filters, live and archived."""
+    total = await db.scalar(select(func.count(Reminder.id)).where(*_list_filters(*filters)))
+    if _includes_archive(filters[0]):
+        total += await db.scalar(
+            select(func.count(ArchivedReminder.id)).where(*_list_filters(*filters, model=ArchivedReminder))
+        )
+    return total
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """A range filter as naive UTC, like scheduled_time (naive input is UTC)."""
+    return to_utc(value) if value else None
+
+
+def _list_filters(status, phone_number, scheduled_after, scheduled_before,
+                  include_occurrences=True, model=Reminder) -> list:
+    """WHERE clauses for the list endpoint's filters (on reminders or the archive)."""
+    filters = []
     
-    # Filter by status if provided
+    if not include_occurrences:
+        filters.append(model.series_id.is_(None))
     if status:
-        query = query.filter(Reminder.status == status)
-    
-    # Apply pagination
-    reminders = query.offset(skip).limit(limit).all()
-    
-    print(f"📋 Fetched {len(reminders)} reminders (status={status or 'all'})")
-    
-    return reminders
+        filters.append(model.status == status)
+    if phone_number:
+        filters.append(model.phone_number == phone_number)
+    if scheduled_after:
+        filters.append(model.scheduled_time >= scheduled_after)
+    if scheduled_before:
+        filters.append(model.scheduled_time < scheduled_before)
 
+    return filters
 
-@router.get("/{reminder_id}", response_model=ReminderResponse)
-def get_reminder(reminder_id: int, db: Session = Depends(get_db)):
+
+def _includes_archive(status: Optional[str]) -> bool:
+    """Whether a list filtered by status can match archived reminders."""
+    return not status or status in ARCHIVABLE_STATUSES
+
+
+def _list_query(filters: tuple, order: str, cursor: Optional[str], limit: Optional[int] = None):
     """
-    Get a single reminder by ID
-    
-    Returns 404 if reminder not found
+    _response_columns rows matching the list filters, ordered by
+    (scheduled_time, id) and starting after cursor.
+
+    When the filters can match archived reminders, each table is paged on
+    its own index (up to limit rows) and the two are merged.
     """
-    reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
+    live = _ordered(select(*_response_columns).where(*_list_filters(*filters)), order, cursor)
+    if not _includes_archive(filters[0]):
+        return live if limit is None else live.limit(limit)
+
+    archived = _ordered(
+        select(*_archived_columns).where(*_list_filters(*filters, model=ArchivedReminder)),
+        order, cursor, ArchivedReminder,
+    )
+    if limit is not None:
+        live, archived = live.limit(limit), archived.limit(limit)
+
+    merged = union_all(select(live.subquery()), select(archived.subquery())).subquery()
+    if order == "asc":
+        query = select(merged).order_by(merged.c.scheduled_time, merged.c.id)
+    else:
+        query = select(merged).order_by(merged.c.scheduled_time.desc(), merged.c.id.desc())
+    return query if limit is None else query.limit(limit)
+
+
+async def _fetch_reminder_page(cache_key, filters: tuple, order, limit, cursor, skip):
+    """Query one list page on every shard, merge them and cache the serialized body."""
+    token = reminder_cache.token()
+    offset = skip if skip and not cursor else 0
+
+    # One extra row tells us whether there is a next page
+    query = _list_query(filters, order, cursor, offset + limit + 1)
+    if offset and len(shards) == 1:
+        query, offset = query.offset(offset), 0
+
+    async def page(db, _):
+        return (await db.execute(query)).all()
+
+    pages = await _fan_out(page)
+    if len(pages) == 1:
+        reminders = pages[0]
+    else:
+        # Each shard returned its first offset + limit + 1 rows
+        merged = heapq.merge(*pages, key=_position(order))
+        reminders = list(itertools.islice(merged, offset, offset + limit + 1))
+    headers = {}
+    if len(reminders) > limit:
+        reminders = reminders[:limit]
+        last = reminders[-1]
+        headers["X-Next-Cursor"] = _encode_cursor(last.scheduled_time, last.id)
     
-    if not reminder:
+    logger.debug("Fetched %d reminders (status=%s)", len(reminders), filters[0] or "all")
+
+    if LIST_ENCODER == "orjson":
+        body = orjson.dumps([row._asdict() for row in reminders], option=_ORJSON_OPTIONS)
+    else:
+        body = _reminder_list.dump_json(_reminder_list.validate_python([row._asdict() for row in reminders]))
+    return reminder_cache.put(cache_key, body, headers, token=token)
+
+
+def _ordered(query, order: str, cursor: Optional[str], model=Reminder):
+    """Order a list query by (scheduled_time, id), starting after cursor."""
+    if cursor:
+        position = tuple_(model.scheduled_time, model.id)
+        after = _decode_cursor(cursor)
+        query = query.where(position > after if order == "asc" else position < after)
+
+    if order == "asc":
+        return query.order_by(model.scheduled_time, model.id)
+    return query.order_by(model.scheduled_time.desc(), model.id.desc())
+
+
+def _position(order: str):
+    """Sort key putting list rows in list order, smallest first (for merging shards)."""
+    if order == "asc":
+        return lambda row: (row.scheduled_time, row.id)
+    return lambda row: (_EPOCH - row.scheduled_time, -row.id)
+
+
+async def _streamed_rows(*queries):
+    """
+    Yield the rows of each query in turn, on each shard in turn, in
+    partitions of STREAM_CHUNK_ROWS, on a server-side cursor, so memory
+    stays flat whatever the table size.
+
+    Opens its own sessions: the request's session may be closed before a
+    long stream ends.
+    """
+    for query in queries:
+        for shard in shards:
+            async with shard.AsyncSessionLocal() as db:
+                result = await db.stream(query.execution_options(yield_per=STREAM_CHUNK_ROWS))
+                async for rows in result.partitions():
+                    yield rows
+
+
+async def _shard_rows(shard, query):
+    """Yield the rows of query on one shard, one by one (streamed like _streamed_rows)."""
+    async with shard.AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=STREAM_CHUNK_ROWS))
+        async for rows in result.partitions():
+            for row in rows:
+                yield row
+
+
+async def _merged_rows(query, order: str):
+    """
+    Yield the rows of a list query from every shard, merged into list
+    order, in partitions of STREAM_CHUNK_ROWS. Each shard is streamed on
+    its own cursor, so memory stays flat.
+    """
+    if len(shards) == 1:
+        async for rows in _streamed_rows(query):
+            yield rows
+        return
+
+    key = _position(order)
+    streams = [_shard_rows(shard, query) for shard in shards]
+    try:
+        heads = []
+        for index, stream in enumerate(streams):
+            row = await anext(stream, None)
+            if row is not None:
+                heads.append((key(row), index, row))
+        heapq.heapify(heads)
+
+        rows = []
+        while heads:
+            _, index, row = heads[0]
+            rows.append(row)
+            following = await anext(streams[index], None)
+            if following is None:
+                heapq.heappop(heads)
+            else:
+                heapq.heapreplace(heads, (key(following), index, following))
+            if len(rows) >= STREAM_CHUNK_ROWS:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+    finally:
+        for stream in streams:
+            await stream.aclose()
+
+
+async def _ndjson_reminders(chunks):
+    """Yield chunks of _response_columns rows as NDJSON."""
+    async for rows in chunks:
+        yield b"".join(orjson.dumps(row._asdict(), option=_ORJSON_OPTIONS) + b"\n" for row in rows)
+
+
+async def _csv_reminders(chunks):
+    """Yield chunks of _response_columns rows as CSV, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(ReminderResponse.model_fields)
+
+    async for rows in chunks:
+        writer.writerows(
+            [value.isoformat() + "Z" if isinstance(value, datetime) else value for value in row]
+            for row in rows
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+@router.get("/occurrences", response_model=List[OccurrenceResponse])
+async def list_occurrences(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    phone_number: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_OCCURRENCES),
+):
+    """
+    Upcoming occurrences of scheduled reminders in [start, end), in time order
+
+    Recurring reminders are expanded from their rule on the fly; nothing
+    is stored per occurrence. One-shot reminders appear once.
+
+    - start: window start (default: now); without an offset it is UTC
+    - end: window end (default: start + OCCURRENCE_WINDOW_DAYS)
+    - phone_number: only reminders for this destination
+    - limit: max occurrences (default: 100, max: MAX_OCCURRENCES)
+    """
+    filters = [Reminder.phone_number == phone_number] if phone_number else []
+    return await _occurrences(filters, start, end, limit)
+
+
+@router.get("/{reminder_id}/occurrences", response_model=List[OccurrenceResponse])
+async def list_reminder_occurrences(
+    reminder_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=MAX_OCCURRENCES),
+    db: AsyncSession = Depends(_reminder_db)
+):
+    """
+    Upcoming occurrences of one reminder in [start, end)
+
+    Same parameters as GET /occurrences. Returns 404 if the reminder is
+    not found; a reminder that is no longer scheduled has none.
+    """
+    if not await db.get(Reminder, reminder_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Reminder with id {reminder_id} not found"
         )
+
+    return await _occurrences([Reminder.id == reminder_id], start, end, limit, {shard_of(reminder_id): None})
+
+
+async def _occurrences(filters: list, start, end, limit: int, targets: dict = None) -> list:
+    """Occurrences of the scheduled reminders matching filters in [start, end), on targets (default: every shard)."""
+    start = _as_utc(start) or utcnow()
+    end = _as_utc(end) or start + timedelta(days=OCCURRENCE_WINDOW_DAYS)
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must be after start"
+        )
+
+    filters = [*filters, Reminder.status == "scheduled", Reminder.scheduled_time < end]
+
+    async def load(db, _):
+        series = (await db.scalars(select(Reminder).where(*filters, Reminder.recurrence.is_not(None)))).all()
+        one_shot = (await db.scalars(
+            select(Reminder)
+            .where(*filters, Reminder.recurrence.is_(None), Reminder.scheduled_time >= start)
+            .order_by(Reminder.scheduled_time, Reminder.id)
+            .limit(limit)
+        )).all()
+        return series, one_shot
+
+    loaded = await _fan_out(load, targets)
+    series = [reminder for shard_series, _ in loaded for reminder in shard_series]
+    one_shot = heapq.merge(*(shard_one_shot for _, shard_one_shot in loaded),
+                           key=lambda reminder: (reminder.scheduled_time, reminder.id))
+
+    return [
+        OccurrenceResponse(
+            reminder_id=reminder.id,
+            title=reminder.title,
+            phone_number=reminder.phone_number,
+            timezone=reminder.timezone,
+            scheduled_time=when,
+            recurrence=reminder.recurrence,
+        )
+        for when, reminder in upcoming(
+            series, ((reminder.scheduled_time, reminder) for reminder in one_shot), start, end, limit
+        )
+    ]
+
+
+@router.get("/events")
+async def stream_reminder_events(
+    status: Optional[str] = None,
+    phone_number: Optional[str] = None,
+    ids: Optional[str] = Query(None, description="Comma-separated reminder ids")
+):
+    """
+    Stream reminder changes as Server-Sent Events
+
+    Optional filters (combined with AND):
+    - status: only reminders entering or leaving this status
+    - phone_number: only reminders for this destination
+    - ids: only these reminders
+
+    Events: created, updated, status (data: the reminder), deleted
+    (data: {"id"}), bulk_created, bulk_rescheduled and bulk_deleted (data:
+    {"count"}) and resync, sent when the client fell behind and should
+    re-fetch the list
+    """
+    try:
+        id_filter = [int(value) for value in ids.split(",")] if ids else None
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="ids must be comma-separated integers"
+        )
+
+    subscription = event_broker.subscribe(status, phone_number, id_filter)
+
+    async def frames():
+        try:
+            # EventSource reconnect delay (ms)
+            yield b"retry: 3000\n\n"
+
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscription.queue.get(), EVENT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+
+                # Send everything already queued in one write
+                chunk = []
+                while frame is not CLOSE:
+                    chunk.append(frame)
+                    if subscription.queue.empty():
+                        break
+                    frame = subscription.queue.get_nowait()
+
+                if chunk:
+                    yield b"".join(chunk)
+                if frame is CLOSE:
+                    return
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{reminder_id}", response_model=ReminderResponse)
+async def get_reminder(reminder_id: int, request: Request, db: AsyncSession = Depends(_reminder_db)):
+    """
+    Get a single reminder by ID, live or archived
+    
+    Returns 404 if reminder not found, 304 if If-None-Match has its ETag
+    """
+    cache_key = ("id", reminder_id)
+    entry = reminder_cache.get(cache_key)
+
+    if entry is None:
+        token = reminder_cache.token()
+        reminder = await db.get(Reminder, reminder_id) or await db.get(ArchivedReminder, reminder_id)
+        
+        if not reminder:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Reminder with id {reminder_id} not found"
+            )
+
+        body = ReminderResponse.model_validate(reminder).model_dump_json().encode()
+        entry = reminder_cache.put(cache_key, body, token=token)
     
-    return reminder
+    return _cached_response(request, entry)
 
 
 @router.put("/{reminder_id}", response_model=ReminderResponse)
-def update_reminder(
+async def update_reminder(
     reminder_id: int,
     reminder_update: ReminderUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(_reminder_db),
+    idempotency_key: Optional[str] = Header(None),
 ):
     """
     Update a reminder
@@ -109,8 +1274,19 @@ def update_reminder(
     - Only provided fields are updated
     - updated_at is automatically set
     - If scheduled_time changes, job is rescheduled
+    - A new phone_number does not move the reminder to another shard
+    - Idempotency-Key: a retry gets the first response back
     """
-    db_reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
+    return await _idempotent(
+        idempotency_key, "PUT /api/reminders/{reminder_id}",
+        (reminder_id, reminder_update.model_dump_json(exclude_unset=True)),
+        lambda: _update_reminder(db, reminder_id, reminder_update), ReminderResponse,
+    )
+
+
+async def _update_reminder(db: AsyncSession, reminder_id: int, reminder_update: ReminderUpdate) -> Reminder:
+    """Apply an update and move the reminder's job if its time changed."""
+    db_reminder = await db.get(Reminder, reminder_id)
     
     if not db_reminder:
         raise HTTPException(
@@ -124,38 +1300,56 @@ def update_reminder(
     
     if "scheduled_time" in update_data:
         time_changed = True
+        # Naive input is wall-clock time in the reminder's (new) timezone
+        update_data["scheduled_time"] = to_utc(
+            update_data["scheduled_time"], update_data.get("timezone") or db_reminder.timezone
+        )
+
+    if update_data.get("recurrence") or ("scheduled_time" in update_data and db_reminder.recurrence):
+        # A new rule, or a series moved to a new time, starts over from
+        # its next occurrence
+        update_data["recurrence_start"] = update_data.get("scheduled_time", db_reminder.scheduled_time)
+    elif "recurrence" in update_data:
+        update_data["recurrence_start"] = None
     
+    before = snapshot(db_reminder)
+    previous_status = db_reminder.status
+
     # Update fields
     for field, value in update_data.items():
         setattr(db_reminder, field, value)
         
-    db.commit()
-    db.refresh(db_reminder)
+    await db.commit()
+    await db.refresh(db_reminder)
+    reminder_cache.invalidate(reminder_id, before, snapshot(db_reminder))
+    publish_reminder("updated", db_reminder, previous_status)
     
-    print(f"✏️ Updated reminder: {db_reminder.id} - {db_reminder.title}")
+    logger.info("Updated reminder %s - %s", db_reminder.id, db_reminder.title)
     
     # Reschedule if time changed and still scheduled
     if time_changed and db_reminder.status == "scheduled":
         # Use the datetime directly - no need to parse
-        success = update_scheduled_reminder(db_reminder.id, db_reminder.scheduled_time)
+        success = await run_in_threadpool(
+            update_scheduled_reminder, db_reminder.id, db_reminder.scheduled_time
+        )
         
         if success:
-            print(f"📅 Rescheduled reminder {db_reminder.id} to {db_reminder.scheduled_time}")
+            logger.info("Rescheduled reminder %s to %s", db_reminder.id, db_reminder.scheduled_time)
         else:
-            print(f"⚠️ Warning: Failed to reschedule reminder {db_reminder.id}")
+            logger.warning("Failed to reschedule reminder %s", db_reminder.id)
     
     return db_reminder
 
 
 @router.delete("/{reminder_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_reminder(reminder_id: int, db: Session = Depends(get_db)):
+async def delete_reminder(reminder_id: int, db: AsyncSession = Depends(_reminder_db)):
     """
     Delete a reminder
     
-    - Removes from database
+    - Removes from database (or from the archive)
     - Cancels scheduled job if exists
     """
-    db_reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
+    db_reminder = await db.get(Reminder, reminder_id) or await db.get(ArchivedReminder, reminder_id)
     
     if not db_reminder:
         raise HTTPException(
@@ -164,13 +1358,19 @@ def delete_reminder(reminder_id: int, db: Session = Depends(get_db)):
         )
     
     # Remove from scheduler first
-    delete_scheduled_reminder(reminder_id)
+    await run_in_threadpool(delete_scheduled_reminder, reminder_id)
     
     # Delete from database
-    db.delete(db_reminder)
-    db.commit()
+    before = snapshot(db_reminder)
+    await db.delete(db_reminder)
+    await db.commit()
+    reminder_cache.invalidate(reminder_id, before)
+    event_broker.publish(
+        "deleted", {"id": reminder_id},
+        reminder_id=reminder_id, statuses=(before[0],), phone_number=before[1]
+    )
     
-    print(f"🗑️ Deleted reminder: {reminder_id}")
+    logger.info("Deleted reminder %s", reminder_id)
     
     return None
 
@@ -194,24 +1394,207 @@ def list_scheduled_jobs():
     }
 
 
+@router.get("/debug/dispatcher", tags=["debug"])
+def dispatcher_stats():
+    """
+    Call dispatcher counters and queue lag (for debugging)
+
+    Queue lag is actual fire time minus scheduled_time, in seconds;
+    results counts outcomes written in batches (tick backend), per shard
+    """
+    from app.dispatcher import dispatcher
+    from app.scheduler import partitions
+
+    return {
+        **dispatcher.stats(),
+        "results": [{"shard": partition.shard.index, **partition.call_results.stats()} for partition in partitions],
+    }
+
+
+@router.get("/debug/workers", tags=["debug"])
+def list_workers():
+    """
+    Scheduler workers, their last heartbeat and how many reminders each
+    has claimed (for debugging), per shard
+    """
+    from app.leases import list_workers as workers_with_claims
+    from app.scheduler import partitions
+
+    shard_workers = []
+    for partition in partitions:
+        with partition.shard.SessionLocal() as db:
+            shard_workers.extend({"shard": partition.shard.index, **worker} for worker in workers_with_claims(db))
+
+    return {
+        "this_worker": [{"shard": partition.shard.index, **partition.lease_keeper.stats()} for partition in partitions],
+        "workers": shard_workers,
+    }
+
+
+@router.get("/debug/notifications", tags=["debug"])
+def notification_stats():
+    """
+    API <-> worker notification listeners (for debugging)
+
+    Only the listeners used by SCHEDULER_MODE run in a given process
+    """
+    from app.scheduler import SCHEDULER_MODE, api_listener, scheduler_listener
+
+    return {
+        "scheduler_mode": SCHEDULER_MODE,
+        "listeners": [api_listener.stats(), scheduler_listener.stats()],
+    }
+
+
+@router.get("/debug/call-status", tags=["debug"])
+def call_status_stats():
+    """
+    Status callback ingestion counters (for debugging)
+
+    flushes counts batched transactions; coalesced counts callbacks
+    folded into an update already buffered for the same call
+    """
+    from app.call_status import status_ingestor
+
+    return status_ingestor.stats()
+
+
+@router.get("/debug/idempotency", tags=["debug"])
+def idempotency_stats():
+    """
+    Idempotency key counters (for debugging)
+
+    replayed counts stored responses served (cache_hits of them from the
+    in-process LRU); collapsed counts duplicates that awaited a request
+    running in this process, waited those polling for another process
+    """
+    return idempotency_store.stats()
+
+
+@router.get("/debug/events", tags=["debug"])
+def event_stats():
+    """
+    Event stream counters (for debugging)
+
+    resyncs counts events that overflowed a subscriber's queue
+    """
+    return event_broker.stats()
+
+
+@router.get("/debug/archive", tags=["debug"])
+def archive_stats():
+    """
+    Archiver counters and table sizes (for debugging), per shard
+
+    live_rows and archived_rows count reminders and reminders_archive
+    """
+    from app.scheduler import partitions
+
+    stats = []
+    for partition in partitions:
+        with partition.shard.SessionLocal() as db:
+            stats.append({
+                "shard": partition.shard.index,
+                **partition.archiver.stats(),
+                "live_rows": db.scalar(select(func.count(Reminder.id))),
+                "archived_rows": db.scalar(select(func.count(ArchivedReminder.id))),
+            })
+
+    return {
+        "live_rows": sum(shard["live_rows"] for shard in stats),
+        "archived_rows": sum(shard["archived_rows"] for shard in stats),
+        "shards": stats,
+    }
+
+
+@router.get("/debug/shards", tags=["debug"])
+def shard_stats():
+    """
+    Reminder databases and how reminders spread over them (for debugging)
+
+    first_id is the id sequence start of the shard; pending counts the
+    reminders its scheduler partition is waiting to fire
+    """
+    from app.scheduler import partitions
+
+    stats = []
+    for partition in partitions:
+        with partition.shard.SessionLocal() as db:
+            stats.append({
+                "shard": partition.shard.index,
+                "first_id": partition.shard.first_id,
+                "reminders": db.scalar(select(func.count(Reminder.id))),
+                "archived": db.scalar(select(func.count(ArchivedReminder.id))),
+                "pending": partition.pending_count(),
+            })
+
+    return {"shards": stats}
+
+
+@router.get("/debug/cache", tags=["debug"])
+def cache_stats():
+    """
+    Response cache counters (for debugging)
+
+    Hits and misses count GET /api/reminders/ and GET /api/reminders/{id}
+    """
+    return reminder_cache.stats()
+
+
 @router.post("/debug/trigger/{reminder_id}", tags=["debug"])
 def manually_trigger_reminder(reminder_id: int):
     """
     Manually trigger a reminder immediately (for testing)
     
-    Does NOT wait for scheduled time
+    Does NOT wait for scheduled time: the reminder's next_attempt_at is
+    set to now (scheduled_time is kept) and the claim honours it. With
+    SCHEDULER_MODE=worker the worker then fires it on its next tick (tick
+    backend) or notification poll (the others).
     """
-    from app.scheduler import trigger_reminder
+    from app.scheduler import SCHEDULER_MODE, trigger_reminder
     
     try:
-        trigger_reminder(reminder_id)
+        now = _make_due(reminder_id)
+        if SCHEDULER_MODE == "worker":
+            schedule_reminder(reminder_id, now)
+        else:
+            trigger_reminder(reminder_id)
         return {
             "status": "triggered",
             "reminder_id": reminder_id,
             "message": "Check logs for call status"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+def _make_due(reminder_id: int) -> datetime:
+    """
+    Move a pending reminder's next attempt to now (409 unless it is
+    scheduled or retrying) and return that time. scheduled_time, and so a
+    series' anchor, is left alone.
+    """
+    shard = shard_of(reminder_id)
+    with (shard or shards[0]).SessionLocal() as db:
+        reminder = db.get(Reminder, reminder_id) if shard else None
+        if reminder is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Reminder with id {reminder_id} not found"
+            )
+        if reminder.status not in ("scheduled", "retrying"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Reminder {reminder_id} is {reminder.status}, not pending"
+            )
+
+        now = utcnow()
+        reminder.next_attempt_at = now
+        db.commit()
+        reminder_cache.invalidate(reminder_id, snapshot(reminder))
+
+    return now
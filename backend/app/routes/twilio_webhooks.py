@@ -0,0 +1,66 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from urllib.parse import parse_qsl
+from app.call_status import status_ingestor
+from app.twilio import TWILIO_AUTH_TOKEN, TWILIO_STATUS_CALLBACK_URL
+import os
+
+router = APIRouter()
+
+# Check X-Twilio-Signature on callbacks (needs TWILIO_AUTH_TOKEN and the
+# exact public TWILIO_STATUS_CALLBACK_URL). Turn off for local stand-ins.
+TWILIO_VALIDATE_SIGNATURE = os.getenv("TWILIO_VALIDATE_SIGNATURE", "true").lower() == "true"
+
+_validator = None
+
+
+def _signature_valid(request: Request, params: dict) -> bool:
+    """Validate X-Twilio-Signature against the configured callback URL."""
+    global _validator
+
+    if not (TWILIO_VALIDATE_SIGNATURE and TWILIO_AUTH_TOKEN):
+        return True
+
+    if _validator is None:
+        from twilio.request_validator import RequestValidator
+        _validator = RequestValidator(TWILIO_AUTH_TOKEN)
+
+    url = TWILIO_STATUS_CALLBACK_URL or str(request.url)
+    return _validator.validate(url, params, request.headers.get("x-twilio-signature", ""))
+
+
+@router.post("/status", status_code=status.HTTP_204_NO_CONTENT)
+async def call_status_callback(request: Request):
+    """
+    Twilio call status callback
+
+    - Form-encoded body with CallSid and CallStatus (plus ErrorCode,
+      ErrorMessage on failures)
+    - Buffered and applied in batches; responds immediately
+    - Unknown statuses are acknowledged and ignored
+    """
+    params = dict(parse_qsl((await request.body()).decode()))
+
+    if not _signature_valid(request, params):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid Twilio signature"
+        )
+
+    call_sid = params.get("CallSid")
+    call_status = params.get("CallStatus")
+
+    if not call_sid or not call_status:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CallSid and CallStatus are required"
+        )
+
+    error_message = None
+    if params.get("ErrorCode"):
+        error_message = f"Twilio error {params['ErrorCode']}: {params.get('ErrorMessage', '')}".strip()
+    elif call_status in ("busy", "no-answer", "failed", "canceled"):
+        error_message = f"Call {call_status}"
+
+    status_ingestor.add(call_sid, call_status, error_message)
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
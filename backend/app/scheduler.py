@@ -1,169 +1,713 @@
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
-from apscheduler.triggers.date import DateTrigger
-from datetime import datetime
-from app.database import SessionLocal
-from app.models import Reminder
-from app.twilio import make_call
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from sqlalchemy import func, select, update
+import logging
+import os
+import time
+from app.database import DATABASE_URL, by_shard, create_db_engine, is_sqlite, shard_of, shards
+from app.models import DeadLetter, Reminder
+from app.cache import reminder_cache, snapshot
+from app.events import event_broker, publish_reminder
+from app.dispatcher import ResultBatcher, dispatcher
+from app.metrics import SCHEDULER_PENDING
+from app.twilio import TWILIO_STATUS_CALLBACK_URL, CallError
+from app.retry import REPLAY_RATE, RETRY_MAX_ATTEMPTS, next_attempt_time, replay_times, should_retry
+from app.scheduler_backends import create_backend, job_id_for
+from app.timezones import utcnow
+from app import archive, leases, notifications, recurrence
 
 
-# Configure job store
-jobstores = {
-    'default': SQLAlchemyJobStore(url='sqlite:///./scheduler_jobs.db')
-}
+logger = logging.getLogger(__name__)
 
-# Initialize scheduler
-scheduler = BackgroundScheduler(jobstores=jobstores)
+
+# Which scheduler backend to use: "apscheduler" (persistent job store),
+# "heap" (in-memory index rebuilt from the reminders table) or "tick"
+# (everything due pulled from the reminders table once per tick)
+SCHEDULER_BACKEND = os.getenv("SCHEDULER_BACKEND", "apscheduler")
+
+# APScheduler job store. On SQLite it defaults to its own file so job
+# writes don't contend with reminder writes; on Postgres (or any server
+# database) it lives in the main database by default. Every shard has its
+# own: scheduler_jobs_1.db, ... next to a SQLite file, the shard's own
+# database when this is DATABASE_URL, else a table per shard.
+SCHEDULER_JOBSTORE_URL = os.getenv(
+    "SCHEDULER_JOBSTORE_URL",
+    "sqlite:///./scheduler_jobs.db" if is_sqlite(DATABASE_URL) else DATABASE_URL
+)
+
+# Tick backend: how often due reminders are pulled, and claimed per query
+SCHEDULER_TICK_SECONDS = float(os.getenv("SCHEDULER_TICK_SECONDS", "1"))
+TICK_BATCH_SIZE = int(os.getenv("TICK_BATCH_SIZE", "1000"))
+
+# Rows fetched and registered per batch when reloading on startup
+RELOAD_BATCH_SIZE = int(os.getenv("RELOAD_BATCH_SIZE", "5000"))
+
+# What to do with reminders that came due while the scheduler was down:
+# "fire" them all now, or "mark_missed" those older than the grace period
+MISSED_REMINDER_POLICY = os.getenv("MISSED_REMINDER_POLICY", "mark_missed")
+MISSED_GRACE_SECONDS = int(os.getenv("MISSED_GRACE_SECONDS", "300"))
+
+# Where reminders fire: "api" runs the scheduler inside the API process;
+# "worker" leaves it to python -m app.worker and the API only writes rows
+# and signals the worker through the notifications table
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "api")
+
+# Set by start_scheduler(): this process runs the scheduler
+_owns_scheduler = False
+
+# Above this many changed reminders per notification batch the API drops
+# its whole cache rather than invalidating reminder by reminder
+CHANGED_BATCH_CLEAR = 100
+
+
+def _signals_worker() -> bool:
+    """Whether jobs must be handed to a worker process instead of the local backend."""
+    return SCHEDULER_MODE == "worker" and not _owns_scheduler
+
+
+def _signals_api() -> bool:
+    """Whether reminder changes must be reported to the API processes."""
+    return SCHEDULER_MODE == "worker" and _owns_scheduler
+
+
+class Partition:
+    """
+    The scheduler's share of one shard (app/database.py): a backend with
+    its own job store, call result writer, lease heartbeat and archiver,
+    all working on that shard's database. A reminder is handled by the
+    partition of its id's shard; the call dispatcher is shared.
+    """
+
+    def __init__(self, shard):
+        self.shard = shard
+        engine, table = _jobstore(shard)
+        self.backend = create_backend(
+            SCHEDULER_BACKEND,
+            trigger_reminder,
+            jobstore_engine=engine,
+            jobstore_table=table,
+            on_tick=partial(dispatch_due, partition=self),
+            tick_seconds=SCHEDULER_TICK_SECONDS,
+        )
+        self.call_results = ResultBatcher(record_call_results)
+        self.lease_keeper = leases.LeaseKeeper(dispatch_recovered, session_factory=shard.SessionLocal)
+        self.archiver = archive.Archiver(session_factory=shard.SessionLocal)
+
+    def start(self):
+        self.call_results.start()
+        self.backend.start()
+        self.lease_keeper.start()
+        self.archiver.start()
+
+    def stop(self):
+        """Stop what is left once the backend is shut down and the dispatcher drained."""
+        self.call_results.stop()
+        self.lease_keeper.stop()
+        self.archiver.stop()
+
+    def pending_count(self) -> int:
+        """Reminders waiting to fire on this shard (see pending_count())."""
+        if self.backend.tracks_reminders:
+            return self.backend.pending_count()
+
+        with self.shard.SessionLocal() as db:
+            return db.scalar(
+                select(func.count()).select_from(Reminder).where(Reminder.status.in_(leases.CLAIMABLE_STATUSES))
+            )
+
+
+def _partition_for(reminder_id: int):
+    """The partition handling a reminder (None for an id of no shard)."""
+    shard = shard_of(reminder_id)
+    return partitions[shard.index] if shard is not None else None
+
+
+def _backend_add(items):
+    """Register (reminder_id, run_at) jobs with the backends of their partitions."""
+    for shard, jobs in by_shard(items, key=lambda item: item[0]).items():
+        partitions[shard.index].backend.add_many(jobs)
+
+
+def _backend_remove(reminder_ids) -> int:
+    """Drop the jobs of reminders from their partitions' backends; returns how many existed."""
+    return sum(
+        partitions[shard.index].backend.remove_many(ids)
+        for shard, ids in by_shard(reminder_ids).items()
+    )
 
 
 def start_scheduler():
     """Start the background scheduler"""
-    if not scheduler.running:
-        scheduler.start()
-        print("✅ Scheduler started")
+    global _owns_scheduler
+
+    if not backend.running:
+        _owns_scheduler = True
+        dispatcher.start()
+        for partition in partitions:
+            partition.start()
+        if SCHEDULER_MODE == "worker":
+            # Before the reload, so nothing written in between is missed
+            scheduler_listener.start()
+        logger.info("Scheduler started (%s backend, %d shard(s), worker %s)",
+                    backend.name, len(partitions), leases.WORKER_ID)
         
         # Reload pending jobs on startup
         reload_scheduled_jobs()
     else:
-        print("⚠️ Scheduler already running")
+        logger.warning("Scheduler already running")
+
+
+def stop_scheduler():
+    """Stop the background scheduler and drain the call dispatcher"""
+    scheduler_listener.stop()
+    for partition in partitions:
+        partition.backend.shutdown()
+    dispatcher.stop()
+    for partition in partitions:
+        partition.stop()
 
 
 def reload_scheduled_jobs():
     """
     Reload all scheduled reminders from database on startup.
     This ensures jobs aren't lost when server restarts.
+
+    Each partition reloads from its own shard, in parallel. Rows are
+    streamed in scheduled_time order with yield_per (a server-side cursor
+    on Postgres) over the (status, scheduled_time) index, and only
+    reminders the backend doesn't already know are registered, one batch
+    at a time. Reminders whose time passed while the scheduler was down are
+    handled by MISSED_REMINDER_POLICY; pending retries (and manual
+    triggers) are re-registered at their next_attempt_at (or now, if that
+    has passed).
     """
-    db = SessionLocal()
+    if len(partitions) == 1:
+        _reload_partition(partitions[0])
+        return
+
+    with ThreadPoolExecutor(len(partitions), thread_name_prefix="reload") as pool:
+        list(pool.map(_reload_partition, partitions))
+
+
+def _reload_partition(partition: Partition):
+    """reload_scheduled_jobs() for one partition."""
+    backend = partition.backend
+    db = partition.shard.SessionLocal()
+    started = time.perf_counter()
+    now = utcnow()
+
     try:
-        # Get all scheduled reminders
-        pending_reminders = db.query(Reminder).filter(
-            Reminder.status == "scheduled"
-        ).all()
-        
-        print(f"📋 Found {len(pending_reminders)} scheduled reminders to reload")
-        
-        for reminder in pending_reminders:
-            scheduled_time = datetime.fromisoformat(reminder.scheduled_time.replace('Z', '+00:00'))
-            
-            # Only schedule if in the future
-            if scheduled_time > datetime.now():
-                job_id = f"reminder-{reminder.id}"
-                
-                # Check if job already exists
-                existing_job = scheduler.get_job(job_id)
-                if not existing_job:
-                    scheduler.add_job(
-                        trigger_reminder,
-                        trigger=DateTrigger(run_date=scheduled_time),
-                        args=[reminder.id],
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    print(f"  ✅ Reloaded: {reminder.title} (ID: {reminder.id})")
-                else:
-                    print(f"  ⏭️ Already scheduled: {reminder.title} (ID: {reminder.id})")
-            else:
-                print(f"  ⚠️ Skipped past reminder: {reminder.title} (ID: {reminder.id})")
-                
-    except Exception as e:
-        print(f"❌ Error reloading jobs: {e}")
+        past_due = _handle_missed_reminders(db, now, backend)
+
+        if not backend.tracks_reminders:
+            # The tick backend reads due reminders from the table itself
+            logger.info("%d past-due reminders fire on the next tick", past_due)
+            return
+
+        # Retries and manual triggers first: a reminder with a job already
+        # is not registered again at its scheduled_time below
+        retries = db.execute(
+            select(Reminder.id, Reminder.next_attempt_at)
+            .where(Reminder.status.in_(leases.CLAIMABLE_STATUSES), Reminder.next_attempt_at.is_not(None))
+            .execution_options(yield_per=RELOAD_BATCH_SIZE)
+        )
+        retrying = 0
+        for batch in retries.partitions():
+            times = {rid: max(run_at, now) for rid, run_at in batch}
+            backend.add_many((rid, times[rid]) for rid in backend.missing(times))
+            retrying += len(times)
+
+        # Stream future reminders; only two columns are needed
+        rows = db.execute(
+            select(Reminder.id, Reminder.scheduled_time)
+            .where(Reminder.status == "scheduled", Reminder.scheduled_time > now)
+            .order_by(Reminder.scheduled_time)
+            .execution_options(yield_per=RELOAD_BATCH_SIZE)
+        )
+
+        total = 0
+        registered = 0
+        for batch in rows.partitions():
+            times = dict(batch)
+            missing = backend.missing(times)
+            backend.add_many((rid, times[rid]) for rid in missing)
+            total += len(times)
+            registered += len(missing)
+
+        logger.info("Reloaded %d of %d scheduled reminders (%d past due, %d retrying) in %.2fs on shard %d",
+                    registered, total, past_due, retrying, time.perf_counter() - started,
+                    partition.shard.index)
+
+    except Exception:
+        logger.exception("Error reloading jobs on shard %d", partition.shard.index)
     finally:
         db.close()
 
 
+def _handle_missed_reminders(db, now: datetime, backend) -> int:
+    """
+    Apply MISSED_REMINDER_POLICY to reminders that are past due.
+
+    - "fire": queue all of them to fire immediately
+    - "mark_missed": fire those within MISSED_GRACE_SECONDS, mark older ones
+      as "missed" with one UPDATE; recurring reminders skip to their next
+      occurrence instead
+
+    Returns:
+        Number of past-due reminders found
+    """
+    cutoff = now - timedelta(seconds=MISSED_GRACE_SECONDS)
+    marked = 0
+
+    if MISSED_REMINDER_POLICY == "mark_missed":
+        marked = db.execute(
+            update(Reminder)
+            .where(Reminder.status == "scheduled", Reminder.scheduled_time <= cutoff,
+                   Reminder.recurrence.is_(None))
+            .values(status="missed", error_message="Scheduler was not running at the scheduled time")
+        ).rowcount
+        marked += _skip_missed_occurrences(db, cutoff, now)
+        db.commit()
+        if marked:
+            _all_changed("missed")
+
+    # Everything still past due fires now, one batch at a time
+    rows = db.execute(
+        select(Reminder.id)
+        .where(Reminder.status == "scheduled", Reminder.scheduled_time <= now)
+        .order_by(Reminder.scheduled_time)
+        .execution_options(yield_per=RELOAD_BATCH_SIZE)
+    )
+
+    fired = 0
+    for batch in rows.partitions():
+        backend.add_many((row.id, now) for row in batch)
+        fired += len(batch)
+
+    if marked or fired:
+        logger.warning("Past-due reminders: %d firing now, %d marked missed or skipped to their next occurrence", fired, marked)
+
+    return marked + fired
+
+
+def _skip_missed_occurrences(db, cutoff: datetime, now: datetime) -> int:
+    """Move recurring reminders due before cutoff on to their next occurrence after now."""
+    series = db.scalars(
+        select(Reminder)
+        .where(Reminder.status == "scheduled", Reminder.scheduled_time <= cutoff,
+               Reminder.recurrence.is_not(None))
+    ).all()
+
+    for reminder in series:
+        upcoming = recurrence.next_occurrence(reminder, now)
+        if upcoming is None:
+            reminder.status = "missed"
+            reminder.error_message = "Scheduler was not running at the scheduled time"
+        else:
+            reminder.scheduled_time = upcoming
+
+    return len(series)
+
+
 def schedule_reminder(reminder_id: int, scheduled_time: datetime):
     """
     Schedule a reminder to trigger at a specific time.
     
     Args:
         reminder_id: Database ID of the reminder
-        scheduled_time: When to trigger the reminder (datetime object)
+        scheduled_time: When to trigger the reminder (naive UTC)
     """
-    job_id = f"reminder-{reminder_id}"
-    
     try:
-        scheduler.add_job(
-            trigger_reminder,
-            trigger=DateTrigger(run_date=scheduled_time),
-            args=[reminder_id],
-            id=job_id,
-            replace_existing=True
-        )
-        print(f"📅 Scheduled reminder {reminder_id} for {scheduled_time}")
+        _add_jobs([(reminder_id, scheduled_time)])
+        logger.debug("Scheduled reminder %s for %s", reminder_id, scheduled_time)
         return True
-    except Exception as e:
-        print(f"❌ Error scheduling reminder {reminder_id}: {e}")
+    except Exception:
+        logger.exception("Error scheduling reminder %s", reminder_id)
+        return False
+
+
+def schedule_reminders(reminders):
+    """
+    Schedule many reminders in one backend operation.
+
+    Args:
+        reminders: Iterable of (reminder_id, scheduled_time) pairs
+
+    Returns:
+        True if all jobs were scheduled, False otherwise
+    """
+    reminders = list(reminders)
+    if not reminders:
+        return True
+
+    try:
+        _add_jobs(reminders)
+        logger.info("Scheduled %d reminders in one batch", len(reminders))
+        return True
+    except Exception:
+        logger.exception("Error batch scheduling %d reminders", len(reminders))
         return False
 
 
 def trigger_reminder(reminder_id: int):
     """
-    Trigger a reminder: make the call and update status.
+    Trigger a reminder: hand the call to the dispatcher.
     This function is called by the scheduler at the scheduled time.
+
+    The reminder is claimed first (see app/leases.py), so when several
+    processes run a scheduler only one of them places the call. The call
+    itself runs on the dispatcher's event loop, so the scheduler thread is
+    released immediately; record_call_result() stores the outcome.
     
     Args:
         reminder_id: Database ID of the reminder to trigger
     """
-    db = SessionLocal()
+    partition = _partition_for(reminder_id)
+    if partition is None:
+        logger.warning("Reminder %s belongs to no configured shard", reminder_id)
+        return
+
+    db = partition.shard.SessionLocal()
     
     try:
-        # Fetch the reminder from DB
-        reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
-
-        if not reminder:
-            print(f"❌ Reminder with ID {reminder_id} not found in DB")
+        if not leases.claim(db, reminder_id):
+            _reregister_early(partition, db, reminder_id)
             return
 
-        if reminder.status == "completed":
-            print(f"⏭️ Reminder {reminder_id} already completed")
-            return
-        
-        if reminder.status == "failed":
-            print(f"⏭️ Reminder {reminder_id} already marked as failed")
-            return
+        dispatch_claimed(db, reminder_id)
 
-        print(f"📞 Triggering reminder {reminder.id} -> {reminder.phone_number}")
-        print(f"   Title: {reminder.title}")
-        print(f"   Message: {reminder.message[:50]}...")
-        
-        # Make the call
-        call_sid = make_call(
-            phone_number=reminder.phone_number,
-            message=reminder.message
-        )
+    except Exception as e:
+        logger.exception("Error triggering reminder %s", reminder_id)
+        record_call_result(reminder_id, None, CallError(str(e), transient=True))
+    finally:
+        db.close()
 
-        if call_sid:
-            # Success - mark as completed
-            reminder.status = "completed"
-            reminder.call_sid = call_sid
-            print(f"✅ Call successful! SID: {call_sid}")
-        else:
-            # Failed - mark as failed
-            reminder.status = "failed"
-            reminder.error_message = "Call failed - no SID returned"
-            print(f"❌ Call failed for reminder {reminder_id}")
 
-        db.commit()
-        print(f"💾 Reminder {reminder_id} status updated to: {reminder.status}")
+def _reregister_early(partition: Partition, db, reminder_id: int):
+    """
+    After a failed claim: if the reminder is pending but not due yet, the
+    job was stale (another process moved the reminder, or the job ran
+    early), so register it again at the stored time.
+    """
+    row = db.execute(
+        select(Reminder.status, Reminder.scheduled_time, Reminder.next_attempt_at)
+        .where(Reminder.id == reminder_id)
+    ).first()
+    db.rollback()
+
+    if row is None or row.status not in leases.CLAIMABLE_STATUSES:
+        logger.debug("Reminder %s is gone or not pending", reminder_id)
+        return
+
+    run_at = leases.due_at(*row)
+    if run_at <= utcnow():
+        logger.debug("Reminder %s is claimed by another worker", reminder_id)
+        return
+
+    partition.backend.add(reminder_id, run_at)
+    logger.info("Reminder %s is not due until %s; job registered again", reminder_id, run_at)
+
+
+def dispatch_claimed(db, reminder_id: int):
+    """Hand a reminder this worker has claimed to the dispatcher."""
+    reminder = db.get(Reminder, reminder_id)
+    if not reminder:
+        return
+    if reminder.recurrence and reminder.status == "scheduled":
+        reminder, = fire_series(db, [reminder])
+
+    logger.debug("Triggering reminder %s -> %s (attempt %d)",
+                 reminder.id, reminder.phone_number, reminder.attempts + 1)
+
+    dispatcher.submit(
+        reminder.id,
+        reminder.phone_number,
+        reminder.message,
+        reminder.next_attempt_at or reminder.scheduled_time,
+        on_done=record_call_result,
+    )
+
+
+def dispatch_recovered(reminder_ids):
+    """Dispatch reminders taken over from a dead worker's expired leases."""
+    for shard, ids in by_shard(reminder_ids).items():
+        db = shard.SessionLocal()
 
-    except Exception as e:
-        print(f"❌ Error triggering reminder {reminder_id}: {e}")
-        
-        # Mark as failed in DB
         try:
-            reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
-            if reminder:
+            for reminder_id in ids:
+                try:
+                    dispatch_claimed(db, reminder_id)
+                except Exception as e:
+                    logger.exception("Error dispatching recovered reminder %s", reminder_id)
+                    record_call_result(reminder_id, None, CallError(str(e), transient=True))
+        finally:
+            db.close()
+
+
+def dispatch_due(now: datetime = None, partition: Partition = None):
+    """
+    Claim and dispatch every reminder due by ``now`` on one partition's
+    shard (tick backend; shard 0 by default).
+
+    Due reminders are claimed TICK_BATCH_SIZE at a time, one UPDATE ...
+    RETURNING per batch (see leases.claim_due), and handed to the
+    dispatcher together; the partition's call_results writes the outcomes
+    back in batches.
+    """
+    now = now or utcnow()
+    partition = partition or partitions[0]
+    db = partition.shard.SessionLocal()
+    dispatched = 0
+
+    try:
+        while True:
+            rows = leases.claim_due(db, now, TICK_BATCH_SIZE)
+            series = {row.id for row in rows if row.recurrence and row.status == "scheduled"}
+            if series:
+                # Recurring reminders dispatch their due occurrence instead
+                occurrences = fire_series(db, db.scalars(select(Reminder).where(Reminder.id.in_(series))).all())
+                rows = [row for row in rows if row.id not in series] + occurrences
+            for row in rows:
+                dispatcher.submit(
+                    row.id,
+                    row.phone_number,
+                    row.message,
+                    row.next_attempt_at or row.scheduled_time,
+                    on_done=partition.call_results.add,
+                )
+            dispatched += len(rows)
+            if len(rows) < TICK_BATCH_SIZE:
+                break
+    finally:
+        db.close()
+
+    if dispatched:
+        logger.debug("Dispatched %d due reminders", dispatched)
+
+
+def fire_series(db, series: list) -> list:
+    """
+    Materialize the due occurrence of claimed recurring reminders and
+    move each series on to its next occurrence (commits).
+
+    Args:
+        db: Session the series were loaded in
+        series: Claimed Reminder rows with a recurrence
+
+    Returns:
+        The occurrences, claimed by this worker, ready to dispatch
+    """
+    before = {reminder.id: snapshot(reminder) for reminder in series}
+    occurrences = recurrence.fire_series(db, series, utcnow())
+
+    if _signals_api():
+        for reminder in [*series, *occurrences]:
+            notifications.add(db, notifications.API, action="changed", reminder_id=reminder.id,
+                              previous_status=before.get(reminder.id, (None,))[0])
+
+    # Everything is used again right away: don't reload each row
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = True
+
+    _backend_add((reminder.id, reminder.scheduled_time) for reminder in series
+                 if reminder.status == "scheduled")
+
+    if not _signals_api():
+        for reminder in series:
+            reminder_cache.invalidate(reminder.id, before[reminder.id], snapshot(reminder))
+            publish_reminder("updated", reminder)
+        for occurrence in occurrences:
+            reminder_cache.invalidate(occurrence.id, snapshot(occurrence))
+            publish_reminder("created", occurrence)
+
+    logger.debug("Fired %d recurring reminders", len(series))
+    return occurrences
+
+
+def record_call_result(reminder_id: int, call_sid: str, error=None):
+    """
+    Store the outcome of a dispatched call.
+
+    A transient failure schedules another attempt with backoff (up to
+    RETRY_MAX_ATTEMPTS); a permanent one, or the last attempt, marks the
+    reminder failed and writes a dead letter.
+    
+    Args:
+        reminder_id: Database ID of the reminder
+        call_sid: Twilio call SID, or None if the call could not be placed
+        error: CallError (or message) explaining the failure
+    """
+    record_call_results([(reminder_id, call_sid, error)])
+
+
+def record_call_results(results):
+    """
+    Store the outcomes of dispatched calls in one transaction per shard.
+
+    One SELECT loads the reminders and the ORM writes them back with
+    executemany UPDATEs (see record_call_result for what each outcome does).
+
+    Args:
+        results: (reminder_id, call_sid, error) tuples
+    """
+    for shard, shard_results in by_shard(results, key=lambda result: result[0]).items():
+        _record_shard_results(shard, shard_results)
+
+
+def _record_shard_results(shard, results: list):
+    """record_call_results() for the reminders of one shard."""
+    db = shard.SessionLocal()
+
+    try:
+        ids = [reminder_id for reminder_id, _, _ in results]
+        reminders = {}
+        for start in range(0, len(ids), 500):
+            reminders.update(
+                (reminder.id, reminder)
+                for reminder in db.scalars(select(Reminder).where(Reminder.id.in_(ids[start:start + 500])))
+            )
+
+        changes = []
+        retries = []
+        for reminder_id, call_sid, error in results:
+            reminder = reminders.get(reminder_id)
+            if not reminder:
+                continue
+
+            before = snapshot(reminder)
+            reminder.attempts += 1
+            reminder.next_attempt_at = None
+            reminder.claimed_by = None
+            reminder.lease_expires_at = None
+
+            if call_sid:
+                # Twilio accepted the call. With status callbacks configured,
+                # the webhook moves it on to ringing, answered, completed, ...
+                reminder.status = "calling" if TWILIO_STATUS_CALLBACK_URL else "completed"
+                reminder.call_sid = call_sid
+                reminder.error_message = None
+                logger.debug("Call placed for reminder %s", reminder_id, extra={"call_sid": call_sid})
+            elif should_retry(error, reminder.attempts):
+                retry_at = next_attempt_time(reminder.attempts)
+                retries.append((reminder_id, retry_at))
+                reminder.status = "retrying"
+                reminder.next_attempt_at = retry_at
+                reminder.error_message = str(error)
+                logger.info("Call failed for reminder %s (attempt %d/%d), retrying at %s",
+                            reminder_id, reminder.attempts, RETRY_MAX_ATTEMPTS, retry_at)
+            else:
+                # Permanent failure or out of attempts
                 reminder.status = "failed"
-                reminder.error_message = str(e)
-                db.commit()
-        except:
-            pass
-        
+                reminder.error_message = str(error) if error else "Call failed - no SID returned"
+                db.add(DeadLetter(
+                    reminder_id=reminder.id,
+                    attempts=reminder.attempts,
+                    error_message=reminder.error_message,
+                    error_code=getattr(error, "code", None),
+                ))
+                logger.warning("Call failed for reminder %s after %d attempt(s), dead-lettered",
+                               reminder_id, reminder.attempts)
+
+            changes.append((reminder_id, reminder, before, snapshot(reminder)))
+            if _signals_api():
+                notifications.add(db, notifications.API, action="changed",
+                                  reminder_id=reminder_id, previous_status=before[0])
+
+        db.commit()
+
+        if retries:
+            partitions[shard.index].backend.add_many(retries)
+
+        if not _signals_api():
+            if len(changes) > CHANGED_BATCH_CLEAR:
+                reminder_cache.clear()
+            for reminder_id, reminder, before, after in changes:
+                if len(changes) <= CHANGED_BATCH_CLEAR:
+                    reminder_cache.invalidate(reminder_id, before, after)
+                publish_reminder("status", reminder, before[0])
+
+        if len(changes) == 1:
+            reminder_id, _, _, after = changes[0]
+            logger.debug("Reminder %s status updated to: %s", reminder_id, after[0])
+        elif changes:
+            logger.debug("Recorded %d call results in one transaction", len(changes))
+
+    except Exception:
+        logger.exception("Error recording results for reminders %s", ids[:10])
         db.rollback()
     finally:
         db.close()
 
 
+def replay_dead_letters(dead_letter_ids=None, rate: float = REPLAY_RATE) -> int:
+    """
+    Re-dispatch dead-lettered reminders, spaced out to ``rate`` per second.
+
+    Each reminder gets a fresh set of attempts; its dead letter is marked
+    replayed. Dead letters already replayed are skipped. The spacing runs
+    across shards, so ``rate`` holds for the whole replay.
+
+    Args:
+        dead_letter_ids: Dead letters to replay (None = all pending)
+        rate: Reminders per second
+
+    Returns:
+        Number of reminders queued
+    """
+    now = utcnow()
+    query = (
+        select(DeadLetter.id, DeadLetter.reminder_id)
+        .where(DeadLetter.replayed_at.is_(None))
+        .order_by(DeadLetter.id)
+    )
+    if dead_letter_ids is None:
+        selected = {shard: query for shard in shards}
+    else:
+        selected = {shard: query.where(DeadLetter.id.in_(ids)) for shard, ids in by_shard(dead_letter_ids).items()}
+
+    pending = []
+    for shard, shard_query in selected.items():
+        with shard.SessionLocal() as db:
+            letters = db.execute(shard_query).all()
+        if letters:
+            # A reminder may have several pending dead letters; replay it once
+            reminder_ids = list(dict.fromkeys(letter.reminder_id for letter in letters))
+            pending.append((shard, [letter.id for letter in letters], reminder_ids))
+
+    total = sum(len(reminder_ids) for _, _, reminder_ids in pending)
+    if not total:
+        return 0
+
+    run_times = iter(replay_times(total, rate, now))
+    for shard, letter_ids, reminder_ids in pending:
+        times = {rid: next(run_times) for rid in reminder_ids}
+
+        with shard.SessionLocal() as db:
+            db.execute(update(Reminder), [
+                {"id": rid, "status": "retrying", "attempts": 0, "next_attempt_at": run_at}
+                for rid, run_at in times.items()
+            ])
+            for start in range(0, len(letter_ids), 500):
+                db.execute(
+                    update(DeadLetter)
+                    .where(DeadLetter.id.in_(letter_ids[start:start + 500]))
+                    .values(replayed_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+            db.commit()
+
+        _add_jobs(times.items())
+
+    _all_changed("replay")
+
+    logger.info("Replaying %d dead-lettered reminders at %s/s", total, rate)
+    return total
+
+
 def delete_scheduled_reminder(reminder_id: int):
     """
     Remove a scheduled job from the scheduler.
@@ -175,38 +719,163 @@ def delete_scheduled_reminder(reminder_id: int):
     Returns:
         True if job was removed, False if job didn't exist
     """
-    job_id = f"reminder-{reminder_id}"
+    job_id = job_id_for(reminder_id)
     
     try:
-        job = scheduler.get_job(job_id)
-        
-        if job:
-            scheduler.remove_job(job_id)
-            print(f"🗑️ Removed scheduled job: {job_id}")
+        if _signals_worker():
+            if backend.tracks_reminders:
+                notifications.send(notifications.SCHEDULER, [{"action": "cancel", "reminder_id": reminder_id}])
+            return True
+
+        partition = _partition_for(reminder_id)
+        if partition is not None and partition.backend.remove(reminder_id):
+            logger.debug("Removed scheduled job: %s", job_id)
             return True
         else:
-            print(f"⚠️ Job {job_id} not found in scheduler (may have already triggered)")
+            logger.debug("Job %s not found in scheduler (may have already triggered)", job_id)
             return False
             
-    except Exception as e:
-        print(f"❌ Error removing job {job_id}: {e}")
+    except Exception:
+        logger.exception("Error removing job %s", job_id)
+        return False
+
+
+def delete_scheduled_reminders(reminder_ids) -> bool:
+    """
+    Remove the jobs of many deleted reminders in one backend operation.
+
+    Args:
+        reminder_ids: Database IDs of the reminders
+
+    Returns:
+        True if the backend (or the worker's queue) was updated
+    """
+    reminder_ids = list(reminder_ids)
+    if not reminder_ids or not backend.tracks_reminders:
+        return True
+
+    try:
+        if _signals_worker():
+            notifications.send(notifications.SCHEDULER, [
+                {"action": "cancel", "reminder_id": reminder_id} for reminder_id in reminder_ids
+            ])
+        else:
+            removed = _backend_remove(reminder_ids)
+            logger.debug("Removed %d of %d scheduled jobs", removed, len(reminder_ids))
+        return True
+    except Exception:
+        logger.exception("Error removing %d jobs", len(reminder_ids))
         return False
 
 
 def update_scheduled_reminder(reminder_id: int, new_scheduled_time: datetime):
     """
     Update the scheduled time for a reminder.
-    Removes the old job and creates a new one.
+    Moves the existing job, or creates one if it already fired.
     
     Args:
         reminder_id: Database ID of the reminder
         new_scheduled_time: New time to trigger the reminder
     """
-    # Remove old job
-    delete_scheduled_reminder(reminder_id)
-    
-    # Schedule new job
-    return schedule_reminder(reminder_id, new_scheduled_time)
+    try:
+        if _signals_worker():
+            _add_jobs([(reminder_id, new_scheduled_time)])
+            return True
+
+        partition = _partition_for(reminder_id)
+        if partition is None:
+            return False
+        partition.backend.reschedule(reminder_id, new_scheduled_time)
+        return True
+    except Exception:
+        logger.exception("Error rescheduling reminder %s", reminder_id)
+        return False
+
+
+def _add_jobs(items):
+    """Register (reminder_id, run_at) jobs here, or send them to the worker."""
+    if not backend.tracks_reminders:
+        return
+    if _signals_worker():
+        notifications.send(notifications.SCHEDULER, [
+            {"action": "schedule", "reminder_id": reminder_id, "run_at": run_at}
+            for reminder_id, run_at in items
+        ])
+    else:
+        _backend_add(items)
+
+
+def _all_changed(reason: str):
+    """Drop every cached response and tell event streams to resync."""
+    if _signals_api():
+        notifications.send(notifications.API, [{"action": "resync"}])
+        return
+
+    reminder_cache.clear()
+    event_broker.publish("resync", {"reason": reason})
+
+
+def apply_scheduler_notifications(messages):
+    """
+    Apply schedule/cancel messages from the API to this worker's backend.
+
+    Only the last message per reminder counts.
+    """
+    latest = {message.reminder_id: message for message in messages}
+    jobs = [(rid, message.run_at) for rid, message in latest.items() if message.action == "schedule"]
+    cancelled = [rid for rid, message in latest.items() if message.action == "cancel"]
+
+    if jobs:
+        _backend_add(jobs)
+    if cancelled:
+        _backend_remove(cancelled)
+
+    logger.debug("Applied %d schedule and %d cancel notifications", len(jobs), len(cancelled))
+
+
+def apply_api_notifications(messages):
+    """
+    Apply change messages from the worker to this API process: invalidate
+    cached responses and push the changes to event streams. Invalidations
+    sent by other API processes are applied to the cache only.
+
+    Every API process hears the worker's messages, so the invalidations
+    they cause are not shared again.
+    """
+    shared = [(message.action, message.reminder_id) for message in messages
+              if message.action in ("invalidate", "clear") and message.origin != leases.WORKER_ID]
+    if shared:
+        reminder_cache.apply_shared(shared)
+
+    previous = {}
+    for message in messages:
+        if message.action == "resync":
+            reminder_cache.clear(share=False)
+            event_broker.publish("resync", {"reason": "scheduler"})
+            return
+        if message.action == "changed":
+            # Keep the status from before the first change in the batch
+            previous.setdefault(message.reminder_id, message.previous_status)
+
+    if len(previous) > CHANGED_BATCH_CLEAR:
+        reminder_cache.clear(share=False)
+
+    for shard, ids in by_shard(previous).items():
+        with shard.SessionLocal() as db:
+            for start in range(0, len(ids), 500):
+                for reminder in db.scalars(select(Reminder).where(Reminder.id.in_(ids[start:start + 500]))):
+                    before = (previous[reminder.id], reminder.phone_number, reminder.scheduled_time)
+                    if len(previous) <= CHANGED_BATCH_CLEAR:
+                        reminder_cache.invalidate(reminder.id, before, snapshot(reminder), share=False)
+                    publish_reminder("status", reminder, previous[reminder.id])
+
+
+def send_cache_invalidations():
+    """Send this process's queued response cache invalidations to the other API processes."""
+    notifications.send(notifications.API, [
+        {"action": action, "reminder_id": reminder_id, "origin": leases.WORKER_ID}
+        for action, reminder_id in reminder_cache.take_shared()
+    ])
 
 
 def get_scheduled_jobs():
@@ -214,14 +883,42 @@ def get_scheduled_jobs():
     Get all scheduled jobs (for debugging).
     
     Returns:
-        List of job details
-    """
-    jobs = scheduler.get_jobs()
-    return [
-        {
-            "id": job.id,
-            "next_run": job.next_run_time,
-            "trigger": str(job.trigger)
-        }
-        for job in jobs
-    ]
\ No newline at end of file
+        List of job details, partition by partition
+    """
+    return [job for partition in partitions for job in partition.backend.jobs()]
+
+
+def pending_count() -> int:
+    """
+    Reminders waiting to fire on every shard: the backends' jobs, or for
+    the tick backend (which keeps none) the claimable rows in the tables.
+    """
+    return sum(partition.pending_count() for partition in partitions)
+
+
+def _jobstore(shard) -> tuple:
+    """(engine, table name) of a shard's APScheduler job store (the engine connects lazily)."""
+    if SCHEDULER_JOBSTORE_URL == DATABASE_URL:
+        return shard.engine, "apscheduler_jobs"
+    if shard.index == 0:
+        return create_db_engine(SCHEDULER_JOBSTORE_URL), "apscheduler_jobs"
+    if is_sqlite(SCHEDULER_JOBSTORE_URL):
+        # scheduler_jobs.db -> scheduler_jobs_1.db
+        root, extension = os.path.splitext(SCHEDULER_JOBSTORE_URL)
+        return create_db_engine(f"{root}_{shard.index}{extension}"), "apscheduler_jobs"
+    return create_db_engine(SCHEDULER_JOBSTORE_URL), f"apscheduler_jobs_{shard.index}"
+
+
+# Created last so the APScheduler backends can reference trigger_reminder
+partitions = [Partition(shard) for shard in shards]
+
+# Shard 0's partition under the names used before sharding; every
+# partition runs the same kind of backend
+backend = partitions[0].backend
+call_results = partitions[0].call_results
+lease_keeper = partitions[0].lease_keeper
+archiver = partitions[0].archiver
+scheduler_listener = notifications.Listener(notifications.SCHEDULER, apply_scheduler_notifications)
+api_listener = notifications.Listener(notifications.API, apply_api_notifications,
+                                      flush=send_cache_invalidations)
+SCHEDULER_PENDING.set_function(pending_count)
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field, validator
-from datetime import datetime
-from typing import Optional
-import pytz
+from pydantic import BaseModel, Field, field_serializer, validator
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.recurrence import validate_rule
+from app.timezones import get_zone, to_utc, utcnow
 
 class ReminderBase(BaseModel):
     """Base schema with common fields"""
@@ -10,39 +12,38 @@ class ReminderBase(BaseModel):
     phone_number: str = Field(..., pattern=r'^\+[1-9]\d{1,14}$')  # E.164 format
     timezone: str = Field(default="America/New_York")
     scheduled_time: datetime
+    recurrence: Optional[str] = None  # RRULE, e.g. FREQ=WEEKLY;BYDAY=MO,WE
 
 class ReminderCreate(ReminderBase):
     """Schema for creating a new reminder"""
-    pass
-    
+
+    @validator('timezone')
+    def timezone_must_exist(cls, tz_name):
+        get_zone(tz_name)  # raises ValueError for unknown zones
+        return tz_name
+
     @validator('scheduled_time')
     def scheduled_time_must_be_future(cls, reminder_datetime, values):
         tz_name = values.get("timezone")
 
         if not tz_name:
-            raise ValueError("Timezone must be provided")
+            # Invalid; already reported on the timezone field
+            return reminder_datetime
 
-        try:
-            tz = pytz.timezone(tz_name)
-        except Exception:
-            raise ValueError(f"Invalid timezone: {tz_name}")
+        # Stored as naive UTC: naive input is wall-clock time in the
+        # user's timezone, aware input (like +00:00) is converted
+        reminder_datetime = to_utc(reminder_datetime, tz_name)
 
-        # Convert input datetime to the user's timezone
-        if reminder_datetime.tzinfo is None:
-            # naive -> assume user timezone
-            reminder_datetime = tz.localize(reminder_datetime)
-        else:
-            # aware (like your +00:00 UTC input) -> convert to user's timezone
-            reminder_datetime = reminder_datetime.astimezone(tz)
-
-        # Current time in the user's timezone
-        now = datetime.now(tz)
-
-        if reminder_datetime <= now:
+        if reminder_datetime <= utcnow():
             raise ValueError('Scheduled time must be in the future')
 
         return reminder_datetime
 
+    @validator('recurrence')
+    def recurrence_must_parse(cls, rule):
+        # Empty means one-shot (CSV imports have an empty column)
+        return validate_rule(rule) if rule else None
+
 class ReminderUpdate(BaseModel):
     """Schema for updating a reminder (all fields optional)"""
     title: Optional[str] = Field(None, min_length=1, max_length=100)
@@ -51,6 +52,17 @@ class ReminderUpdate(BaseModel):
     scheduled_time: Optional[datetime] = None
     timezone: Optional[str] = None
     status: Optional[str] = None
+    recurrence: Optional[str] = None  # empty string or null makes it one-shot
+
+    @validator('timezone')
+    def timezone_must_exist(cls, tz_name):
+        if tz_name is not None:
+            get_zone(tz_name)
+        return tz_name
+
+    @validator('recurrence')
+    def recurrence_must_parse(cls, rule):
+        return validate_rule(rule) if rule else None
 
 class ReminderResponse(ReminderBase):
     """Schema for reminder responses"""
@@ -60,6 +72,108 @@ class ReminderResponse(ReminderBase):
     updated_at: datetime
     call_sid: Optional[str] = None
     error_message: Optional[str] = None
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+    series_id: Optional[int] = None  # the recurring reminder this occurrence came from
     
     class Config:
-        from_attributes = True  # Allows ORM models to work with Pydantic
\ No newline at end of file
+        from_attributes = True  # Allows ORM models to work with Pydantic
+
+    @field_serializer('scheduled_time', 'created_at', 'updated_at', 'next_attempt_at')
+    def serialize_utc(self, value: Optional[datetime]):
+        return _as_utc(value)
+
+class OccurrenceResponse(BaseModel):
+    """An upcoming occurrence of a reminder, computed from its recurrence"""
+    reminder_id: int
+    title: str
+    phone_number: str
+    timezone: str
+    scheduled_time: datetime
+    recurrence: Optional[str] = None
+
+    @field_serializer('scheduled_time')
+    def serialize_utc(self, value: datetime):
+        return _as_utc(value)
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Stored naive in UTC; say so in the output ("...Z")
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+class BulkItemResult(BaseModel):
+    """Outcome of a single item in a bulk request"""
+    index: int
+    id: Optional[int] = None
+    status: str  # created, invalid
+    errors: Optional[List[str]] = None
+
+class BulkCreateResponse(BaseModel):
+    """Schema for bulk create responses"""
+    created: int
+    failed: int
+    results: List[BulkItemResult]
+
+class ImportLineError(BaseModel):
+    """A line of an import that was not created"""
+    line: int
+    errors: List[str]
+
+class ImportResponse(BaseModel):
+    """Schema for import responses"""
+    created: int
+    failed: int
+    chunks: int  # transactions committed
+    errors: List[ImportLineError]  # the first IMPORT_MAX_ERRORS failures
+    errors_truncated: bool = False
+
+class BulkSelection(BaseModel):
+    """Reminders a bulk operation applies to: ids and/or filters, combined with AND"""
+    ids: Optional[List[int]] = None
+    status: Optional[str] = None
+    phone_number: Optional[str] = None
+    scheduled_after: Optional[datetime] = None  # scheduled_time range [after, before)
+    scheduled_before: Optional[datetime] = None
+
+class BulkRescheduleRequest(BulkSelection):
+    """Move the selected scheduled reminders: by shift_minutes or to scheduled_time"""
+    shift_minutes: Optional[int] = None
+    scheduled_time: Optional[datetime] = None
+    timezone: Optional[str] = None  # zone of a naive scheduled_time (default: UTC)
+
+    @validator('timezone')
+    def timezone_must_exist(cls, tz_name):
+        if tz_name is not None:
+            get_zone(tz_name)
+        return tz_name
+
+class BulkOperationResponse(BaseModel):
+    """Outcome of a bulk reschedule or cancel"""
+    affected: int
+    skipped: int = 0  # reschedule: left alone because their new time would be in the past
+    scheduler_updated: bool  # False if the scheduler could not be updated (see logs)
+
+class DeadLetterResponse(BaseModel):
+    """Schema for dead-letter responses"""
+    id: int
+    reminder_id: int
+    attempts: int
+    error_message: Optional[str] = None
+    error_code: Optional[int] = None
+    failed_at: datetime
+    replayed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ReplayRequest(BaseModel):
+    """Schema for replaying dead letters (all pending if ids is omitted)"""
+    ids: Optional[List[int]] = Field(None, max_length=50000)
+    rate: Optional[float] = Field(None, gt=0, le=100)  # reminders per second
+
+class ReplayResponse(BaseModel):
+    """Schema for replay responses"""
+    replayed: int
+    rate: float
+    seconds: float  # time until the last one is dispatched
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+UTC time helpers.
+
+Every datetime the backend stores or compares is naive UTC:
+reminders.scheduled_time, next_attempt_at, lease expiries, notification
+timestamps. A reminder's own zone lives in its ``timezone`` column and is
+only used to interpret naive input and to display local times, so server
+clocks, DST changes and the host's TZ never shift when a call is placed.
+"""
+
+from datetime import datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> ZoneInfo:
+    """
+    IANA zone by name, cached per process (ZoneInfo parses the tz file on
+    first use; validation calls this once per request).
+
+    Raises:
+        ValueError: Unknown or malformed zone name
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        raise ValueError(f"Invalid timezone: {name}") from None
+
+
+def utcnow() -> datetime:
+    """Current time as naive UTC, the form every stored datetime uses."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def to_utc(value: datetime, zone: str = "UTC") -> datetime:
+    """
+    Naive UTC equivalent of ``value``.
+
+    Args:
+        value: Aware datetime, or naive wall-clock time in ``zone``
+        zone: IANA zone naive values are interpreted in
+
+    Returns:
+        Naive datetime in UTC
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=get_zone(zone))
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_local(value: datetime, zone: str) -> datetime:
+    """Aware datetime in ``zone`` for a stored naive UTC ``value``."""
+    return value.replace(tzinfo=timezone.utc).astimezone(get_zone(zone))
+
+
+def epoch(value: datetime) -> float:
+    """POSIX timestamp of a naive UTC (or aware) datetime."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def from_epoch(timestamp: float) -> datetime:
+    """Naive UTC datetime of a POSIX timestamp."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
@@ -3,9 +3,13 @@ Twilio integration for making phone calls.
 Uses Twilio's API to call a phone number and speak a message using TTS.
 """
 
+import logging
 import os
+from xml.sax.saxutils import escape
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
@@ -14,6 +18,73 @@ TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
 TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER")
 
+# REST API base URL (override to point at a local stand-in server)
+TWILIO_API_BASE_URL = os.getenv("TWILIO_API_BASE_URL", "https://api.twilio.com")
+
+# Public URL of POST /api/twilio/status (see app/call_status.py)
+TWILIO_STATUS_CALLBACK_URL = os.getenv("TWILIO_STATUS_CALLBACK_URL")
+
+# Twilio rejects a Twiml parameter longer than this many characters
+TWIML_MAX_LENGTH = 4000
+
+# Twilio error codes worth retrying (rate limits, carrier/queue overload);
+# other 4xx errors (invalid or unverified number, auth) are permanent
+TRANSIENT_ERROR_CODES = {20429, 31005, 31009, 32011, 30001}
+
+# Shared REST client, created on first use
+_client = None
+
+
+class CallError(Exception):
+    """
+    A call could not be placed.
+
+    Attributes:
+        transient: True if the same call may succeed later (timeouts,
+            429/5xx responses, rate-limit error codes)
+        code: Twilio error code or HTTP status, if any
+    """
+
+    def __init__(self, message: str, transient: bool, code: int = None):
+        super().__init__(message)
+        self.transient = transient
+        self.code = code
+
+
+def classify_response(http_status: int, code: int = None) -> bool:
+    """Whether a Twilio error response is transient."""
+    return http_status == 429 or http_status >= 500 or code in TRANSIENT_ERROR_CODES
+
+
+def _get_client():
+    """Return the shared Twilio REST client, creating it on first use."""
+    global _client
+    if _client is None:
+        from twilio.rest import Client
+        _client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+    return _client
+
+
+def build_twiml(message) -> str:
+    """
+    Build the TwiML document that speaks the message.
+
+    Args:
+        message: Text to speak, or a list of texts spoken one after
+            another (reminders coalesced into one call)
+    """
+    messages = [message] if isinstance(message, str) else message
+    says = "".join(
+        f"""
+            <Say voice="alice" language="en-US">{escape(text)}</Say>"""
+        for text in messages
+    )
+    return f"""
+        <?xml version="1.0" encoding="UTF-8"?>
+        <Response>{says}
+        </Response>
+        """
+
 
 def make_call(phone_number: str, message: str) -> str:
     """
@@ -29,51 +100,106 @@ def make_call(phone_number: str, message: str) -> str:
     
     # Check if Twilio is configured
     if not all([TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER]):
-        print("⚠️ Twilio not configured - skipping call")
-        print(f"   Would have called: {phone_number}")
-        print(f"   Message: {message}")
+        logger.warning("Twilio not configured - skipping call to %s: %s", phone_number, message)
         return None
     
     try:
-        from twilio.rest import Client
-        
-        # Initialize Twilio client
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-        
-        # Create TwiML for text-to-speech
-        twiml = f"""
-        <?xml version="1.0" encoding="UTF-8"?>
-        <Response>
-            <Say voice="alice" language="en-US">{message}</Say>
-        </Response>
-        """
+        client = _get_client()
         
         # Make the call
         call = client.calls.create(
             to=phone_number,
             from_=TWILIO_PHONE_NUMBER,
-            twiml=twiml
+            twiml=build_twiml(message)
         )
         
-        print(f"✅ Call initiated: {call.sid}")
-        print(f"   To: {phone_number}")
-        print(f"   Status: {call.status}")
+        logger.info("Call initiated", extra={"call_sid": call.sid, "to": phone_number, "status": call.status})
         
         return call.sid
         
     except ImportError:
-        print("❌ Twilio library not installed")
-        print("   Install with: pip install twilio")
+        logger.error("Twilio library not installed (pip install twilio)")
         return None
         
-    except Exception as e:
-        print(f"❌ Error making call: {e}")
+    except Exception:
+        logger.exception("Error making call to %s", phone_number)
         return None
 
 
+async def make_call_async(session, phone_number: str, message) -> str:
+    """
+    Make a phone call through Twilio's REST API on a shared aiohttp session.
+
+    Non-blocking and without building a client per call, so the
+    dispatcher can keep many calls in flight. Unlike make_call, failures
+    raise CallError so the caller can decide whether to retry.
+    
+    Args:
+        session: Shared aiohttp.ClientSession
+        phone_number: E.164 formatted phone number (e.g., +14155552671)
+        message: Text message to speak during the call, or a list of
+            messages spoken one after another
+        
+    Returns:
+        call_sid: Twilio call SID
+
+    Raises:
+        CallError: The call was not placed
+    """
+    import asyncio
+    import aiohttp
+
+    if not all([TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER]):
+        logger.warning("Twilio not configured - skipping call to %s", phone_number)
+        raise CallError("Twilio not configured", transient=False)
+
+    url = f"{TWILIO_API_BASE_URL}/2010-04-01/Accounts/{TWILIO_ACCOUNT_SID}/Calls.json"
+    data = [
+        ("To", phone_number),
+        ("From", TWILIO_PHONE_NUMBER),
+        ("Twiml", build_twiml(message)),
+    ]
+
+    # Have Twilio report call progress instead of polling each call
+    if TWILIO_STATUS_CALLBACK_URL:
+        data.append(("StatusCallback", TWILIO_STATUS_CALLBACK_URL))
+        data.extend(("StatusCallbackEvent", event) for event in ("initiated", "ringing", "answered", "completed"))
+
+    try:
+        async with session.post(
+            url,
+            data=data,
+            auth=aiohttp.BasicAuth(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN),
+        ) as response:
+            try:
+                payload = await response.json(content_type=None)
+            except ValueError:
+                payload = {}
+
+            if response.status >= 400:
+                code = payload.get("code") or response.status
+                reason = payload.get("message") or f"HTTP {response.status}"
+                logger.warning("Error making call to %s: %s %s", phone_number, response.status, reason)
+                raise CallError(
+                    f"Twilio error {code}: {reason}",
+                    transient=classify_response(response.status, payload.get("code")),
+                    code=code,
+                )
+
+            logger.debug("Call initiated", extra={"call_sid": payload["sid"], "to": phone_number})
+            return payload["sid"]
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning("Error making call to %s: %r", phone_number, e)
+        raise CallError(f"Network error: {e!r}", transient=True)
+
+
 def get_call_status(call_sid: str) -> str:
     """
     Get the status of a Twilio call.
+
+    For debugging only: set TWILIO_STATUS_CALLBACK_URL and Twilio pushes
+    every status change to POST /api/twilio/status instead.
     
     Args:
         call_sid: Twilio call SID
@@ -86,13 +212,11 @@ def get_call_status(call_sid: str) -> str:
         return "no-twilio"
     
     try:
-        from twilio.rest import Client
-        
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+        client = _get_client()
         call = client.calls(call_sid).fetch()
         
         return call.status
         
-    except Exception as e:
-        print(f"❌ Error fetching call status: {e}")
+    except Exception:
+        logger.exception("Error fetching call status for %s", call_sid)
         return "error"
\ No newline at end of file
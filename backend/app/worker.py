@@ -0,0 +1,64 @@
+"""
+Standalone scheduler worker.
+
+    SCHEDULER_MODE=worker python -m app.worker
+
+Runs the scheduler backend, the call dispatcher and the lease heartbeat
+outside the API, so firing a burst of reminders doesn't compete with
+request handling for the GIL and the threadpool. Start the API with the
+same SCHEDULER_MODE=worker: it then only writes reminders and signals
+new, moved and deleted ones through the notifications table, and this
+process reports call results back the same way.
+
+Several workers may run at once; claims (app/leases.py) make sure each
+reminder is called by one of them. Stops on SIGINT or SIGTERM, draining
+calls already in flight. Set WORKER_METRICS_PORT to serve this process's
+Prometheus metrics (app/metrics.py) at http://<host>:<port>/metrics.
+"""
+
+import app.load_env
+import logging
+import os
+import signal
+import threading
+
+from app.logging_config import configure_logging
+from app.database import init_db
+from app.scheduler import SCHEDULER_MODE, start_scheduler, stop_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Port for the worker's /metrics (off when unset)
+WORKER_METRICS_PORT = os.getenv("WORKER_METRICS_PORT")
+
+
+def main():
+    configure_logging()
+
+    if SCHEDULER_MODE != "worker":
+        logger.warning("SCHEDULER_MODE is not 'worker': the API runs its own scheduler too")
+
+    init_db()
+
+    if WORKER_METRICS_PORT:
+        from prometheus_client import start_http_server
+
+        start_http_server(int(WORKER_METRICS_PORT))
+        logger.info("Serving metrics on port %s", WORKER_METRICS_PORT)
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+
+    start_scheduler()
+    logger.info("Worker running (Ctrl+C to stop)")
+
+    stopped.wait()
+
+    logger.info("Stopping worker...")
+    stop_scheduler()
+    logger.info("Worker stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Data generators for benchmarks: reminder rows and seeding them."""
+
+import random
+from datetime import datetime, timedelta
+
+
+def message_for(index: int) -> str:
+    """Spoken message of generated reminder ``index`` (fake_twilio keys calls by it)."""
+    return f"Benchmark reminder number {index}"
+
+
+def reminder_rows(count: int, first_due: datetime, spread: float = 0.0, start: int = 0,
+                  status: str = "scheduled", phones: int = 10000, seed: int = 0):
+    """
+    Yield ``count`` Reminder insert dicts due from ``first_due`` over
+    ``spread`` seconds, spread over ``phones`` valid E.164 numbers.
+    Deterministic for a given ``seed``.
+    """
+    rng = random.Random(seed + start)
+    step = spread / count if count else 0
+    for i in range(start, start + count):
+        yield {
+            "title": f"Benchmark {i}",
+            "message": message_for(i),
+            "phone_number": f"+1415555{rng.randrange(phones) % 10000:04d}",
+            "scheduled_time": first_due + timedelta(seconds=(i - start) * step),
+            "timezone": "UTC",
+            "status": status,
+        }
+
+
+def seed_reminders(count: int, first_due: datetime, spread: float = 0.0,
+                   chunk: int = 5000, **options) -> int:
+    """
+    Insert generated reminders into DATABASE_URL (creating the schema)
+    in chunks of ``chunk`` rows; returns how many were written.
+    """
+    from sqlalchemy import insert
+
+    from app.database import SessionLocal, init_db
+    from app.models import Reminder
+
+    init_db()
+    step = spread / count if count else 0
+    with SessionLocal() as db:
+        for start in range(0, count, chunk):
+            size = min(chunk, count - start)
+            due = first_due + timedelta(seconds=start * step)
+            db.execute(insert(Reminder), list(reminder_rows(
+                size, due, step * size, start=start, **options
+            )))
+        db.commit()
+    return count
@@ -0,0 +1,145 @@
+"""Servers for benchmarks: the FastAPI app under uvicorn, a stand-in Twilio."""
+
+import asyncio
+import multiprocessing
+import os
+import random
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(app, port: int = None):
+    """
+    Serve app on 127.0.0.1 (lifespan included) and yield its base URL.
+    """
+    import uvicorn
+
+    port = port or free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    while not server.started:
+        time.sleep(0.01)
+
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def _serve_child(workdir: str, env: dict, seed_rows: int, ready, stop):
+    os.chdir(workdir)
+    os.environ.update(env)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    if seed_rows:
+        from benchmarks._data import seed_reminders
+
+        seed_reminders(seed_rows, datetime.utcnow() + timedelta(days=1), spread=seed_rows)
+
+    from app.main import app
+
+    with serve(app) as base_url:
+        ready.put(base_url)
+        stop.wait()
+
+
+class ApiProcess:
+    """
+    The app under uvicorn in a spawned process, with its own settings
+    (``env``, applied before app is imported) and working directory.
+    Optionally seeds ``seed_rows`` future reminders first. Use as a
+    context manager yielding the base URL.
+    """
+
+    def __init__(self, env: dict, workdir: str = None, seed_rows: int = 0):
+        context = multiprocessing.get_context("spawn")
+        self.workdir = workdir or tempfile.mkdtemp(prefix="bench-api-")
+        self.ready = context.Queue()
+        self.stop = context.Event()
+        self.process = context.Process(
+            target=_serve_child, args=(self.workdir, env, seed_rows, self.ready, self.stop)
+        )
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def __enter__(self) -> str:
+        self.process.start()
+        return self.ready.get()
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.process.join()
+
+
+@contextmanager
+def fake_twilio(calls=None, port: int = None, latency: float = 0.02, arrivals=None,
+                error_rate: float = 0.0, error_code: int = 20429, seed: int = 0, placed=None):
+    """
+    Serve Twilio's Calls.json in a background thread and yield its base URL
+    (for TWILIO_API_BASE_URL). Calls are answered after ``latency`` seconds;
+    a seeded ``error_rate`` share of them fail with Twilio error
+    ``error_code`` (20429, too many requests, is retried; 21211, invalid
+    number, is not). Calls are keyed by spoken message (each one, for a
+    call speaking several): counted in ``calls`` (a Counter) and the
+    first arrival time stored in ``arrivals`` (a dict), if given. Every
+    request is also appended to ``placed`` (a list) as (arrival time,
+    To, messages), if given.
+    """
+    from aiohttp import web
+
+    rng = random.Random(seed)
+    error_status = 429 if error_code == 20429 else 400
+
+    async def create_call(request):
+        form = await request.post()
+        messages = re.findall(r"<Say[^>]*>(.*?)</Say>", form["Twiml"], re.S)
+        if placed is not None:
+            placed.append((time.time(), form["To"], messages))
+        for message in messages:
+            if calls is not None:
+                calls[message] += 1
+            if arrivals is not None:
+                arrivals.setdefault(message, time.time())
+        await asyncio.sleep(latency)
+        if rng.random() < error_rate:
+            return web.json_response(
+                {"code": error_code, "message": "Fake Twilio error", "status": error_status},
+                status=error_status,
+            )
+        return web.json_response({"sid": f"CA{os.urandom(16).hex()}"}, status=201)
+
+    port = port or free_port()
+    loop = asyncio.new_event_loop()
+    app = web.Application()
+    app.router.add_post("/2010-04-01/Accounts/{sid}/Calls.json", create_call)
+    runner = web.AppRunner(app, access_log=None)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.run_until_complete(runner.cleanup())
+        loop.close()
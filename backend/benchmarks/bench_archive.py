@@ -0,0 +1,204 @@
+"""
+Benchmark: live-table query latency with and without archiving.
+
+Seeds a throwaway SQLite database with --history finished reminders
+(completed, failed, missed; due and last updated 60-400 days ago) and
+--live scheduled ones, then times the queries the scheduler and the API
+run against the live table:
+
+- reload: reload_scheduled_jobs() into a cold heap backend
+- due scan: the tick backend's claim query (nothing due)
+- API pages (response cache off): scheduled reminders, one number's
+  reminders, every reminder (which includes the archive once there is
+  one), and GET by id for a live and a finished reminder
+- insert: POST /api/reminders/
+
+Then archives every finished reminder with the Archiver (timing each
+batch transaction and single-row inserts made meanwhile by another
+thread) and runs the same queries again.
+
+Usage (from backend/):
+    python -m benchmarks.bench_archive --history 10000000 --live 100000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+STATUSES = ("completed", "completed", "completed", "failed", "missed")
+
+
+def seed(history: int, live: int, chunk: int = 20000):
+    from sqlalchemy import insert
+
+    from app.database import SessionLocal, init_db
+    from app.models import Reminder
+    from benchmarks._data import reminder_rows
+
+    init_db()
+    now = datetime.utcnow()
+    first_old = now - timedelta(days=400)
+    step = 340 * 86400 / max(history, 1)
+
+    with SessionLocal() as db:
+        for start in range(0, history, chunk):
+            size = min(chunk, history - start)
+            rows = list(reminder_rows(size, first_old + timedelta(seconds=start * step),
+                                      step * size, start=start))
+            for offset, row in enumerate(rows):
+                row["status"] = STATUSES[(start + offset) % len(STATUSES)]
+                row["created_at"] = row["updated_at"] = row["scheduled_time"]
+                row["attempts"] = 1
+            db.execute(insert(Reminder), rows)
+            db.commit()
+        db.execute(insert(Reminder), list(reminder_rows(
+            live, now + timedelta(days=1), 30 * 86400, start=history
+        )))
+        db.commit()
+
+
+def median_ms(function, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def measure(client, repeat: int, history: int) -> dict:
+    from app import leases, scheduler
+    from app.database import SessionLocal
+    from app.timezones import utcnow
+
+    live_id = history + 1
+    finished_id = history // 2
+    phone = client.get(f"/api/reminders/{live_id}").json()["phone_number"]
+    due = (datetime.utcnow() + timedelta(days=3)).isoformat() + "Z"
+
+    def reload():
+        with scheduler.backend.condition:
+            scheduler.backend.heap.clear()
+            scheduler.backend.entries.clear()
+        scheduler.reload_scheduled_jobs()
+
+    def due_scan():
+        with SessionLocal() as db:
+            leases.claim_due(db, utcnow(), 1000)
+
+    def get(path, **params):
+        return lambda: client.get(path, params=params).raise_for_status()
+
+    def create():
+        client.post("/api/reminders/", json={
+            "title": "Archive benchmark", "message": "Archive benchmark reminder",
+            "phone_number": "+14155550199", "scheduled_time": due, "timezone": "UTC",
+        }).raise_for_status()
+
+    return {
+        "reload": median_ms(reload, max(1, repeat // 10)),
+        "due scan": median_ms(due_scan, repeat),
+        "list scheduled": median_ms(get("/api/reminders/", status="scheduled"), repeat),
+        "list one number": median_ms(get("/api/reminders/", phone_number=phone, order="desc"), repeat),
+        "list all": median_ms(get("/api/reminders/"), repeat),
+        "get live": median_ms(get(f"/api/reminders/{live_id}"), repeat),
+        "get finished": median_ms(get(f"/api/reminders/{finished_id}"), repeat),
+        "create": median_ms(create, repeat),
+    }
+
+
+def archive_with_writer():
+    """Archive everything eligible while another thread inserts rows; returns stats."""
+    from sqlalchemy import insert
+
+    from app.archive import Archiver
+    from app.database import SessionLocal
+    from app.models import Reminder
+
+    archiver = Archiver(after_days=30)
+    writes = []
+    done = threading.Event()
+
+    def writer():
+        i = 0
+        while not done.is_set():
+            started = time.perf_counter()
+            with SessionLocal() as db:
+                db.execute(insert(Reminder).values(
+                    title=f"Writer {i}", message="Concurrent write", phone_number="+14155550198",
+                    scheduled_time=datetime.utcnow() + timedelta(days=2), timezone="UTC",
+                ))
+                db.commit()
+            writes.append((time.perf_counter() - started) * 1000)
+            i += 1
+            time.sleep(0.01)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    started = time.perf_counter()
+    archived = archiver.run()
+    seconds = time.perf_counter() - started
+    done.set()
+    thread.join()
+
+    writes.sort()
+    return {
+        "archived": archived,
+        "seconds": seconds,
+        "max_batch_ms": archiver.max_batch_seconds * 1000,
+        "write_p50_ms": writes[len(writes) // 2],
+        "write_p99_ms": writes[min(len(writes) - 1, int(len(writes) * 0.99))],
+        "write_max_ms": writes[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history", type=int, default=10_000_000)
+    parser.add_argument("--live", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    workdir = tempfile.mkdtemp(prefix="bench-archive-")
+    os.chdir(workdir)
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{workdir}/reminders.db",
+        SCHEDULER_BACKEND="heap",
+        ARCHIVE_AFTER_DAYS="0",  # archived below, not by the background thread
+        CACHE_TTL="0",
+        COUNT_CACHE_TTL="0",
+        LOG_LEVEL="WARNING",
+    )
+
+    started = time.perf_counter()
+    seed(args.history, args.live)
+    seeded = time.perf_counter() - started
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        before = measure(client, args.repeat, args.history)
+        archive = archive_with_writer()
+        after = measure(client, args.repeat, args.history)
+
+    print(f"{args.history:,} finished + {args.live:,} scheduled reminders (seeded in {seeded:.0f}s)")
+    print(f"archived {archive['archived']:,} in {archive['seconds']:.0f}s "
+          f"({archive['archived'] / archive['seconds']:,.0f} rows/s), longest batch "
+          f"{archive['max_batch_ms']:.0f} ms; concurrent inserts p50 {archive['write_p50_ms']:.1f} ms, "
+          f"p99 {archive['write_p99_ms']:.1f} ms, max {archive['write_max_ms']:.0f} ms")
+    print(f"{'query':<18} {'before ms':>10} {'after ms':>10}")
+    for name in before:
+        print(f"{name:<18} {before[name]:>10.2f} {after[name]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
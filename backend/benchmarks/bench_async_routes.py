@@ -0,0 +1,118 @@
+"""
+Benchmark: async (AsyncSession) vs sync (threadpool Session) request path.
+
+Serves the app under uvicorn with one extra route, a sync twin of
+GET /api/reminders/{id} on the blocking session (run in Starlette's
+threadpool), then drives both with the same number of concurrent aiohttp
+clients and reports throughput and latency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_async_routes --clients 200 --requests 20000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+async def drive(base_url: str, path: str, clients: int, requests: int, seed: int) -> dict:
+    import aiohttp
+
+    latencies = []
+    remaining = iter(range(requests))
+    rng = random.Random(0)
+
+    async def client(session):
+        for _ in remaining:
+            rid = rng.randint(1, seed)
+            start = time.perf_counter()
+            async with session.get(f"{base_url}{path.format(id=rid)}") as response:
+                await response.read()
+                assert response.status == 200, (response.status, await response.text())
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=clients)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    workdir = tempfile.mkdtemp(prefix="bench-async-")
+    os.chdir(workdir)
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/reminders.db"
+    os.environ["SCHEDULER_BACKEND"] = "heap"
+    # One connection per threadpool worker for the sync path
+    os.environ.setdefault("DB_POOL_SIZE", "40")
+
+    import httpx
+    from fastapi import HTTPException
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models import Reminder
+    from app.schemas import ReminderResponse
+    from benchmarks._server import serve
+
+    # The session is scoped to the handler rather than a get_db yield
+    # dependency: with more clients than pooled connections, handlers
+    # waiting for a connection hold every threadpool worker, and the
+    # dependency cleanup that would release one never gets a thread.
+    @app.get("/bench/sync/{reminder_id}", response_model=ReminderResponse)
+    def get_reminder_sync(reminder_id: int):
+        with SessionLocal() as db:
+            reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
+            if not reminder:
+                raise HTTPException(status_code=404)
+            return ReminderResponse.model_validate(reminder)
+
+    payloads = [
+        {
+            "title": f"Reminder {i}",
+            "message": f"This is benchmark reminder number {i}",
+            "phone_number": f"+1415555{i % 10000:04d}",
+            "timezone": "UTC",
+            "scheduled_time": (datetime.utcnow() + timedelta(days=1, seconds=i)).isoformat() + "Z",
+        }
+        for i in range(args.seed)
+    ]
+
+    with serve(app) as base_url:
+        httpx.post(f"{base_url}/api/reminders/bulk", json=payloads, timeout=60).raise_for_status()
+
+        for name, path in [("sync", "/bench/sync/{id}"), ("async", "/api/reminders/{id}")]:
+            # Warm up pools before measuring
+            asyncio.run(drive(base_url, path, args.clients, args.clients * 2, args.seed))
+            result = asyncio.run(drive(base_url, path, args.clients, args.requests, args.seed))
+            print(f"{name:<6} {result['rps']:8.0f} req/s   p50 {result['p50_ms']:7.1f} ms   "
+                  f"p99 {result['p99_ms']:7.1f} ms   ({args.clients} clients)")
+
+
+if __name__ == "__main__":
+    main()
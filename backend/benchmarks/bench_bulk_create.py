@@ -0,0 +1,65 @@
+"""
+Benchmark: single-item POST /api/reminders/ vs POST /api/reminders/bulk.
+
+Runs against a throwaway SQLite database and job store in a temp directory
+and prints rows per second for each path.
+
+Usage (from backend/):
+    python -m benchmarks.bench_bulk_create --rows 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def make_payload(i: int) -> dict:
+    return {
+        "title": f"Reminder {i}",
+        "message": f"This is benchmark reminder number {i}",
+        "phone_number": f"+1415555{i % 10000:04d}",
+        "timezone": "UTC",
+        "scheduled_time": (datetime.utcnow() + timedelta(days=1, seconds=i)).isoformat() + "Z",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    workdir = tempfile.mkdtemp(prefix="bench-bulk-")
+    os.chdir(workdir)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/reminders.db"
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    payloads = [make_payload(i) for i in range(args.rows)]
+
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        for payload in payloads:
+            client.post("/api/reminders/", json=payload).raise_for_status()
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = client.post("/api/reminders/bulk", json=payloads)
+        response.raise_for_status()
+        bulk = time.perf_counter() - start
+        assert response.json()["created"] == args.rows
+
+    print(f"rows:        {args.rows}")
+    print(f"single-item: {single:8.2f}s  {args.rows / single:10.0f} rows/s")
+    print(f"bulk:        {bulk:8.2f}s  {args.rows / bulk:10.0f} rows/s")
+    print(f"speedup:     {single / bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: per-id PUT/DELETE vs POST /api/reminders/bulk/reschedule and
+/bulk/cancel.
+
+Seeds --rows scheduled reminders on a throwaway SQLite database (and job
+store, with the apscheduler backend), then:
+
+- moves --sample of them one at a time with PUT and deletes another
+  --sample with DELETE, extrapolated to --rows
+- shifts all of them by an hour with one bulk reschedule (by filter),
+  moves --ids of them to a fixed time by id, and cancels them all with
+  one bulk cancel
+
+and checks the scheduler agrees with the table afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_bulk_reschedule --rows 50000 --backend apscheduler
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--sample", type=int, default=200, help="reminders moved/deleted one at a time")
+    parser.add_argument("--ids", type=int, default=10000, help="reminders selected by id")
+    parser.add_argument("--backend", default="apscheduler")
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    workdir = tempfile.mkdtemp(prefix="bench-bulk-reschedule-")
+    os.chdir(workdir)
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{workdir}/reminders.db",
+        SCHEDULER_BACKEND=args.backend,
+        LOG_LEVEL="WARNING",
+    )
+
+    from fastapi.testclient import TestClient
+    from benchmarks._data import seed_reminders
+
+    first_due = datetime.utcnow() + timedelta(days=1)
+    seed_reminders(args.rows, first_due, spread=args.rows)
+
+    from app import scheduler
+    from app.main import app
+
+    window = {"scheduled_after": (first_due - timedelta(minutes=1)).isoformat()}
+
+    with TestClient(app) as client:
+        ids = [row["id"] for row in client.get("/api/reminders/", params={"limit": 1000}).json()]
+        sample = ids[:args.sample]
+
+        started = time.perf_counter()
+        for reminder_id in sample:
+            current = client.get(f"/api/reminders/{reminder_id}").json()["scheduled_time"]
+            moved = datetime.fromisoformat(current.rstrip("Z")) + timedelta(hours=1)
+            client.put(f"/api/reminders/{reminder_id}",
+                       json={"scheduled_time": moved.isoformat() + "Z"}).raise_for_status()
+        single_move = (time.perf_counter() - started) / len(sample)
+
+        started = time.perf_counter()
+        response = client.post("/api/reminders/bulk/reschedule", json={**window, "shift_minutes": 60})
+        response.raise_for_status()
+        bulk_move = time.perf_counter() - started
+        assert response.json()["affected"] == args.rows, response.json()
+
+        by_id = list(range(1, args.ids + 1))
+        started = time.perf_counter()
+        response = client.post("/api/reminders/bulk/reschedule", json={
+            "ids": by_id, "scheduled_time": (first_due + timedelta(days=1)).isoformat() + "Z",
+        })
+        response.raise_for_status()
+        bulk_ids = time.perf_counter() - started
+        assert response.json()["affected"] == args.ids, response.json()
+
+        pending = scheduler.pending_count()
+
+        deleted_sample = ids[args.sample:2 * args.sample]
+        started = time.perf_counter()
+        for reminder_id in deleted_sample:
+            client.delete(f"/api/reminders/{reminder_id}").raise_for_status()
+        single_delete = (time.perf_counter() - started) / len(deleted_sample)
+
+        started = time.perf_counter()
+        response = client.post("/api/reminders/bulk/cancel", json=window)
+        response.raise_for_status()
+        bulk_cancel = time.perf_counter() - started
+        cancelled = response.json()["affected"]
+
+        left = scheduler.pending_count()
+
+    print(f"{args.rows:,} reminders, {args.backend} backend")
+    print(f"{'operation':<28} {'seconds':>9} {'rows/s':>10}")
+    rows = [
+        (f"PUT one at a time (x{args.rows:,})", single_move * args.rows, args.rows),
+        ("bulk shift by filter", bulk_move, args.rows),
+        (f"bulk set time, {args.ids:,} ids", bulk_ids, args.ids),
+        (f"DELETE one at a time (x{args.rows:,})", single_delete * args.rows, args.rows),
+        ("bulk cancel by filter", bulk_cancel, cancelled),
+    ]
+    for name, seconds, count in rows:
+        print(f"{name:<28} {seconds:>9.2f} {count / seconds:>10,.0f}")
+    print(f"scheduler: {pending:,} pending after the moves, {left:,} after the cancel")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark: calls saved and latency added by per-number coalescing and pacing.
+
+Seeds --reminders reminders over --numbers phone numbers: each number
+gets a cluster of reminders --gap seconds apart, and the clusters are
+spread over --spread seconds. Each configuration fires them at a
+stand-in Twilio server in its own process against a fresh SQLite
+database:
+
+- ``off``: one call per reminder (the previous behaviour)
+- ``coalesce``: COALESCE_WINDOW_SECONDS=--window
+- ``coalesce+pace``: the same, plus DESTINATION_MIN_INTERVAL_SECONDS=--interval
+
+and reports calls placed, calls saved, end-to-end lag (call reached
+Twilio minus due time), the shortest gap between two calls to one number,
+and how many pacing buckets were saved when the scheduler stopped.
+
+Usage (from backend/):
+    python -m benchmarks.bench_coalescing --reminders 5000 --numbers 1000 --window 5
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+
+
+def message_for(index: int) -> str:
+    return f"Coalescing benchmark reminder {index}"
+
+
+def phone_for(index: int, numbers: int) -> str:
+    return f"+1415555{index % numbers:04d}"
+
+
+def due_for(index: int, args, start: float) -> float:
+    return start + (index % args.numbers) * args.spread / args.numbers + (index // args.numbers) * args.gap
+
+
+def child(name: str, env: dict, args, twilio_url: str, start: float, results):
+    """Fire every reminder under one configuration; put counters on ``results``."""
+    workdir = tempfile.mkdtemp(prefix=f"bench-coalescing-{name.replace('+', '-')}-")
+    os.chdir(workdir)
+    os.environ.update(
+        env,
+        DATABASE_URL=f"sqlite:///{workdir}/reminders.db",
+        SCHEDULER_BACKEND=args.backend,
+        TWILIO_ACCOUNT_SID="ACbench",
+        TWILIO_AUTH_TOKEN="bench",
+        TWILIO_PHONE_NUMBER="+15005550006",
+        TWILIO_API_BASE_URL=twilio_url,
+        TWILIO_CALLS_PER_SECOND="100000",
+        MISSED_GRACE_SECONDS="3600",
+        LOG_LEVEL="WARNING",
+    )
+    sys.stdout = open(os.devnull, "w")
+
+    from sqlalchemy import func, insert, select
+    from app.database import SessionLocal, init_db
+    from app.models import DestinationBucket, Reminder
+    from app import scheduler
+
+    init_db()
+    with SessionLocal() as db:
+        db.execute(insert(Reminder), [
+            {
+                "title": f"Coalescing {i}",
+                "message": message_for(i),
+                "phone_number": phone_for(i, args.numbers),
+                "scheduled_time": datetime.utcfromtimestamp(due_for(i, args, start)),
+                "timezone": "UTC",
+                "status": "scheduled",
+            }
+            for i in range(args.reminders)
+        ])
+        db.commit()
+
+    scheduler.start_scheduler()
+
+    deadline = due_for(args.reminders - 1, args, start) + args.timeout
+    while time.time() < deadline:
+        with SessionLocal() as db:
+            pending = db.scalar(
+                select(func.count()).select_from(Reminder).where(Reminder.status != "completed")
+            )
+        if not pending:
+            break
+        time.sleep(0.2)
+
+    stats = scheduler.dispatcher.stats()
+    scheduler.stop_scheduler()
+    with SessionLocal() as db:
+        saved_buckets = db.scalar(select(func.count()).select_from(DestinationBucket))
+
+    results.put({"name": name, "pending": pending, "hold": stats["hold"], "saved_buckets": saved_buckets})
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reminders", type=int, default=5000)
+    parser.add_argument("--numbers", type=int, default=1000, help="distinct phone numbers")
+    parser.add_argument("--gap", type=float, default=2, help="seconds between reminders to one number")
+    parser.add_argument("--spread", type=float, default=30, help="seconds the clusters are spread over")
+    parser.add_argument("--window", type=float, default=5, help="COALESCE_WINDOW_SECONDS")
+    parser.add_argument("--interval", type=float, default=60, help="DESTINATION_MIN_INTERVAL_SECONDS")
+    parser.add_argument("--lead", type=float, default=10, help="seconds from startup to the first due time")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--backend", default="heap")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from benchmarks._server import fake_twilio
+
+    configurations = [
+        ("off", {"COALESCE_WINDOW_SECONDS": "0", "DESTINATION_MIN_INTERVAL_SECONDS": "0"}),
+        ("coalesce", {"COALESCE_WINDOW_SECONDS": str(args.window), "DESTINATION_MIN_INTERVAL_SECONDS": "0"}),
+        ("coalesce+pace", {"COALESCE_WINDOW_SECONDS": str(args.window),
+                           "DESTINATION_MIN_INTERVAL_SECONDS": str(args.interval)}),
+    ]
+
+    context = multiprocessing.get_context("spawn")
+    reports = []
+    arrivals = {}
+    placed = []
+
+    with fake_twilio(arrivals=arrivals, placed=placed) as twilio_url:
+        for name, env in configurations:
+            arrivals.clear()
+            placed.clear()
+            start = time.time() + args.lead
+            queue = context.Queue()
+            process = context.Process(target=child, args=(name, env, args, twilio_url, start, queue))
+            process.start()
+            result = queue.get()
+            process.join()
+
+            by_number = defaultdict(list)
+            for arrived, number, _ in placed:
+                by_number[number].append(arrived)
+            gaps = [b - a for times in by_number.values() for a, b in zip(sorted(times), sorted(times)[1:])]
+
+            result.update(
+                calls=len(placed),
+                lags=[arrivals[message_for(i)] - due_for(i, args, start)
+                      for i in range(args.reminders) if message_for(i) in arrivals],
+                min_gap=min(gaps, default=float("nan")),
+            )
+            reports.append(result)
+
+    per_number = args.reminders / args.numbers
+    print(f"{args.reminders} reminders over {args.numbers} numbers "
+          f"({per_number:.0f} each, {args.gap:.0f}s apart), {args.backend} backend")
+    print(f"{'config':<14} {'calls':>6} {'saved':>6} {'lag p50':>8} {'p99':>7} "
+          f"{'hold p99':>9} {'min gap':>8} {'buckets':>8}")
+    for report in reports:
+        lags = report["lags"]
+        hold = report["hold"]["p99"]
+        print(f"{report['name']:<14} {report['calls']:>6} {args.reminders - report['calls']:>6} "
+              f"{percentile(lags, 0.5):>7.2f}s {percentile(lags, 0.99):>6.2f}s "
+              f"{hold if hold is not None else float('nan'):>8.2f}s {report['min_gap']:>7.2f}s "
+              f"{report['saved_buckets']:>8}"
+              + (f"  ({report['pending']} not recorded)" if report["pending"] else ""))
+
+
+if __name__ == "__main__":
+    main()
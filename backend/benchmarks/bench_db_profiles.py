@@ -0,0 +1,158 @@
+"""
+Load test: mixed API and trigger traffic per database profile.
+
+API threads issue creates, gets, list pages and updates over HTTP
+against the app under uvicorn while trigger threads write call results the way the
+dispatcher does. Each profile runs in its own subprocess against a fresh
+database; p50/p99 latency is reported per operation.
+
+Usage (from backend/):
+    python -m benchmarks.bench_db_profiles --seconds 10
+    python -m benchmarks.bench_db_profiles --postgres-url postgresql://localhost/reminders_bench
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+def percentile(samples, p):
+    if not samples:
+        return None
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def payload(i: int) -> dict:
+    return {
+        "title": f"Reminder {i}",
+        "message": f"This is load test reminder number {i}",
+        "phone_number": f"+1415555{i % 10000:04d}",
+        "timezone": "UTC",
+        "scheduled_time": (datetime.utcnow() + timedelta(days=1, seconds=i)).isoformat() + "Z",
+    }
+
+
+def run_profile(args) -> dict:
+    """Run inside the subprocess: environment is already configured."""
+    import httpx
+    from app.main import app
+    from app.scheduler import record_call_result
+    from benchmarks._server import serve
+
+    latencies = {"create": [], "get": [], "list": [], "update": [], "trigger": []}
+    errors = {name: 0 for name in latencies}
+
+    def timed(kind, fn):
+        start = time.perf_counter()
+        try:
+            ok = fn()
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - start
+        if ok:
+            latencies[kind].append(elapsed)
+        else:
+            errors[kind] += 1
+
+    def api_worker(worker: int):
+        client = httpx.Client(base_url=base_url, timeout=60)
+        rng = random.Random(worker)
+        while time.perf_counter() < deadline:
+            roll = rng.random()
+            rid = rng.randint(1, args.seed)
+            if roll < 0.3:
+                timed("create", lambda: client.post("/api/reminders/", json=payload(rng.randint(0, 10**6))).is_success)
+            elif roll < 0.7:
+                timed("get", lambda: client.get(f"/api/reminders/{rid}").is_success)
+            elif roll < 0.9:
+                timed("list", lambda: client.get("/api/reminders/", params={"limit": 50}).is_success)
+            else:
+                timed("update", lambda: client.put(f"/api/reminders/{rid}", json={"title": "Updated"}).is_success)
+        client.close()
+
+    def trigger_worker(worker: int):
+        rng = random.Random(1000 + worker)
+        while time.perf_counter() < deadline:
+            rid = rng.randint(1, args.seed)
+            timed("trigger", lambda: record_call_result(rid, f"CA{rid:032d}") or True)
+
+    with serve(app) as base_url:
+        httpx.post(f"{base_url}/api/reminders/bulk", json=[payload(i) for i in range(args.seed)],
+                   timeout=60).raise_for_status()
+        deadline = time.perf_counter() + args.seconds
+
+        threads = [threading.Thread(target=api_worker, args=(i,)) for i in range(args.api_threads)]
+        threads += [threading.Thread(target=trigger_worker, args=(i,)) for i in range(args.trigger_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return {
+        kind: {
+            "count": len(samples),
+            "errors": errors[kind],
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 2) if samples else None,
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 2) if samples else None,
+        }
+        for kind, samples in latencies.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=2000)
+    parser.add_argument("--api-threads", type=int, default=8)
+    parser.add_argument("--trigger-threads", type=int, default=4)
+    parser.add_argument("--postgres-url", default=None)
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    if args.child:
+        sys.path.insert(0, backend_dir)
+        print(json.dumps(run_profile(args)))
+        return
+
+    profiles = [("basic", None), ("tuned", None)]
+    if args.postgres_url:
+        profiles.append(("tuned", args.postgres_url))
+
+    for profile, url in profiles:
+        workdir = tempfile.mkdtemp(prefix="bench-db-")
+        env = dict(
+            os.environ,
+            DB_PROFILE=profile,
+            DATABASE_URL=url or f"sqlite:///{workdir}/reminders.db",
+            # Isolate the reminders database from job store writes
+            SCHEDULER_BACKEND="heap",
+        )
+        child = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_db_profiles", "--child", profile,
+             "--seconds", str(args.seconds), "--seed", str(args.seed),
+             "--api-threads", str(args.api_threads), "--trigger-threads", str(args.trigger_threads)],
+            cwd=backend_dir, env=env, capture_output=True, text=True, check=True,
+        )
+        results = json.loads(child.stdout.strip().splitlines()[-1])
+
+        name = f"{profile} / {'postgres' if url else 'sqlite'}"
+        print(f"\n{name}")
+        print(f"  {'op':<8} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9}")
+        for kind, row in results.items():
+            print(f"  {kind:<8} {row['count']:>7} {row['errors']:>7} "
+                  f"{row['p50_ms'] if row['p50_ms'] is not None else '-':>9} "
+                  f"{row['p99_ms'] if row['p99_ms'] is not None else '-':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark: fan-out of reminder events to many SSE subscribers.
+
+Serves the app under uvicorn, opens --subscribers streams on
+GET /api/reminders/events from a separate process, then updates reminders
+through PUT /api/reminders/{id} at --rate per second and reports how
+long each update took to reach every subscriber.
+
+Then --slow subscribers that connect but never read get a burst of
+--burst events: their queues should stay bounded and end in a resync
+instead of growing.
+
+Usage (from backend/):
+    python -m benchmarks.bench_event_stream --subscribers 1000 --updates 200
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+async def _subscribe(base_url, subscribers, updates, connected, results):
+    import aiohttp
+
+    received = []
+    resyncs = 0
+    done = 0
+
+    async def reader(session):
+        nonlocal resyncs, done
+        seen = 0
+        async with session.get(f"{base_url}/api/reminders/events?status=scheduled") as response:
+            connected.put(1)
+            event = None
+            async for line in response.content:
+                line = line.decode().rstrip("\n")
+                if line.startswith("event: "):
+                    event = line[7:]
+                elif line.startswith("data: ") and event == "updated":
+                    title = json.loads(line[6:])["title"]
+                    if title.startswith("bench-"):
+                        received.append((int(title[6:]), time.time()))
+                        seen += 1
+                        if seen == updates:
+                            break
+                elif line.startswith("data: ") and event == "resync":
+                    resyncs += 1
+        done += 1
+
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=120)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(*(reader(session) for _ in range(subscribers)), return_exceptions=True)
+
+    results.put({"received": received, "resyncs": resyncs, "completed": done})
+
+
+def subscriber_process(base_url, subscribers, updates, connected, results):
+    asyncio.run(_subscribe(base_url, subscribers, updates, connected, results))
+
+
+def stalled_subscriber(base_url) -> socket.socket:
+    """Open a stream with a tiny receive buffer and never read it."""
+    host, port = base_url[len("http://"):].split(":")
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect((host, int(port)))
+    sock.sendall(f"GET /api/reminders/events HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    return sock
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--slow", type=int, default=10)
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=50.0)
+    parser.add_argument("--burst", type=int, default=20000)
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    workdir = tempfile.mkdtemp(prefix="bench-events-")
+    os.chdir(workdir)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/reminders.db"
+    os.environ["SCHEDULER_BACKEND"] = "heap"
+    os.environ.setdefault("EVENT_QUEUE_SIZE", "64")
+
+    import httpx
+    from app.events import event_broker
+    from app.main import app
+    from benchmarks._server import serve
+
+    with serve(app) as base_url:
+        client = httpx.Client(base_url=base_url, timeout=30)
+        reminder = client.post("/api/reminders/", json={
+            "title": "bench",
+            "message": "Event stream benchmark reminder",
+            "phone_number": "+14155550100",
+            "scheduled_time": (datetime.utcnow() + timedelta(days=1)).isoformat(),
+            "timezone": "UTC",
+        }).json()
+
+        # Clients run in their own process so they don't share the GIL with
+        # the server; spawn, since this process already runs threads
+        context = multiprocessing.get_context("spawn")
+        connected = context.Queue()
+        results = context.Queue()
+        process = context.Process(
+            target=subscriber_process,
+            args=(base_url, args.subscribers, args.updates, connected, results),
+        )
+        process.start()
+
+        started = time.perf_counter()
+        for _ in range(args.subscribers):
+            connected.get()
+        while event_broker.stats()["subscribers"] < args.subscribers:
+            time.sleep(0.05)
+        print(f"{args.subscribers} subscribers connected in {time.perf_counter() - started:.1f}s")
+
+        sent = {}
+        started = time.perf_counter()
+        for i in range(args.updates):
+            sent[i] = time.time()
+            client.put(f"/api/reminders/{reminder['id']}", json={"title": f"bench-{i}"})
+            delay = started + (i + 1) / args.rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        outcome = results.get()
+        process.join()
+        stats = client.get("/api/reminders/debug/events").json()
+
+        # Burst to subscribers that stopped reading
+        stalled = [stalled_subscriber(base_url) for _ in range(args.slow)]
+        while event_broker.stats()["subscribers"] < args.slow:
+            time.sleep(0.05)
+        before = event_broker.stats()
+        payload = client.get(f"/api/reminders/{reminder['id']}").json()
+        for _ in range(args.burst):
+            event_broker.publish("updated", payload, reminder_id=reminder["id"],
+                                 statuses=("scheduled",), phone_number=reminder["phone_number"])
+        time.sleep(1)
+        burst = client.get("/api/reminders/debug/events").json()
+        for sock in stalled:
+            sock.close()
+        client.close()
+
+    latencies = [(at - sent[i]) * 1000 for i, at in outcome["received"]]
+    expected = args.updates * args.subscribers
+    print(f"delivered {len(latencies)}/{expected} events "
+          f"({outcome['completed']} subscribers saw every update)")
+    print(f"update -> subscriber latency   p50 {percentile(latencies, 0.50):7.1f} ms   "
+          f"p99 {percentile(latencies, 0.99):7.1f} ms   max {max(latencies):7.1f} ms")
+    print(f"broker: published {stats['published']}, delivered {stats['delivered']}, "
+          f"resyncs {stats['resyncs']} (readers saw {outcome['resyncs']} resync events)")
+    print(f"{args.slow} stalled subscribers, {args.burst}-event burst: "
+          f"delivered {burst['delivered'] - before['delivered']}, "
+          f"overflowed {burst['resyncs'] - before['resyncs']} (queue size {burst['queue_size']})")
+
+
+if __name__ == "__main__":
+    main()
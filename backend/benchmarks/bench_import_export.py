@@ -0,0 +1,135 @@
+"""
+Benchmark: streaming import and export of reminders.
+
+Serves the app on a fresh SQLite database, uploads --rows generated
+reminders to POST /api/reminders/import as a chunked stream (CSV or
+NDJSON, generated on the fly so the client stays small too), then
+downloads GET /api/reminders/export in both formats. Reports rows per
+second and the server's peak memory (VmHWM) after startup, after the
+import and after the exports: flat numbers mean memory does not grow
+with the row count.
+
+Usage (from backend/):
+    python -m benchmarks.bench_import_export --rows 1000000 --format csv
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def peak_rss_mib(pid: int) -> float:
+    """Peak resident memory of a process in MiB (Linux)."""
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+async def generate(rows: int, format: str, batch: int = 2000):
+    """Yield an import body in chunks of ``batch`` records."""
+    from benchmarks._data import reminder_rows
+
+    due = datetime.utcnow() + timedelta(days=1)
+    fields = ["title", "message", "phone_number", "scheduled_time", "timezone"]
+
+    if format == "csv":
+        yield (",".join(fields) + "\n").encode()
+
+    for start in range(0, rows, batch):
+        records = reminder_rows(min(batch, rows - start), due + timedelta(seconds=start), start=start)
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows([record[field] for field in fields] for record in records)
+            yield buffer.getvalue().encode()
+        else:
+            yield "".join(
+                json.dumps({field: record[field] for field in fields}, default=str) + "\n"
+                for record in records
+            ).encode()
+        await asyncio.sleep(0)
+
+
+async def run(base_url: str, pid: int, args) -> dict:
+    import aiohttp
+
+    report = {"startup_mib": peak_rss_mib(pid)}
+    content_type = "text/csv" if args.format == "csv" else "application/x-ndjson"
+
+    timeout = aiohttp.ClientTimeout(total=None)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        started = time.perf_counter()
+        async with session.post(
+            f"{base_url}/api/reminders/import",
+            params={"chunk_size": args.chunk_size},
+            data=generate(args.rows, args.format),
+            headers={"Content-Type": content_type},
+        ) as response:
+            result = await response.json()
+            assert response.status == 200, result
+        report["import_seconds"] = time.perf_counter() - started
+        report["created"] = result["created"]
+        report["failed"] = result["failed"]
+        report["import_mib"] = peak_rss_mib(pid)
+
+        for format in ("csv", "ndjson"):
+            started = time.perf_counter()
+            lines = size = 0
+            async with session.get(f"{base_url}/api/reminders/export", params={"format": format}) as response:
+                async for line in response.content:
+                    lines += 1
+                    size += len(line)
+            report[f"export_{format}"] = {
+                "rows": lines - (format == "csv"),
+                "seconds": time.perf_counter() - started,
+                "mib": size / 1024 / 1024,
+            }
+        report["export_mib"] = peak_rss_mib(pid)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv", help="import format")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows per import transaction")
+    parser.add_argument("--backend", default="tick", help="SCHEDULER_BACKEND of the server")
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    from benchmarks._server import ApiProcess
+
+    workdir = tempfile.mkdtemp(prefix="bench-import-")
+    api = ApiProcess({
+        "DATABASE_URL": f"sqlite:///{workdir}/reminders.db",
+        "SCHEDULER_BACKEND": args.backend,
+        "LOG_LEVEL": "WARNING",
+    }, workdir)
+    with api as base_url:
+        report = asyncio.run(run(base_url, api.pid, args))
+
+    print(f"{args.rows:,} reminders, {args.format} import, chunks of {args.chunk_size}, {args.backend} backend")
+    print(f"import:  {report['created']:,} created, {report['failed']:,} failed in "
+          f"{report['import_seconds']:.1f}s ({report['created'] / report['import_seconds']:,.0f} rows/s)")
+    for format in ("csv", "ndjson"):
+        export = report[f"export_{format}"]
+        print(f"export {format:<7} {export['rows']:,} rows, {export['mib']:.0f} MiB in {export['seconds']:.1f}s "
+              f"({export['rows'] / export['seconds']:,.0f} rows/s)")
+    print(f"server peak RSS: {report['startup_mib']:.0f} MiB at startup, {report['import_mib']:.0f} MiB "
+          f"after import, {report['export_mib']:.0f} MiB after exports")
+
+
+if __name__ == "__main__":
+    main()
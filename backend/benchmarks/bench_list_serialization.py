@@ -0,0 +1,138 @@
+"""
+Benchmark: list page serialization (LIST_ENCODER=pydantic vs orjson).
+
+Seeds --rows reminders, serves the app with the response cache off and
+GETs /api/reminders/?limit=--limit pages at random depths from --clients
+clients. Each encoder runs in its own process on the same database.
+Also times a full NDJSON export (Accept: application/x-ndjson), which
+always uses orjson.
+
+Usage (from backend/):
+    python -m benchmarks.bench_list_serialization --rows 50000 --limit 1000
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float("nan")
+
+
+async def drive(base_url: str, args) -> dict:
+    import aiohttp
+
+    rng = random.Random(0)
+    remaining = iter(range(args.requests))
+    latencies = []
+    sizes = []
+
+    async def client(session):
+        for _ in remaining:
+            skip = rng.randrange(0, max(1, args.rows - args.limit))
+            started = time.perf_counter()
+            async with session.get(f"{base_url}/api/reminders/",
+                                   params={"limit": args.limit, "skip": skip}) as response:
+                body = await response.read()
+                assert response.status == 200, body[:200]
+            latencies.append(time.perf_counter() - started)
+            sizes.append(len(body))
+
+    async with aiohttp.ClientSession() as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(args.clients)))
+        elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        async with session.get(f"{base_url}/api/reminders/",
+                               headers={"Accept": "application/x-ndjson"}) as response:
+            lines = 0
+            async for _ in response.content:
+                lines += 1
+            export = (lines, time.perf_counter() - started)
+
+    return {
+        "pages_per_second": args.requests / elapsed,
+        "p50": percentile(latencies, 0.5),
+        "p99": percentile(latencies, 0.99),
+        "bytes": sum(sizes) / len(sizes),
+        "export": export,
+    }
+
+
+def child(encoder: str, database: str, args, results):
+    workdir = tempfile.mkdtemp(prefix=f"bench-list-{encoder}-")
+    shutil.copy(database, f"{workdir}/reminders.db")
+    os.chdir(workdir)
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{workdir}/reminders.db",
+        SCHEDULER_BACKEND="heap",
+        LIST_ENCODER=encoder,
+        CACHE_TTL="0",
+        LOG_LEVEL="WARNING",
+    )
+
+    from app.main import app
+    from benchmarks._server import serve
+
+    with serve(app) as base_url:
+        results.put(dict(asyncio.run(drive(base_url, args)), encoder=encoder))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--encoders", default="pydantic,orjson")
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    # Seed once in a child, then copy the file for each encoder
+    seed_dir = tempfile.mkdtemp(prefix="bench-list-seed-")
+    database = f"{seed_dir}/reminders.db"
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(target=_seed, args=(database, args.rows))
+    process.start()
+    process.join()
+
+    reports = []
+    for encoder in args.encoders.split(","):
+        results = context.Queue()
+        process = context.Process(target=child, args=(encoder, database, args, results))
+        process.start()
+        reports.append(results.get())
+        process.join()
+
+    print(f"{args.rows} reminders, pages of {args.limit}, {args.clients} clients, cache off")
+    print(f"{'encoder':<10} {'pages/s':>8} {'p50':>8} {'p99':>8} {'KiB/page':>9} {'NDJSON export':>16}")
+    for report in reports:
+        export = report["export"]
+        shown = f"{export[0] / export[1]:,.0f} rows/s"
+        print(f"{report['encoder']:<10} {report['pages_per_second']:>8.1f} "
+              f"{report['p50'] * 1000:>6.1f}ms {report['p99'] * 1000:>6.1f}ms "
+              f"{report['bytes'] / 1024:>9.1f} {shown:>16}")
+
+
+def _seed(database: str, rows: int):
+    os.environ.update(DATABASE_URL=f"sqlite:///{database}", LOG_LEVEL="WARNING")
+    os.chdir(os.path.dirname(database))
+    from benchmarks._data import seed_reminders
+
+    seed_reminders(rows, datetime.utcnow() + timedelta(days=1), spread=rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: add / reschedule / cancel cost per scheduler backend.
+
+The APScheduler backend writes every operation to its SQLite job store,
+so it is measured at a smaller size; the heap backend is measured at the
+full pending count (1M by default).
+
+Usage (from backend/):
+    python -m benchmarks.bench_scheduler_backends --pending 1000000 --apscheduler-pending 5000
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def noop(reminder_id):
+    pass
+
+
+def run(backend, pending: int) -> dict:
+    base = datetime.utcnow() + timedelta(days=1)
+    backend.start()
+
+    results = {}
+    try:
+        start = time.perf_counter()
+        for i in range(pending):
+            backend.add(i, base + timedelta(seconds=i))
+        results["add"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(pending):
+            backend.reschedule(i, base + timedelta(seconds=pending - i))
+        results["reschedule"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(pending):
+            backend.remove(i)
+        results["cancel"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        backend.add_many((i, base + timedelta(seconds=i)) for i in range(pending))
+        results["add_many"] = time.perf_counter() - start
+    finally:
+        backend.shutdown()
+
+    return results
+
+
+def report(name: str, pending: int, results: dict):
+    print(f"{name} ({pending:,} pending)")
+    for op, seconds in results.items():
+        print(f"  {op:<11} {seconds:8.2f}s  {seconds / pending * 1e6:9.1f} us/op  {pending / seconds:12,.0f} ops/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pending", type=int, default=1_000_000)
+    parser.add_argument("--apscheduler-pending", type=int, default=5000)
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+    workdir = tempfile.mkdtemp(prefix="bench-sched-")
+
+    from app.database import create_db_engine
+    from app.scheduler_backends import APSchedulerBackend, HeapBackend
+
+    aps = APSchedulerBackend(noop, create_db_engine(f"sqlite:///{workdir}/scheduler_jobs.db"))
+    report("apscheduler", args.apscheduler_pending, run(aps, args.apscheduler_pending))
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    heap = HeapBackend(noop)
+    report("heap", args.pending, run(heap, args.pending))
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"  peak RSS growth: {(rss_after - rss_before) / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Benchmark: write and dispatch throughput with 1 vs N reminder databases.
+
+Each configuration runs against fresh SQLite files (SHARD_DATABASE_URLS
+for the shards after the first):
+
+- writes: --writers processes each create --writes reminders, one
+  transaction per reminder like POST /api/reminders/ (routed to the shard
+  of its phone number), all at once; reports reminders/s and commit
+  latency. With one file every writer queues for the same write lock.
+- dispatch: --reminders reminders over as many numbers, all due at the
+  same moment, fired by the scheduler (one partition per shard) at a
+  stand-in Twilio server; reports how long until every call result is
+  stored, and calls/s.
+
+Usage (from backend/):
+    python -m benchmarks.bench_sharding --shards 1 4 --writers 8 --reminders 20000
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def environment(workdir: str, shards: int, **extra) -> dict:
+    return {
+        "SQLITE_SYNCHRONOUS": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "DATABASE_URL": f"sqlite:///{workdir}/reminders_0.db",
+        "SHARD_DATABASE_URLS": ",".join(f"sqlite:///{workdir}/reminders_{i}.db" for i in range(1, shards)),
+        "LOG_LEVEL": "WARNING",
+        **extra,
+    }
+
+
+def writer(workdir: str, shards: int, index: int, writes: int, ready, results):
+    """Create ``writes`` reminders one transaction at a time; put (start, end, latencies) on ``results``."""
+    os.environ.update(environment(workdir, shards))
+    from app.database import shard_for_phone
+    from app.models import Reminder
+
+    due = datetime.utcnow() + timedelta(days=1)
+    latencies = []
+    ready.wait()
+    start = time.time()
+
+    for i in range(writes):
+        phone = f"+1415{index:03d}{i:04d}"
+        started = time.perf_counter()
+        with shard_for_phone(phone).SessionLocal() as db:
+            db.add(Reminder(title=f"Shard {i}", message="Sharding benchmark reminder", phone_number=phone,
+                            scheduled_time=due, timezone="UTC", status="scheduled"))
+            db.commit()
+        latencies.append(time.perf_counter() - started)
+
+    results.put((start, time.time(), latencies))
+
+
+def measure_writes(shards: int, args, context) -> dict:
+    workdir = tempfile.mkdtemp(prefix=f"bench-sharding-writes-{shards}-", dir=args.dir)
+    os.environ.update(environment(workdir, shards))
+    from app.database import init_db
+    init_db()
+
+    results = context.Queue()
+    ready = context.Barrier(args.writers)
+    processes = [
+        context.Process(target=writer, args=(workdir, shards, index, args.writes, ready, results))
+        for index in range(args.writers)
+    ]
+    for process in processes:
+        process.start()
+    runs = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    elapsed = max(end for _, end, _ in runs) - min(start for start, _, _ in runs)
+    latencies = [latency for _, _, run in runs for latency in run]
+
+    latencies.sort()
+    return {
+        "rate": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def dispatcher(shards: int, args, twilio_url: str, results):
+    """Fire every reminder under one shard count; put the drain time on ``results``."""
+    workdir = tempfile.mkdtemp(prefix=f"bench-sharding-dispatch-{shards}-", dir=args.dir)
+    os.chdir(workdir)
+    os.environ.update(environment(
+        workdir, shards,
+        SCHEDULER_BACKEND=args.backend,
+        TWILIO_ACCOUNT_SID="ACbench",
+        TWILIO_AUTH_TOKEN="bench",
+        TWILIO_PHONE_NUMBER="+15005550006",
+        TWILIO_API_BASE_URL=twilio_url,
+        TWILIO_CALLS_PER_SECOND="100000",
+        MISSED_GRACE_SECONDS="3600",
+    ))
+    sys.stdout = open(os.devnull, "w")
+
+    from sqlalchemy import func, insert, select
+    from app.database import init_db, shard_for_phone
+    from app.models import Reminder
+    from app import scheduler
+
+    init_db()
+    due = time.time() + args.lead
+    groups = {}
+    for i in range(args.reminders):
+        phone = f"+1415{i:07d}"
+        groups.setdefault(shard_for_phone(phone), []).append({
+            "title": f"Dispatch {i}",
+            "message": "Sharding benchmark reminder",
+            "phone_number": phone,
+            "scheduled_time": datetime.utcfromtimestamp(due),
+            "timezone": "UTC",
+            "status": "scheduled",
+        })
+    for shard, rows in groups.items():
+        with shard.SessionLocal() as db:
+            db.execute(insert(Reminder), rows)
+            db.commit()
+
+    scheduler.start_scheduler()
+
+    def pending() -> int:
+        total = 0
+        for partition in scheduler.partitions:
+            with partition.shard.SessionLocal() as db:
+                total += db.scalar(
+                    select(func.count()).select_from(Reminder).where(Reminder.status != "completed")
+                )
+        return total
+
+    time.sleep(max(0, due - time.time()))
+    while pending() and time.time() < due + args.timeout:
+        time.sleep(0.1)
+    drained = time.time() - due
+
+    left = pending()
+    scheduler.stop_scheduler()
+    results.put({"seconds": drained, "pending": left})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--writers", type=int, default=8, help="writer processes")
+    parser.add_argument("--writes", type=int, default=2000, help="reminders per writer")
+    parser.add_argument("--reminders", type=int, default=20000, help="reminders dispatched")
+    parser.add_argument("--backend", default="tick")
+    parser.add_argument("--lead", type=float, default=10, help="seconds from startup to the due time")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--synchronous", default="NORMAL",
+                        help="SQLITE_SYNCHRONOUS; FULL fsyncs every commit while holding the write lock")
+    parser.add_argument("--dir", help="where the database files go (default: the temp dir)")
+    args = parser.parse_args()
+    os.environ["SQLITE_SYNCHRONOUS"] = args.synchronous
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from benchmarks._server import fake_twilio
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{args.writers} writers x {args.writes} single-row creates; "
+          f"{args.reminders} reminders due at once ({args.backend} backend, synchronous={args.synchronous}, "
+          f"{os.cpu_count()} CPU)")
+    print(f"{'shards':>6} {'creates/s':>10} {'p50 ms':>7} {'p99 ms':>7} {'dispatch s':>11} {'calls/s':>8}")
+
+    with fake_twilio() as twilio_url:
+        for shards in args.shards:
+            # Writers run in a child so each configuration imports app fresh
+            writes = context.Queue()
+            process = context.Process(target=_writes_child, args=(shards, args, writes))
+            process.start()
+            write = writes.get()
+            process.join()
+
+            results = context.Queue()
+            process = context.Process(target=dispatcher, args=(shards, args, twilio_url, results))
+            process.start()
+            dispatch = results.get()
+            process.join()
+
+            print(f"{shards:>6} {write['rate']:>10,.0f} {write['p50_ms']:>7.2f} {write['p99_ms']:>7.1f} "
+                  f"{dispatch['seconds']:>11.1f} {args.reminders / dispatch['seconds']:>8,.0f}"
+                  + (f"  ({dispatch['pending']} not recorded)" if dispatch["pending"] else ""))
+
+
+def _writes_child(shards: int, args, results):
+    results.put(measure_writes(shards, args, multiprocessing.get_context("spawn")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: startup reload time for N pending reminders.
+
+Seeds a throwaway SQLite database with N scheduled reminders (plus a few
+past-due ones), then times reload_scheduled_jobs() against a cold
+scheduler backend and reports peak memory growth.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup_reload --rows 100000 --backend heap
+    python -m benchmarks.bench_startup_reload --rows 1000000 --backend apscheduler
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--backend", choices=["heap", "apscheduler"], default="heap")
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    workdir = tempfile.mkdtemp(prefix="bench-reload-")
+    os.chdir(workdir)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/reminders.db"
+    os.environ["SCHEDULER_BACKEND"] = args.backend
+
+    from sqlalchemy import insert
+    from app.database import SessionLocal, init_db
+    from app.models import Reminder
+
+    init_db()
+    base = datetime.utcnow() + timedelta(days=1)
+    db = SessionLocal()
+    for start in range(0, args.rows, 5000):
+        db.execute(insert(Reminder), [
+            {
+                "title": f"Reminder {i}",
+                "message": f"This is benchmark reminder number {i}",
+                "phone_number": f"+1415555{i % 10000:04d}",
+                "scheduled_time": base + timedelta(seconds=i),
+                "timezone": "UTC",
+                "status": "scheduled",
+            }
+            for i in range(start, min(start + 5000, args.rows))
+        ])
+    db.commit()
+    db.close()
+
+    from app import scheduler
+
+    scheduler.backend.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    scheduler.reload_scheduled_jobs()
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    pending = scheduler.backend.pending_count()
+
+    # Second pass: everything is already registered
+    start = time.perf_counter()
+    scheduler.reload_scheduled_jobs()
+    warm = time.perf_counter() - start
+    scheduler.backend.shutdown()
+
+    print(f"backend:      {args.backend}")
+    print(f"rows:         {args.rows:,}")
+    print(f"registered:   {pending:,}")
+    print(f"reload time:  {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)")
+    print(f"warm reload:  {warm:.2f}s")
+    print(f"peak RSS +:   {(rss_after - rss_before) / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: batched ingestion of Twilio status callbacks.
+
+Seeds --calls reminders that are mid-call (status "calling" with a call
+SID), then POSTs the rest of each call's lifecycle (ringing, in-progress,
+completed) to /api/twilio/status from --clients concurrent clients, in
+random order across calls, the way a burst of calls reports back.
+Reports callbacks per second, how many transactions they cost (applying
+each callback on its own would cost one per callback) and how long until
+every reminder is final.
+
+Usage (from backend/):
+    python -m benchmarks.bench_status_callbacks --calls 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+async def post_callbacks(base_url: str, callbacks: list, clients: int):
+    import aiohttp
+
+    pending = iter(callbacks)
+
+    async def client(session):
+        for call_sid, call_status in pending:
+            async with session.post(
+                f"{base_url}/api/twilio/status",
+                data={"CallSid": call_sid, "CallStatus": call_status},
+            ) as response:
+                assert response.status == 204, await response.text()
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=clients)) as session:
+        await asyncio.gather(*(client(session) for _ in range(clients)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=50)
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    workdir = tempfile.mkdtemp(prefix="bench-callbacks-")
+    os.chdir(workdir)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/reminders.db"
+    os.environ["SCHEDULER_BACKEND"] = "heap"
+    os.environ["TWILIO_VALIDATE_SIGNATURE"] = "false"
+
+    from sqlalchemy import func, insert, select
+    from app.call_status import status_ingestor
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models import Reminder
+    from benchmarks._server import serve
+
+    when = datetime.utcnow() + timedelta(days=1)
+    with SessionLocal() as db:
+        db.execute(insert(Reminder), [
+            {
+                "title": f"Call {i}",
+                "message": "Status callback benchmark reminder",
+                "phone_number": "+14155550100",
+                "scheduled_time": when,
+                "timezone": "UTC",
+                "status": "calling",
+                "call_sid": f"CA{i:032d}",
+            }
+            for i in range(args.calls)
+        ])
+        db.commit()
+
+    # Each call reports in order, but calls interleave
+    callbacks = []
+    lifecycles = [
+        [(f"CA{i:032d}", s) for s in ("ringing", "in-progress", "completed")]
+        for i in range(args.calls)
+    ]
+    rng = random.Random(0)
+    while lifecycles:
+        index = rng.randrange(len(lifecycles))
+        callbacks.append(lifecycles[index].pop(0))
+        if not lifecycles[index]:
+            lifecycles[index] = lifecycles[-1]
+            lifecycles.pop()
+
+    with serve(app) as base_url:
+        started = time.perf_counter()
+        asyncio.run(post_callbacks(base_url, callbacks, args.clients))
+        posted = time.perf_counter() - started
+
+        with SessionLocal() as db:
+            while db.scalar(select(func.count()).where(Reminder.status != "completed")):
+                time.sleep(0.05)
+        settled = time.perf_counter() - started
+        stats = status_ingestor.stats()
+
+    print(f"{len(callbacks)} callbacks for {args.calls} calls "
+          f"(batch size {status_ingestor.batch_size}, flush every {status_ingestor.flush_seconds}s)")
+    print(f"posted in {posted:.2f}s ({len(callbacks) / posted:.0f} callbacks/s), "
+          f"all completed after {settled:.2f}s")
+    print(f"{stats['flushes']} transactions, {stats['applied']} row updates, "
+          f"{stats['coalesced']} coalesced, {stats['stale']} stale")
+
+
+if __name__ == "__main__":
+    main()
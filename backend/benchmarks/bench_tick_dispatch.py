@@ -0,0 +1,165 @@
+"""
+Benchmark: per-reminder jobs vs fire-time batching (SCHEDULER_BACKEND=tick).
+
+Seeds --reminders reminders due within the same --spread seconds and lets
+each scheduler backend fire them at a stand-in Twilio server. Each
+backend runs in its own process against a fresh SQLite database.
+Reports:
+
+- database round-trips (statements, including the APScheduler job store)
+  and transactions from the first due time until every result is stored
+- end-to-end lag: when the call reached Twilio minus when it was due
+- how long after the last due time every result was written
+
+Usage (from backend/):
+    python -m benchmarks.bench_tick_dispatch --reminders 10000 --spread 60
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+
+def message_for(index: int) -> str:
+    return f"Tick benchmark reminder {index}"
+
+
+def child(backend_name: str, args, twilio_url: str, start: float, results):
+    """Run one backend until every reminder is recorded; put counters on ``results``."""
+    workdir = tempfile.mkdtemp(prefix=f"bench-tick-{backend_name}-")
+    os.chdir(workdir)
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{workdir}/reminders.db",
+        SCHEDULER_BACKEND=backend_name,
+        TWILIO_ACCOUNT_SID="ACbench",
+        TWILIO_AUTH_TOKEN="bench",
+        TWILIO_PHONE_NUMBER="+15005550006",
+        TWILIO_API_BASE_URL=twilio_url,
+        TWILIO_CALLS_PER_SECOND="100000",
+        MISSED_GRACE_SECONDS="3600",
+    )
+    sys.stdout = open(os.devnull, "w")
+
+    from sqlalchemy import create_engine, event, func, insert, select
+    from app.database import SessionLocal, engine, init_db
+    from app.models import Reminder
+    from app import scheduler
+
+    init_db()
+    with SessionLocal() as db:
+        db.execute(insert(Reminder), [
+            {
+                "title": f"Tick {i}",
+                "message": message_for(i),
+                "phone_number": "+14155550100",
+                "scheduled_time": datetime.utcfromtimestamp(start + i * args.spread / args.reminders),
+                "timezone": "UTC",
+                "status": "scheduled",
+            }
+            for i in range(args.reminders)
+        ])
+        db.commit()
+
+    scheduler.start_scheduler()
+
+    counters = {"statements": 0, "transactions": 0}
+    engines = {engine}
+    if hasattr(scheduler.backend, "jobstore"):
+        engines.add(scheduler.backend.jobstore.engine)
+
+    def count_statement(*_):
+        counters["statements"] += 1
+
+    def count_transaction(*_):
+        counters["transactions"] += 1
+
+    # Count from the first due time on; the startup reload is not part of it
+    time.sleep(max(0, start - time.time()))
+    for counted in engines:
+        event.listen(counted, "before_cursor_execute", count_statement)
+        event.listen(counted, "commit", count_transaction)
+
+    # Polled on a separate engine, so the polling is not counted
+    probe = create_engine(os.environ["DATABASE_URL"])
+    deadline = time.time() + args.spread + args.timeout
+    with probe.connect() as connection:
+        while time.time() < deadline:
+            pending = connection.scalar(
+                select(func.count()).select_from(Reminder).where(Reminder.status != "completed")
+            )
+            connection.rollback()
+            if not pending:
+                break
+            time.sleep(0.05)
+    recorded_at = time.time()
+
+    for counted in engines:
+        event.remove(counted, "before_cursor_execute", count_statement)
+        event.remove(counted, "commit", count_transaction)
+    scheduler.stop_scheduler()
+
+    results.put(dict(counters, backend=backend_name, recorded_at=recorded_at, pending=pending))
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reminders", type=int, default=10000)
+    parser.add_argument("--spread", type=float, default=60, help="seconds the due times are spread over")
+    parser.add_argument("--lead", type=float, default=10, help="seconds from startup to the first due time")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--backends", default="apscheduler,heap,tick")
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    from benchmarks._server import fake_twilio
+
+    context = multiprocessing.get_context("spawn")
+    reports = []
+    arrivals = {}
+
+    with fake_twilio(arrivals=arrivals) as twilio_url:
+        for backend_name in args.backends.split(","):
+            arrivals.clear()
+            start = time.time() + args.lead
+            queue = context.Queue()
+            process = context.Process(target=child, args=(backend_name, args, twilio_url, start, queue))
+            process.start()
+            result = queue.get()
+            process.join()
+
+            lags = [
+                arrivals[message_for(i)] - (start + i * args.spread / args.reminders)
+                for i in range(args.reminders)
+                if message_for(i) in arrivals
+            ]
+            result.update(
+                lags=lags,
+                settled=result["recorded_at"] - (start + args.spread),
+            )
+            reports.append(result)
+
+    print(f"{args.reminders} reminders due within {args.spread:.0f}s")
+    print(f"{'backend':<12} {'statements':>10} {'per call':>9} {'txns':>7} "
+          f"{'lag p50':>8} {'p99':>7} {'max':>7} {'stored +':>9}")
+    for report in reports:
+        lags = report["lags"]
+        print(f"{report['backend']:<12} {report['statements']:>10} "
+              f"{report['statements'] / args.reminders:>9.2f} {report['transactions']:>7} "
+              f"{percentile(lags, 0.5):>7.2f}s {percentile(lags, 0.99):>6.2f}s "
+              f"{max(lags, default=float('nan')):>6.2f}s {report['settled']:>8.2f}s"
+              + (f"  ({report['pending']} not recorded)" if report["pending"] else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: per-request cost of validating a reminder's scheduled_time.
+
+Validates --requests ReminderCreate payloads spread over --zones IANA
+zones, half with naive wall-clock times and half with UTC offsets, two
+ways:
+
+- ``pytz``: the previous validator, which looked the zone up with
+  pytz.timezone() and localized on every request
+- ``zoneinfo``: the current one (cached ZoneInfo, stored as naive UTC)
+
+and also times the bare zone lookup and conversion for each. No server
+or database is involved.
+
+Usage (from backend/):
+    python -m benchmarks.bench_validation --requests 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+
+def legacy_model():
+    """ReminderCreate as it was validated before UTC storage."""
+    import pytz
+    from pydantic import validator
+
+    from app.schemas import ReminderBase
+
+    class LegacyReminderCreate(ReminderBase):
+        @validator("scheduled_time")
+        def scheduled_time_must_be_future(cls, reminder_datetime, values):
+            tz_name = values.get("timezone")
+            if not tz_name:
+                raise ValueError("Timezone must be provided")
+            try:
+                tz = pytz.timezone(tz_name)
+            except Exception:
+                raise ValueError(f"Invalid timezone: {tz_name}")
+            if reminder_datetime.tzinfo is None:
+                reminder_datetime = tz.localize(reminder_datetime)
+            else:
+                reminder_datetime = reminder_datetime.astimezone(tz)
+            if reminder_datetime <= datetime.now(tz):
+                raise ValueError("Scheduled time must be in the future")
+            return reminder_datetime
+
+    return LegacyReminderCreate
+
+
+def payloads(count: int, zones: list) -> list:
+    due = datetime.now() + timedelta(days=2)
+    return [
+        {
+            "title": f"Reminder {i}",
+            "message": f"This is benchmark reminder number {i}",
+            "phone_number": f"+1415555{i % 10000:04d}",
+            "timezone": zones[i % len(zones)],
+            "scheduled_time": (due + timedelta(seconds=i)).isoformat() + ("Z" if i % 2 else ""),
+        }
+        for i in range(count)
+    ]
+
+
+def per_call_us(function, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        function(item)
+    return (time.perf_counter() - started) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--zones", type=int, default=50, help="distinct zones in the mix")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    import pytz
+
+    from app.schemas import ReminderCreate
+    from app.timezones import get_zone, to_utc
+
+    zones = sorted(zone for zone in pytz.common_timezones if "/" in zone)[::7][:args.zones]
+    items = payloads(args.requests, zones)
+    legacy = legacy_model()
+    naive = datetime.now() + timedelta(days=2)
+    names = [item["timezone"] for item in items]
+
+    rows = [
+        ("zone lookup + localize", "pytz",
+         per_call_us(lambda name: pytz.timezone(name).localize(naive), names)),
+        ("zone lookup + to UTC", "zoneinfo",
+         per_call_us(lambda name: to_utc(naive, name), names)),
+        ("ReminderCreate", "pytz", per_call_us(legacy.model_validate, items)),
+        ("ReminderCreate", "zoneinfo", per_call_us(ReminderCreate.model_validate, items)),
+    ]
+
+    print(f"{args.requests:,} payloads over {len(zones)} zones "
+          f"(zone cache: {get_zone.cache_info().currsize} entries)")
+    print(f"{'step':<24} {'zones':<9} {'us/request':>10}")
+    for step, library, cost in rows:
+        print(f"{step:<24} {library:<9} {cost:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Benchmark: API latency while a burst of reminders fires.
+
+Seeds --reminders reminders due at the same moment and measures
+GET /api/reminders/ latency from --clients concurrent clients before and
+during the burst, in two setups:
+
+- api:    one uvicorn process that also runs the scheduler (default)
+- worker: SCHEDULER_MODE=worker, uvicorn plus python -m app.worker
+
+Both talk to a stand-in Twilio server (TWILIO_API_BASE_URL). The
+response cache is off so every request reads the database.
+
+Usage (from backend/):
+    python -m benchmarks.bench_worker_split --reminders 5000
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float("nan")
+
+
+async def measure(base_url: str, clients: int, until) -> list:
+    """GET the first page from ``clients`` clients until ``until()``; (time, latency) pairs."""
+    import aiohttp
+
+    samples = []
+
+    async def client(session):
+        while not until():
+            started = time.perf_counter()
+            async with session.get(f"{base_url}/api/reminders/?limit=20") as response:
+                await response.read()
+                assert response.status == 200, await response.text()
+            samples.append((time.time(), time.perf_counter() - started))
+
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(client(session) for _ in range(clients)))
+    return samples
+
+
+def run(mode: str, args, twilio_url: str, backend_dir: str) -> dict:
+    from benchmarks._server import free_port
+
+    workdir = tempfile.mkdtemp(prefix=f"bench-worker-{mode}-")
+    database_url = f"sqlite:///{workdir}/reminders.db"
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        SCHEDULER_BACKEND="heap",
+        SCHEDULER_MODE=mode,
+        CACHE_TTL="0",
+        TWILIO_ACCOUNT_SID="ACbench",
+        TWILIO_AUTH_TOKEN="bench",
+        TWILIO_PHONE_NUMBER="+15005550006",
+        TWILIO_API_BASE_URL=twilio_url,
+        TWILIO_CALLS_PER_SECOND="100000",
+        TWILIO_VALIDATE_SIGNATURE="false",
+        MISSED_GRACE_SECONDS="3600",
+    )
+
+    # Seed from a child so this process keeps no engine on the file
+    due = datetime.utcnow() + timedelta(seconds=args.lead)
+    due_at = due.replace(tzinfo=timezone.utc).timestamp()
+    subprocess.run([sys.executable, "-c", f"""
+from datetime import datetime
+from sqlalchemy import insert
+from app.database import SessionLocal, init_db
+from app.models import Reminder
+init_db()
+with SessionLocal() as db:
+    db.execute(insert(Reminder), [
+        {{"title": f"Burst {{i}}", "message": f"Burst reminder {{i}}", "phone_number": "+14155550100",
+          "scheduled_time": datetime.fromisoformat({due.isoformat()!r}), "timezone": "UTC",
+          "status": "scheduled"}}
+        for i in range({args.reminders})
+    ])
+    db.commit()
+"""], cwd=backend_dir, env=env, check=True)
+
+    port = free_port()
+    quiet = dict(stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=backend_dir, env=env)
+    processes = [subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        **quiet,
+    )]
+    if mode == "worker":
+        processes.append(subprocess.Popen([sys.executable, "-m", "app.worker"], **quiet))
+
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        import urllib.request
+        while True:
+            try:
+                urllib.request.urlopen(f"{base_url}/health")
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        from sqlalchemy import create_engine, func, select
+        from app.models import Reminder
+        probe = create_engine(database_url)
+
+        def pending() -> int:
+            with probe.connect() as connection:
+                return connection.scalar(
+                    select(func.count()).select_from(Reminder).where(Reminder.status == "scheduled")
+                )
+
+        # Sample until the burst has been placed (checked every 0.25s)
+        state = {"done": False, "checked": 0.0, "finished": None}
+
+        def until() -> bool:
+            now = time.time()
+            if now > due_at and now - state["checked"] > 0.25:
+                state["checked"] = now
+                if not pending():
+                    state["finished"] = state["finished"] or now
+                    state["done"] = now - state["finished"] > 1
+            return state["done"] or now > due_at + args.timeout
+
+        samples = asyncio.run(measure(base_url, args.clients, until))
+        probe.dispose()
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    burst_end = state["finished"] or due_at + args.timeout
+    before = [latency for at, latency in samples if at < due_at]
+    during = [latency for at, latency in samples if due_at <= at <= burst_end]
+    return {
+        "mode": mode,
+        "burst_seconds": burst_end - due_at,
+        "before": before,
+        "during": during,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reminders", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--lead", type=float, default=5, help="seconds of baseline before the burst")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--modes", default="api,worker")
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    from benchmarks._server import fake_twilio
+
+    results = []
+    with fake_twilio() as twilio_url:
+        for mode in args.modes.split(","):
+            results.append(run(mode, args, twilio_url, backend_dir))
+
+    print(f"{args.reminders} reminders firing at once, {args.clients} clients on GET /api/reminders/")
+    print(f"{'mode':<8} {'burst s':>8} {'before p50':>11} {'p99':>8} {'during p50':>11} {'p99':>8} {'max':>8}")
+    for result in results:
+        before, during = result["before"], result["during"]
+        print(f"{result['mode']:<8} {result['burst_seconds']:>8.2f} "
+              f"{percentile(before, 0.5) * 1000:>9.1f}ms {percentile(before, 0.99) * 1000:>6.1f}ms "
+              f"{percentile(during, 0.5) * 1000:>9.1f}ms {percentile(during, 0.99) * 1000:>6.1f}ms "
+              f"{max(during, default=float('nan')) * 1000:>6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
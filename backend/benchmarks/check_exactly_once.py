@@ -0,0 +1,177 @@
+"""
+Check: several scheduler processes never call the same reminder twice.
+
+Starts --workers processes that each run the scheduler against one
+database, and a stand-in Twilio server that counts calls per reminder.
+With the heap backend (default) every process loads and fires every
+reminder; with --backend tick every process claims due rows in batches.
+--reminders all come due at once; the claim must let exactly one process
+call each of them.
+
+With --kill (default), the first worker is paced slowly so it holds many
+claimed-but-unsent calls, and is SIGKILLed right after the reminders come
+due. Its leases must lapse and the survivors must call those reminders.
+A reminder may be called twice only if the dead worker's call was already
+in flight when it died; anything else is a failure.
+
+Exits non-zero if any reminder was missed or called twice outside that
+window.
+
+Usage (from backend/):
+    python -m benchmarks.check_exactly_once --workers 4 --reminders 500
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+
+def worker(env: dict, ready):
+    """Run the scheduler in this process until SIGTERM."""
+    os.environ.update(env)
+    sys.stdout = open(os.devnull, "w")
+
+    from app.scheduler import start_scheduler, stop_scheduler
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    start_scheduler()
+    ready.put(env["WORKER_ID"])
+    stop.wait()
+    stop_scheduler()
+
+
+def run(args, env: dict) -> tuple:
+    """
+    Seed reminders, run the workers until every reminder is completed.
+
+    Returns:
+        (reminder ids, ids the killed worker held when it died)
+    """
+    os.environ.update(env)
+
+    from sqlalchemy import func, insert, select
+    from app.database import SessionLocal, init_db
+    from app.models import Reminder
+
+    init_db()
+    due = datetime.utcnow() + timedelta(seconds=5 + args.workers)
+    with SessionLocal() as db:
+        db.execute(insert(Reminder), [
+            {
+                "id": i,
+                "title": f"Reminder {i}",
+                "message": f"Exactly-once check {i}",
+                "phone_number": "+14155550100",
+                "scheduled_time": due,
+                "timezone": "UTC",
+                "status": "scheduled",
+            }
+            for i in range(1, args.reminders + 1)
+        ])
+        db.commit()
+        ids = list(db.scalars(select(Reminder.id)))
+
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    processes = []
+    for index in range(args.workers):
+        worker_env = dict(env, WORKER_ID=f"worker-{index}")
+        if args.kill and index == 0:
+            # The victim sends slowly, so it dies holding claimed reminders
+            worker_env["TWILIO_CALLS_PER_SECOND"] = "5"
+        process = context.Process(target=worker, args=(worker_env, ready))
+        process.start()
+        processes.append(process)
+
+    for _ in processes:
+        ready.get()
+    print(f"{args.workers} workers running; {args.reminders} reminders due at {due:%H:%M:%S}")
+
+    at_risk = set()
+    if args.kill:
+        time.sleep(max(0, (due - datetime.utcnow()).total_seconds()) + 1)
+        os.kill(processes[0].pid, signal.SIGKILL)
+        processes[0].join()
+
+        with SessionLocal() as db:
+            at_risk = set(db.scalars(
+                select(Reminder.id).where(
+                    Reminder.claimed_by == "worker-0",
+                    Reminder.status.in_(("scheduled", "retrying")),
+                )
+            ))
+        print(f"killed worker-0 holding {len(at_risk)} claimed, unrecorded reminders")
+
+    deadline = time.monotonic() + args.timeout
+    with SessionLocal() as db:
+        while time.monotonic() < deadline:
+            pending = db.scalar(
+                select(func.count()).select_from(Reminder).where(Reminder.status != "completed")
+            )
+            if not pending:
+                break
+            time.sleep(0.2)
+
+    for process in processes[1:] if args.kill else processes:
+        process.terminate()
+        process.join()
+
+    return ids, at_risk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--reminders", type=int, default=500)
+    parser.add_argument("--backend", default="heap", help="SCHEDULER_BACKEND: heap or tick")
+    parser.add_argument("--no-kill", dest="kill", action="store_false")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    from benchmarks._server import fake_twilio
+
+    workdir = tempfile.mkdtemp(prefix="check-exactly-once-")
+    os.chdir(workdir)
+    env = {
+        "DATABASE_URL": f"sqlite:///{workdir}/reminders.db",
+        "SCHEDULER_BACKEND": args.backend,
+        "TWILIO_ACCOUNT_SID": "ACcheck",
+        "TWILIO_AUTH_TOKEN": "check",
+        "TWILIO_PHONE_NUMBER": "+15005550006",
+        "TWILIO_CALLS_PER_SECOND": "1000",
+        "LEASE_SECONDS": "3",
+        "HEARTBEAT_SECONDS": "0.5",
+        "MISSED_GRACE_SECONDS": "3600",
+    }
+    calls = Counter()
+    with fake_twilio(calls) as twilio_url:
+        env["TWILIO_API_BASE_URL"] = twilio_url
+        ids, at_risk = run(args, env)
+
+    missed = [rid for rid in ids if calls[f"Exactly-once check {rid}"] == 0]
+    duplicated = {rid for rid in ids if calls[f"Exactly-once check {rid}"] > 1}
+    unexplained = duplicated - at_risk
+
+    print(f"calls placed: {sum(calls.values())} for {len(ids)} reminders")
+    print(f"missed: {len(missed)}, called twice: {len(duplicated)} "
+          f"({len(duplicated & at_risk)} in flight on the killed worker, {len(unexplained)} unexplained)")
+
+    if missed or unexplained:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Run the stand-in Twilio server on its own, for manual load tests.
+
+Point the API or the worker at it instead of api.twilio.com:
+
+    python -m benchmarks.fake_twilio --port 8081 --latency 0.1 --error-rate 0.05
+    TWILIO_API_BASE_URL=http://127.0.0.1:8081 TWILIO_ACCOUNT_SID=ACtest \\
+        TWILIO_AUTH_TOKEN=test TWILIO_PHONE_NUMBER=+15005550006 uvicorn app.main:app
+
+Prints the number of calls received every --report seconds.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds before each response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls failing")
+    parser.add_argument("--error-code", type=int, default=20429, help="Twilio error code of failures")
+    parser.add_argument("--report", type=float, default=5, help="seconds between call counts")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from benchmarks._server import fake_twilio
+
+    calls = Counter()
+    with fake_twilio(calls=calls, port=args.port, latency=args.latency,
+                     error_rate=args.error_rate, error_code=args.error_code) as base_url:
+        print(f"Fake Twilio at {base_url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(args.report)
+                print(f"{sum(calls.values())} calls, {len(calls)} distinct messages")
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""
+Benchmark suite: the standard scenarios, offline, as machine-readable JSON.
+
+Every scenario runs against a fresh SQLite database in a temp directory,
+in its own process, and calls go to a local stand-in Twilio server
+(benchmarks/_server.py) with configurable latency and error rate:
+
+- crud:       concurrent clients creating, reading, updating and deleting
+              reminders over HTTP; throughput and latency per operation
+- pagination: --rows reminders listed page by page, with cursors and with
+              the legacy skip offset at increasing depth (cache off)
+- reload:     reload_scheduled_jobs() for --rows pending reminders, cold
+              and warm
+- burst:      --burst reminders due at the same moment; trigger lag (call
+              reached Twilio minus due time) and time until every first
+              attempt is recorded
+
+Results go to --out (JSON); pass a previous result as --baseline to print
+the change of every metric next to it.
+
+Usage (from backend/):
+    python -m benchmarks.suite --out baseline.json
+    python -m benchmarks.suite --out after.json --baseline baseline.json
+    python -m benchmarks.suite --scenarios burst --burst 5000 --twilio-error-rate 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+SCENARIOS = ("crud", "pagination", "reload", "burst")
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else None
+
+
+def latency_summary(seconds: list) -> dict:
+    """Count and p50/p99/max in milliseconds."""
+    return {
+        "count": len(seconds),
+        "p50_ms": _ms(percentile(seconds, 0.50)),
+        "p99_ms": _ms(percentile(seconds, 0.99)),
+        "max_ms": _ms(max(seconds, default=None)),
+    }
+
+
+def _ms(value):
+    return None if value is None else round(value * 1000, 3)
+
+
+def _environment(workdir: str, args, **extra) -> dict:
+    """Settings for a child process working in ``workdir``."""
+    return dict(
+        DATABASE_URL=f"sqlite:///{workdir}/reminders.db",
+        SCHEDULER_BACKEND=args.backend,
+        LOG_LEVEL="WARNING",
+        TWILIO_ACCOUNT_SID="ACbench",
+        TWILIO_AUTH_TOKEN="bench",
+        TWILIO_PHONE_NUMBER="+15005550006",
+        TWILIO_CALLS_PER_SECOND="100000",
+        TWILIO_VALIDATE_SIGNATURE="false",
+        MISSED_GRACE_SECONDS="3600",
+        **extra,
+    )
+
+
+def _enter(workdir: str, env: dict):
+    """Apply a child's settings before anything from app is imported."""
+    os.chdir(workdir)
+    os.environ.update(env)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# --- Child processes -------------------------------------------------------
+
+def _reload_child(workdir: str, env: dict, rows: int, results):
+    _enter(workdir, env)
+    from benchmarks._data import seed_reminders
+
+    started = time.perf_counter()
+    seed_reminders(rows, datetime.utcnow() + timedelta(days=1), spread=rows)
+    seeded = time.perf_counter() - started
+
+    from app import scheduler
+
+    scheduler.backend.start()
+    started = time.perf_counter()
+    scheduler.reload_scheduled_jobs()
+    cold = time.perf_counter() - started
+    registered = scheduler.pending_count()
+
+    started = time.perf_counter()
+    scheduler.reload_scheduled_jobs()
+    warm = time.perf_counter() - started
+    scheduler.backend.shutdown()
+
+    results.put({
+        "rows": rows,
+        "registered": registered,
+        "seed_seconds": round(seeded, 3),
+        "cold_seconds": round(cold, 3),
+        "rows_per_second": round(rows / cold, 1),
+        "warm_seconds": round(warm, 3),
+    })
+
+
+def _burst_child(workdir: str, env: dict, count: int, due: float, timeout: float, results):
+    _enter(workdir, env)
+    from sqlalchemy import func, select
+    from benchmarks._data import seed_reminders
+
+    seed_reminders(count, datetime.utcfromtimestamp(due))
+
+    from app import scheduler
+    from app.database import SessionLocal
+    from app.models import Reminder
+
+    scheduler.start_scheduler()
+
+    # Settled once no reminder still waits for its first attempt
+    deadline = due + timeout
+    waiting = count
+    while time.time() < deadline:
+        with SessionLocal() as db:
+            waiting = db.scalar(select(func.count()).select_from(Reminder).where(Reminder.status == "scheduled"))
+        if not waiting and time.time() > due:
+            break
+        time.sleep(0.05)
+    settled_at = time.time()
+
+    with SessionLocal() as db:
+        statuses = dict(db.execute(select(Reminder.status, func.count()).group_by(Reminder.status)).all())
+    scheduler.stop_scheduler()
+
+    results.put({"settled_at": settled_at, "waiting": waiting, "statuses": statuses})
+
+
+# --- Scenarios -------------------------------------------------------------
+
+def _api(args, rows: int = 0, **env):
+    """The app under uvicorn in a child process, on a fresh database."""
+    from benchmarks._server import ApiProcess
+
+    workdir = tempfile.mkdtemp(prefix="bench-suite-")
+    return ApiProcess(_environment(workdir, args, **env), workdir, seed_rows=rows)
+
+
+async def _crud_load(base_url: str, clients: int, operations: int) -> dict:
+    import aiohttp
+
+    latencies = {"create": [], "get": [], "update": [], "delete": []}
+    remaining = iter(range(operations // 4))
+    due = (datetime.utcnow() + timedelta(days=1)).isoformat()
+
+    async def timed(name, request):
+        started = time.perf_counter()
+        async with request as response:
+            body = await response.read()
+            assert response.status < 300, (name, response.status, body[:200])
+        latencies[name].append(time.perf_counter() - started)
+        return body
+
+    async def client(session):
+        url = f"{base_url}/api/reminders/"
+        for i in remaining:
+            payload = {
+                "title": f"CRUD {i}",
+                "message": f"CRUD benchmark reminder {i}",
+                "phone_number": "+14155550100",
+                "scheduled_time": due,
+                "timezone": "UTC",
+            }
+            created = json.loads(await timed("create", session.post(url, json=payload)))
+            await timed("get", session.get(f"{url}{created['id']}"))
+            await timed("update", session.put(f"{url}{created['id']}", json={"title": f"CRUD {i} updated"}))
+            await timed("delete", session.delete(f"{url}{created['id']}"))
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=clients)) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    done = sum(len(samples) for samples in latencies.values())
+    return {
+        "clients": clients,
+        "operations": done,
+        "ops_per_second": round(done / elapsed, 1),
+        **{name: latency_summary(samples) for name, samples in latencies.items()},
+    }
+
+
+def run_crud(context, args) -> dict:
+    with _api(args) as base_url:
+        return asyncio.run(_crud_load(base_url, args.clients, args.crud_ops))
+
+
+async def _pagination_load(base_url: str, rows: int, page_size: int, repeat: int) -> dict:
+    import aiohttp
+
+    url = f"{base_url}/api/reminders/"
+
+    async def get(session, **params) -> tuple:
+        started = time.perf_counter()
+        async with session.get(url, params={"limit": page_size, **params}) as response:
+            await response.read()
+            assert response.status == 200, await response.text()
+            return time.perf_counter() - started, response.headers.get("X-Next-Cursor")
+
+    async with aiohttp.ClientSession() as session:
+        # Walk every page, keeping the cursor of each
+        cursors = [None]
+        page_latencies = []
+        started = time.perf_counter()
+        while True:
+            params = {"cursor": cursors[-1]} if cursors[-1] else {}
+            elapsed, next_cursor = await get(session, **params)
+            page_latencies.append(elapsed)
+            if not next_cursor:
+                break
+            cursors.append(next_cursor)
+        walk_seconds = time.perf_counter() - started
+
+        depths = []
+        for fraction in (0, 0.25, 0.5, 0.75, 0.99):
+            page = min(len(cursors) - 1, int(len(cursors) * fraction))
+            skip, cursor = [], []
+            for _ in range(repeat):
+                skip.append((await get(session, skip=page * page_size))[0])
+                params = {"cursor": cursors[page]} if cursors[page] else {}
+                cursor.append((await get(session, **params))[0])
+            depths.append({
+                "offset": page * page_size,
+                "skip_ms": _ms(percentile(skip, 0.5)),
+                "cursor_ms": _ms(percentile(cursor, 0.5)),
+            })
+
+    return {
+        "rows": rows,
+        "page_size": page_size,
+        "pages": len(page_latencies),
+        "walk_seconds": round(walk_seconds, 3),
+        "rows_per_second": round(rows / walk_seconds, 1),
+        "page": latency_summary(page_latencies),
+        "depth": depths,
+    }
+
+
+def run_pagination(context, args) -> dict:
+    with _api(args, rows=args.rows, CACHE_TTL="0") as base_url:
+        return asyncio.run(_pagination_load(base_url, args.rows, args.page_size, args.repeat))
+
+
+def run_reload(context, args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench-suite-")
+    results = context.Queue()
+    process = context.Process(
+        target=_reload_child, args=(workdir, _environment(workdir, args), args.rows, results)
+    )
+    process.start()
+    result = results.get()
+    process.join()
+    return {"backend": args.backend, **result}
+
+
+def run_burst(context, args) -> dict:
+    from collections import Counter
+
+    from benchmarks._data import message_for
+    from benchmarks._server import fake_twilio
+
+    workdir = tempfile.mkdtemp(prefix="bench-suite-")
+    results = context.Queue()
+    arrivals = {}
+    calls = Counter()
+
+    with fake_twilio(calls=calls, arrivals=arrivals, latency=args.twilio_latency,
+                     error_rate=args.twilio_error_rate, error_code=args.twilio_error_code) as twilio_url:
+        # The child seeds and reloads before the due time
+        due = time.time() + args.lead
+        env = _environment(workdir, args, TWILIO_API_BASE_URL=twilio_url)
+        process = context.Process(target=_burst_child, args=(workdir, env, args.burst, due, args.timeout, results))
+        process.start()
+        result = results.get()
+        process.join()
+
+    lags = [arrivals[message_for(i)] - due for i in range(args.burst) if message_for(i) in arrivals]
+    return {
+        "backend": args.backend,
+        "reminders": args.burst,
+        "twilio_latency_ms": _ms(args.twilio_latency),
+        "twilio_error_rate": args.twilio_error_rate,
+        "called": len(lags),
+        "requests": sum(calls.values()),
+        "unsettled": result["waiting"],
+        "settle_seconds": round(result["settled_at"] - due, 3),
+        "calls_per_second": round(len(lags) / max(lags), 1) if lags and max(lags) > 0 else None,
+        "lag": latency_summary(lags),
+        "statuses": result["statuses"],
+    }
+
+
+RUNNERS = {
+    "crud": run_crud,
+    "pagination": run_pagination,
+    "reload": run_reload,
+    "burst": run_burst,
+}
+
+
+# --- Reporting -------------------------------------------------------------
+
+def _flatten(value, prefix: str = "") -> dict:
+    """Numeric leaves as {"crud.get.p50_ms": 1.2, "pagination.depth.2.skip_ms": ...}."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+        return {prefix: value} if is_number else {}
+
+    flat = {}
+    for key, child in items:
+        flat.update(_flatten(child, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
+
+
+def compare(baseline: dict, current: dict) -> list:
+    """(metric, baseline, current, change %) for every metric in both runs."""
+    before, after = _flatten(baseline["results"]), _flatten(current["results"])
+    rows = []
+    for metric, value in after.items():
+        if metric not in before:
+            continue
+        old = before[metric]
+        change = (value - old) / old * 100 if old else None
+        rows.append((metric, old, value, change))
+    return rows
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--backend", default="apscheduler", help="SCHEDULER_BACKEND for every scenario")
+    parser.add_argument("--out", help="write results to this JSON file (default: stdout)")
+    parser.add_argument("--baseline", help="previous --out file to compare against")
+
+    parser.add_argument("--clients", type=int, default=20, help="crud: concurrent clients")
+    parser.add_argument("--crud-ops", type=int, default=4000, help="crud: requests in total")
+    parser.add_argument("--rows", type=int, default=50000, help="pagination, reload: reminders seeded")
+    parser.add_argument("--page-size", type=int, default=100, help="pagination: limit per page")
+    parser.add_argument("--repeat", type=int, default=5, help="pagination: requests per depth")
+    parser.add_argument("--burst", type=int, default=2000, help="burst: reminders due at once")
+    parser.add_argument("--lead", type=float, default=10, help="burst: seconds to seed and start before the due time")
+    parser.add_argument("--timeout", type=float, default=300, help="burst: give up this long after the due time")
+    parser.add_argument("--twilio-latency", type=float, default=0.05, help="seconds per fake Twilio call")
+    parser.add_argument("--twilio-error-rate", type=float, default=0.0, help="share of calls failing")
+    parser.add_argument("--twilio-error-code", type=int, default=20429, help="Twilio error code of failures")
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+
+    context = multiprocessing.get_context("spawn")
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": {},
+    }
+
+    for name in args.scenarios.split(","):
+        if name not in RUNNERS:
+            parser.error(f"unknown scenario {name!r} (choose from {', '.join(SCENARIOS)})")
+        print(f"Running {name}...", file=sys.stderr)
+        started = time.perf_counter()
+        report["results"][name] = RUNNERS[name](context, args)
+        print(f"  {name} done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as out:
+            out.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            rows = compare(json.load(baseline), report)
+        print(f"\n{'metric':<40} {'baseline':>12} {'current':>12} {'change':>8}", file=sys.stderr)
+        for metric, old, new, change in rows:
+            shown = f"{change:+.1f}%" if change is not None else "-"
+            print(f"{metric:<40} {old:>12.6g} {new:>12.6g} {shown:>8}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Shared test setup.
+
+The app reads its settings when it is imported, so they are set here,
+before any test imports it: temporary SQLite databases with two shards
+(so cross-shard paths run), the scheduler in worker mode with the tick
+backend (API processes only write rows and notifications, and no jobs
+are kept) and no real Twilio account.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+
+WORK_DIR = tempfile.mkdtemp(prefix="reminder-tests-")
+
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{WORK_DIR}/reminders.db",
+    SHARD_DATABASE_URLS=f"sqlite:///{WORK_DIR}/reminders_1.db",
+    SCHEDULER_JOBSTORE_URL=f"sqlite:///{WORK_DIR}/scheduler_jobs.db",
+    SCHEDULER_MODE="worker",
+    SCHEDULER_BACKEND="tick",
+    CACHE_SHARED="false",
+    TWILIO_VALIDATE_SIGNATURE="false",
+    LOG_LEVEL="WARNING",
+)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the tables once for the whole run."""
+    from app.database import init_db
+
+    init_db()
+
+
+@pytest.fixture
+def db_tables():
+    """Empty every table on every shard, and what is cached of them, after the test."""
+    yield
+
+    from sqlalchemy import delete
+
+    from app.cache import reminder_cache
+    from app.counters import reminder_counts
+    from app.database import Base, shards
+    from app.idempotency import idempotency_store
+
+    for shard in shards:
+        with shard.engine.begin() as connection:
+            for table in reversed(Base.metadata.sorted_tables):
+                connection.execute(delete(table))
+
+    reminder_cache.clear()
+    reminder_counts.entries.clear()
+    idempotency_store.entries.clear()
+
+
+@pytest.fixture(scope="session")
+def api():
+    """TestClient on the app, started once for the whole run."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def client(api, db_tables):
+    """The app's TestClient, with the tables emptied after the test."""
+    return api
+
+
+@pytest.fixture
+def make_reminders(db_tables):
+    """
+    Insert reminders directly (no API, no scheduling) and return their ids.
+
+    make_reminders(count, shard=0, **columns); scheduled_time defaults to
+    a minute ago, so the rows are due.
+    """
+    from sqlalchemy import insert
+
+    from app.database import shards
+    from app.models import Reminder
+
+    def make(count: int = 1, shard: int = 0, **columns) -> list:
+        row = {
+            "title": "Call",
+            "message": "Reminder message",
+            "phone_number": "+14155550100",
+            "scheduled_time": datetime.utcnow() - timedelta(minutes=1),
+            "timezone": "UTC",
+            "status": "scheduled",
+            **columns,
+        }
+        with shards[shard].SessionLocal() as db:
+            ids = list(db.scalars(insert(Reminder).returning(Reminder.id), [row] * count))
+            db.commit()
+        return ids
+
+    return make
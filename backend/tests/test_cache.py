@@ -0,0 +1,71 @@
+"""Response cache: invalidations shared with the other API processes."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from app import leases
+from app.cache import SHARED_QUEUE_CLEAR, ResponseCache
+from app.scheduler import apply_api_notifications
+
+
+NOW = datetime(2030, 1, 1)
+
+
+def filled() -> ResponseCache:
+    cache = ResponseCache()
+    cache.put(("id", 1), b"{}")
+    cache.put(("id", 2), b"{}")
+    cache.put(("list", ("failed", None, None, None, False), ("asc", 100, None, 0)), b"[]")
+    return cache
+
+
+def test_invalidations_are_queued_only_when_shared():
+    cache = filled()
+    cache.invalidate(1, ("scheduled", "+14155550100", NOW))
+    assert cache.take_shared() == []
+
+    cache.shared = True
+    cache.invalidate(1, ("scheduled", "+14155550100", NOW))
+    cache.invalidate_lists()
+    cache.invalidate(2, share=False)
+    assert cache.take_shared() == [("invalidate", 1), ("invalidate", None)]
+    assert cache.take_shared() == []
+
+
+def test_a_long_queue_collapses_into_clear():
+    cache = ResponseCache()
+    cache.shared = True
+    for reminder_id in range(SHARED_QUEUE_CLEAR + 10):
+        cache.invalidate(reminder_id)
+
+    assert cache.take_shared() == [("clear", None)]
+
+
+def test_shared_invalidation_drops_the_reminder_and_every_list():
+    cache = filled()
+
+    # The list's filters don't match, but the sender's states are unknown
+    cache.apply_shared([("invalidate", 1)])
+
+    assert cache.get(("id", 1)) is None
+    assert cache.get(("id", 2)) is not None
+    assert [key[0] for key in cache.entries] == ["id"]
+    assert cache.take_shared() == []
+
+    cache.apply_shared([("invalidate", None), ("clear", None)])
+    assert not cache.entries
+
+
+def test_own_messages_are_skipped(monkeypatch):
+    from app import scheduler
+
+    cache = filled()
+    monkeypatch.setattr(scheduler, "reminder_cache", cache)
+
+    message = dict(action="invalidate", reminder_id=1, previous_status=None, run_at=None)
+    apply_api_notifications([SimpleNamespace(id=1, origin=leases.WORKER_ID, **message)])
+    assert cache.get(("id", 1)) is not None
+
+    apply_api_notifications([SimpleNamespace(id=2, origin="another-process", **message)])
+    assert cache.get(("id", 1)) is None
+    assert cache.shared_received == 1
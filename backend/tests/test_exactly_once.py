@@ -0,0 +1,29 @@
+"""Several scheduler processes call each reminder once (benchmarks/check_exactly_once.py)."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Test settings from conftest.py the check must not inherit: it sets up
+# its own single database
+TEST_ONLY_SETTINGS = ("DATABASE_URL", "SHARD_DATABASE_URLS", "SCHEDULER_JOBSTORE_URL",
+                      "SCHEDULER_MODE", "SCHEDULER_BACKEND")
+
+
+@pytest.mark.parametrize("backend", ["heap", "tick"])
+def test_killed_worker_loses_no_reminders(backend):
+    env = {name: value for name, value in os.environ.items() if name not in TEST_ONLY_SETTINGS}
+
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.check_exactly_once",
+         "--workers", "2", "--reminders", "50", "--backend", backend, "--timeout", "60"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120,
+    )
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert result.stdout.rstrip().endswith("OK")
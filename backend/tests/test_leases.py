@@ -0,0 +1,131 @@
+"""Trigger claims: a reminder is claimed by one worker at a time."""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app import leases
+from app.database import SessionLocal
+from app.models import Reminder
+
+
+def race(target, threads: int = 8) -> list:
+    """Run target(db) in several threads at once; return their results."""
+    barrier = threading.Barrier(threads)
+    results = [None] * threads
+
+    def run(index):
+        with SessionLocal() as db:
+            barrier.wait()
+            results[index] = target(db)
+
+    workers = [threading.Thread(target=run, args=(index,)) for index in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def expire_leases(ids):
+    with SessionLocal() as db:
+        db.execute(
+            update(Reminder).where(Reminder.id.in_(ids))
+            .values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+        )
+        db.commit()
+
+
+def test_claim_is_exclusive(make_reminders, monkeypatch):
+    [reminder_id] = make_reminders()
+
+    assert race(lambda db: leases.claim(db, reminder_id)).count(True) == 1
+
+    # Another worker can't take a live claim
+    monkeypatch.setattr(leases, "WORKER_ID", "other-worker")
+    with SessionLocal() as db:
+        assert not leases.claim(db, reminder_id)
+
+
+def test_claim_skips_finished_and_unknown_reminders(make_reminders):
+    [completed] = make_reminders(status="completed")
+
+    with SessionLocal() as db:
+        assert not leases.claim(db, completed)
+        assert not leases.claim(db, completed + 1000)
+
+
+def test_expired_claim_is_taken_over(make_reminders, monkeypatch):
+    ids = make_reminders(3)
+    with SessionLocal() as db:
+        assert all(leases.claim(db, reminder_id) for reminder_id in ids)
+    expire_leases(ids[:2])
+
+    monkeypatch.setattr(leases, "WORKER_ID", "other-worker")
+    with SessionLocal() as db:
+        assert sorted(leases.claim_expired(db)) == ids[:2]
+        assert leases.claim_expired(db) == []
+        assert db.get(Reminder, ids[0]).claimed_by == "other-worker"
+        assert db.get(Reminder, ids[2]).claimed_by != "other-worker"
+
+
+def test_claim_due_splits_due_rows(make_reminders):
+    due = make_reminders(200)
+    retry_due = make_reminders(10, status="retrying",
+                               next_attempt_at=datetime.utcnow() - timedelta(seconds=1))
+    make_reminders(5, scheduled_time=datetime.utcnow() + timedelta(hours=1))
+    make_reminders(5, status="retrying", next_attempt_at=datetime.utcnow() + timedelta(hours=1))
+    now = datetime.utcnow()
+
+    batches = race(lambda db: [row.id for row in leases.claim_due(db, now, 50)])
+    claimed = [reminder_id for batch in batches for reminder_id in batch]
+
+    assert len(claimed) == len(set(claimed))
+    assert sorted(claimed) == sorted(due + retry_due)
+    assert all(len(batch) <= 50 for batch in batches)
+
+
+@pytest.mark.parametrize("status", ["scheduled", "retrying"])
+def test_claim_due_skips_live_claims(make_reminders, status):
+    ids = make_reminders(4, status=status, next_attempt_at=datetime.utcnow() - timedelta(seconds=1))
+    with SessionLocal() as db:
+        assert leases.claim(db, ids[0])
+        rows = leases.claim_due(db, datetime.utcnow(), 10)
+
+    assert sorted(row.id for row in rows) == ids[1:]
+
+
+def test_claim_waits_until_due(make_reminders):
+    later = datetime.utcnow() + timedelta(hours=1)
+    [scheduled] = make_reminders(scheduled_time=later)
+    [retrying] = make_reminders(status="retrying", next_attempt_at=later)
+    [triggered] = make_reminders(scheduled_time=later, next_attempt_at=datetime.utcnow())
+
+    with SessionLocal() as db:
+        assert not leases.claim(db, scheduled)
+        assert not leases.claim(db, retrying)
+        # A manual trigger made it due before its scheduled_time
+        assert leases.claim(db, triggered)
+
+
+def test_stale_job_is_registered_again(make_reminders, monkeypatch):
+    """A job left at the old time by another process's reschedule places no call."""
+    from app import scheduler
+
+    later = datetime.utcnow().replace(microsecond=0) + timedelta(hours=1)
+    [moved] = make_reminders(scheduled_time=later)
+    [retrying] = make_reminders(status="retrying", next_attempt_at=later + timedelta(minutes=5))
+    [completed] = make_reminders(status="completed")
+    added, submitted = [], []
+    monkeypatch.setattr(scheduler.partitions[0].backend, "add", lambda *job: added.append(job))
+    monkeypatch.setattr(scheduler.dispatcher, "submit", lambda *call, **_: submitted.append(call))
+
+    for reminder_id in (moved, retrying, completed):
+        scheduler.trigger_reminder(reminder_id)
+
+    assert submitted == []
+    assert added == [(moved, later), (retrying, later + timedelta(minutes=5))]
+    with SessionLocal() as db:
+        assert db.get(Reminder, moved).claimed_by is None
@@ -0,0 +1,201 @@
+"""Reminder API: cursor paging across shards and Idempotency-Key handling."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import SHARD_ID_BITS, shard_for_phone, shards
+from app.idempotency import REPLAYED_HEADER, idempotency_store
+
+
+def reminder_body(**fields) -> dict:
+    return {
+        "title": "Call",
+        "message": "Reminder message",
+        "phone_number": "+14155550100",
+        "scheduled_time": (datetime.utcnow() + timedelta(days=1)).isoformat() + "Z",
+        "timezone": "UTC",
+        **fields,
+    }
+
+
+def listed(client, **params) -> list:
+    response = client.get("/api/reminders/", params=params)
+    assert response.status_code == 200
+    return [reminder["id"] for reminder in response.json()]
+
+
+def paged(client, **params) -> list:
+    """Every id of a list, following X-Next-Cursor page by page."""
+    ids, cursor = [], None
+    while True:
+        response = client.get("/api/reminders/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        ids += [reminder["id"] for reminder in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids
+
+
+@pytest.fixture
+def spread(make_reminders):
+    """
+    30 reminders over both shards, three per scheduled_time, so pages
+    break inside groups of equal times.
+
+    Returns:
+        Their ids in list order (scheduled_time, id)
+    """
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=1)
+    rows = []
+    for index in range(30):
+        scheduled_time = start + timedelta(minutes=index // 3)
+        [reminder_id] = make_reminders(shard=index % 2, scheduled_time=scheduled_time,
+                                       phone_number=f"+1415555{index % 2:04d}")
+        rows.append((scheduled_time, reminder_id))
+    return [reminder_id for _, reminder_id in sorted(rows)]
+
+
+def test_cursor_pages_across_shards(client, spread):
+    assert {reminder_id >> SHARD_ID_BITS for reminder_id in spread} == {0, 1}
+
+    assert paged(client, limit=7) == spread
+    assert paged(client, limit=7, order="desc") == spread[::-1]
+    assert paged(client, limit=1000) == spread
+
+
+def test_cursor_pages_with_filters(client, spread, make_reminders):
+    make_reminders(3, status="completed", scheduled_time=datetime.utcnow() + timedelta(days=1))
+
+    response = client.get("/api/reminders/", params={"status": "scheduled", "limit": 4})
+    assert response.headers["X-Total-Count"] == "30"
+    assert paged(client, status="scheduled", limit=4) == spread
+    # That number's reminders were all put on shard 1
+    assert paged(client, phone_number="+14155550001", limit=4) == [
+        reminder_id for reminder_id in spread if reminder_id >> SHARD_ID_BITS == 1
+    ]
+
+
+def test_offset_pages_across_shards(client, spread):
+    assert listed(client, limit=7, skip=7) == spread[7:14]
+    assert listed(client, limit=7, skip=28) == spread[28:]
+
+
+def test_malformed_cursor(client):
+    assert client.get("/api/reminders/", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_create_is_replayed_for_the_same_key(client):
+    body = reminder_body()
+    headers = {"Idempotency-Key": "create-1"}
+
+    first = client.post("/api/reminders/", json=body, headers=headers)
+    again = client.post("/api/reminders/", json=body, headers=headers)
+
+    assert first.status_code == again.status_code == 201
+    assert again.json() == first.json()
+    assert again.headers[REPLAYED_HEADER] == "true"
+    assert REPLAYED_HEADER not in first.headers
+    assert listed(client) == [first.json()["id"]]
+
+    # From the table once this process has forgotten it
+    idempotency_store.entries.clear()
+    stored = client.post("/api/reminders/", json=body, headers=headers)
+    assert stored.json() == first.json()
+    assert stored.headers[REPLAYED_HEADER] == "true"
+
+
+def test_key_reused_for_another_request_is_rejected(client):
+    headers = {"Idempotency-Key": "create-2"}
+    first = client.post("/api/reminders/", json=reminder_body(), headers=headers)
+
+    other = client.post("/api/reminders/", json=reminder_body(title="Other"), headers=headers)
+
+    assert other.status_code == 422
+    assert listed(client) == [first.json()["id"]]
+
+
+def test_keys_are_scoped_per_endpoint(client):
+    headers = {"Idempotency-Key": "shared-key"}
+    created = client.post("/api/reminders/", json=reminder_body(), headers=headers)
+    bulk = client.post("/api/reminders/bulk", json=[reminder_body(title="Bulk")], headers=headers)
+
+    assert created.status_code == 201
+    assert bulk.status_code == 200 and bulk.json()["created"] == 1
+    assert len(listed(client)) == 2
+
+
+def test_bulk_reschedule_is_applied_once(client, make_reminders):
+    scheduled_time = datetime.utcnow().replace(microsecond=0) + timedelta(days=1)
+    ids = make_reminders(2, scheduled_time=scheduled_time)
+    ids += make_reminders(2, shard=1, scheduled_time=scheduled_time)
+    request = {"ids": ids, "shift_minutes": 30}
+    headers = {"Idempotency-Key": "shift-1"}
+
+    first = client.post("/api/reminders/bulk/reschedule", json=request, headers=headers)
+    again = client.post("/api/reminders/bulk/reschedule", json=request, headers=headers)
+
+    assert first.json()["affected"] == 4
+    assert again.json() == first.json()
+    for reminder_id in ids:
+        moved = client.get(f"/api/reminders/{reminder_id}").json()["scheduled_time"]
+        assert datetime.fromisoformat(moved.rstrip("Z")) == scheduled_time + timedelta(minutes=30)
+
+    other = client.post("/api/reminders/bulk/reschedule", json={**request, "shift_minutes": 60}, headers=headers)
+    assert other.status_code == 422
+
+
+def test_import_key_covers_the_file(client):
+    headers = {"Idempotency-Key": "import-1", "Content-Type": "application/x-ndjson"}
+    upload = "\n".join(
+        f'{{"title": "Import", "message": "Reminder message", "phone_number": "+1415555{index:04d}",'
+        f' "scheduled_time": "{(datetime.utcnow() + timedelta(days=1)).isoformat()}Z", "timezone": "UTC"}}'
+        for index in range(3)
+    )
+
+    first = client.post("/api/reminders/import", content=upload, headers=headers)
+    again = client.post("/api/reminders/import", content=upload, headers=headers)
+    other = client.post("/api/reminders/import", content=upload.replace("Import", "Other"), headers=headers)
+
+    assert first.status_code == 200 and first.json()["created"] == 3
+    assert again.json() == first.json() and again.headers[REPLAYED_HEADER] == "true"
+    assert other.status_code == 422
+    assert len(listed(client)) == 3
+
+
+def test_phone_numbers_spread_over_shards():
+    # The fixtures above rely on the tests running with two shards
+    assert len(shards) == 2
+    assert {shard_for_phone(f"+1415555{index:04d}").index for index in range(10)} == {0, 1}
+
+
+def test_occurrences_are_listed_on_request(client, make_reminders):
+    later = datetime.utcnow() + timedelta(days=1)
+    [series] = make_reminders(scheduled_time=later, recurrence="FREQ=DAILY", recurrence_start=later)
+    occurrences = make_reminders(2, status="completed", series_id=series)
+
+    response = client.get("/api/reminders/")
+    assert [reminder["id"] for reminder in response.json()] == [series]
+    assert response.headers["X-Total-Count"] == "1"
+
+    response = client.get("/api/reminders/", params={"include_occurrences": "true"})
+    assert sorted(reminder["id"] for reminder in response.json()) == sorted([series, *occurrences])
+    assert response.headers["X-Total-Count"] == "3"
+
+
+def test_manual_trigger_keeps_the_scheduled_time(client, make_reminders):
+    from app import leases
+    from app.database import SessionLocal
+    from app.models import Reminder
+
+    later = datetime.utcnow().replace(microsecond=0) + timedelta(days=1)
+    [reminder_id] = make_reminders(scheduled_time=later)
+    [completed] = make_reminders(status="completed")
+
+    assert client.post(f"/api/reminders/debug/trigger/{reminder_id}").status_code == 200
+    assert client.post(f"/api/reminders/debug/trigger/{completed}").status_code == 409
+
+    # The worker (tick backend) finds it due now
+    with SessionLocal() as db:
+        assert [row.id for row in leases.claim_due(db, datetime.utcnow(), 10)] == [reminder_id]
+        assert db.get(Reminder, reminder_id).scheduled_time == later
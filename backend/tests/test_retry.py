@@ -0,0 +1,100 @@
+"""Call results: retries with backoff, dead letters and their replay."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.database import shards
+from app.leases import WORKER_ID
+from app.models import DeadLetter, Reminder
+from app.retry import RETRY_MAX_ATTEMPTS
+from app.scheduler import record_call_results, replay_dead_letters
+from app.twilio import CallError
+
+
+def load(reminder_id: int, shard: int = 0):
+    with shards[shard].SessionLocal() as db:
+        reminder = db.get(Reminder, reminder_id)
+        letters = db.scalars(select(DeadLetter).where(DeadLetter.reminder_id == reminder_id)).all()
+        db.expunge_all()
+    return reminder, letters
+
+
+@pytest.mark.parametrize("shard", [0, 1])
+def test_placed_call_completes(make_reminders, shard):
+    [reminder_id] = make_reminders(shard=shard, claimed_by=WORKER_ID, error_message="earlier failure")
+
+    record_call_results([(reminder_id, "CA123", None)])
+
+    reminder, letters = load(reminder_id, shard)
+    assert (reminder.status, reminder.call_sid, reminder.attempts) == ("completed", "CA123", 1)
+    assert reminder.error_message is None
+    assert reminder.claimed_by is None
+    assert letters == []
+
+
+def test_transient_failure_retries(make_reminders):
+    [reminder_id] = make_reminders(claimed_by=WORKER_ID)
+    before = datetime.utcnow()
+
+    record_call_results([(reminder_id, None, CallError("timeout", transient=True))])
+
+    reminder, letters = load(reminder_id)
+    assert (reminder.status, reminder.attempts, reminder.error_message) == ("retrying", 1, "timeout")
+    assert reminder.next_attempt_at >= before
+    assert reminder.claimed_by is None and reminder.lease_expires_at is None
+    assert letters == []
+
+
+def test_last_attempt_is_dead_lettered(make_reminders):
+    [reminder_id] = make_reminders(status="retrying", attempts=RETRY_MAX_ATTEMPTS - 1)
+
+    record_call_results([(reminder_id, None, CallError("busy", transient=True, code=503))])
+
+    reminder, letters = load(reminder_id)
+    assert (reminder.status, reminder.attempts, reminder.next_attempt_at) == ("failed", RETRY_MAX_ATTEMPTS, None)
+    assert [(letter.attempts, letter.error_code, letter.error_message) for letter in letters] == [
+        (RETRY_MAX_ATTEMPTS, 503, "busy")
+    ]
+
+
+def test_permanent_failure_is_dead_lettered_at_once(make_reminders):
+    [reminder_id] = make_reminders()
+
+    record_call_results([(reminder_id, None, CallError("invalid number", transient=False, code=21211))])
+
+    reminder, letters = load(reminder_id)
+    assert (reminder.status, reminder.attempts) == ("failed", 1)
+    assert [letter.error_code for letter in letters] == [21211]
+
+
+def test_results_are_recorded_per_shard(make_reminders):
+    [first] = make_reminders(shard=0)
+    [second] = make_reminders(shard=1)
+
+    record_call_results([
+        (first, None, CallError("timeout", transient=True)),
+        (second, "CA456", None),
+        (second + 1000, "CA789", None),  # unknown: ignored
+    ])
+
+    assert load(first)[0].status == "retrying"
+    assert load(second, 1)[0].status == "completed"
+
+
+def test_replay_dead_letters(make_reminders):
+    [first] = make_reminders(shard=0)
+    [second] = make_reminders(shard=1)
+    record_call_results([(first, None, CallError("no", transient=False)),
+                         (second, None, CallError("no", transient=False))])
+
+    assert replay_dead_letters(rate=10) == 2
+    # Already replayed
+    assert replay_dead_letters(rate=10) == 0
+
+    for reminder_id, shard in ((first, 0), (second, 1)):
+        reminder, letters = load(reminder_id, shard)
+        assert (reminder.status, reminder.attempts) == ("retrying", 0)
+        assert reminder.next_attempt_at is not None
+        assert all(letter.replayed_at is not None for letter in letters)
@@ -0,0 +1,169 @@
+"""Scheduler backends: jobs fire once, in time order, unless removed."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.scheduler_backends import APSchedulerBackend, HeapBackend, TickBackend
+
+
+# Reminder ids the backends called back with, in call order
+fired = []
+fired_lock = threading.Lock()
+
+
+def record(reminder_id):
+    """Backend callback (module level, so APScheduler can store a reference to it)."""
+    with fired_lock:
+        fired.append(reminder_id)
+
+
+def wait_for(count: int, timeout: float = 5) -> list:
+    """The fired ids once there are ``count`` of them (or the timeout passed)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and len(fired) < count:
+        time.sleep(0.02)
+    with fired_lock:
+        return list(fired)
+
+
+@pytest.fixture(autouse=True)
+def clear_fired():
+    fired.clear()
+
+
+@pytest.fixture
+def heap():
+    # One worker, so callbacks run in the order the heap pops them
+    backend = HeapBackend(record, workers=1)
+    backend.start()
+    yield backend
+    backend.shutdown()
+
+
+@pytest.fixture
+def apscheduler(tmp_path):
+    backend = APSchedulerBackend(record, create_engine(f"sqlite:///{tmp_path}/jobs.db"))
+    backend.start()
+    yield backend
+    backend.shutdown()
+
+
+def test_heap_fires_in_time_order(heap):
+    now = datetime.utcnow()
+    heap.add_many([
+        (3, now + timedelta(milliseconds=450)),
+        (1, now + timedelta(milliseconds=150)),
+        (2, now + timedelta(milliseconds=300)),
+    ])
+    heap.add(4, now + timedelta(milliseconds=100))
+
+    assert wait_for(4) == [4, 1, 2, 3]
+    assert heap.pending_count() == 0
+
+
+def test_heap_remove_and_reschedule(heap):
+    now = datetime.utcnow()
+    heap.add_many([(1, now + timedelta(milliseconds=200)), (2, now + timedelta(milliseconds=300)),
+                   (3, now + timedelta(milliseconds=400))])
+
+    assert heap.remove(2)
+    assert not heap.remove(2)
+    assert heap.remove_many([3, 99]) == 1
+    # The old entry is left in the heap but must not fire
+    heap.reschedule(1, now + timedelta(milliseconds=500))
+    heap.add(4, now + timedelta(milliseconds=250))
+
+    assert wait_for(2) == [4, 1]
+    time.sleep(0.2)
+    assert fired == [4, 1]
+    assert heap.missing([1, 2, 3, 4, 5]) == [1, 2, 3, 4, 5]
+
+
+def test_heap_wakes_for_an_earlier_job(heap):
+    now = datetime.utcnow()
+    heap.add(1, now + timedelta(seconds=30))
+    heap.add(2, now + timedelta(milliseconds=100))
+
+    assert wait_for(1) == [2]
+    assert [job["id"] for job in heap.jobs()] == ["reminder-1"]
+
+
+def test_tick_calls_on_tick_until_shutdown():
+    ticks = []
+    backend = TickBackend(ticks.append, interval=0.05)
+    backend.start()
+    try:
+        # Jobs are no-ops: the reminders table is the schedule
+        backend.add_many([(1, datetime.utcnow())])
+        assert backend.pending_count() == 0
+        assert backend.missing([1]) == []
+
+        deadline = time.monotonic() + 5
+        while len(ticks) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        backend.shutdown()
+
+    assert len(ticks) >= 3
+    assert ticks == sorted(ticks)
+    assert not backend.running
+    count = len(ticks)
+    time.sleep(0.15)
+    assert len(ticks) == count
+
+
+def test_apscheduler_add_remove_fire(apscheduler):
+    backend = apscheduler
+    now = datetime.utcnow()
+
+    backend.add(3, now + timedelta(milliseconds=600))
+    backend.add(1, now + timedelta(milliseconds=300))
+    backend.add(2, now + timedelta(milliseconds=450))
+    backend.add(4, now + timedelta(days=1))
+    assert backend.remove(2)
+    assert not backend.remove(2)
+    assert backend.remove_many([4, 99]) == 1
+    backend.reschedule(5, now + timedelta(milliseconds=200))
+
+    assert wait_for(3) == [5, 1, 3]
+    assert backend.pending_count() == 0
+
+
+def test_apscheduler_add_many_uses_one_transaction(apscheduler):
+    backend = apscheduler
+    later = datetime.utcnow() + timedelta(days=1)
+
+    backend.add_many((reminder_id, later) for reminder_id in range(1, 201))
+    # Adding again replaces, like add_job(replace_existing=True)
+    backend.add_many([(1, later + timedelta(hours=1))])
+
+    assert backend.pending_count() == 200
+    assert backend.missing([1, 200, 201]) == [201]
+    job = backend.jobstore.lookup_job("reminder-1")
+    assert job.args == (1,)
+    assert job.next_run_time.replace(tzinfo=None) == later + timedelta(hours=1)
+
+
+def test_apscheduler_batched_jobs_fire(apscheduler):
+    backend = apscheduler
+    soon = datetime.utcnow() + timedelta(milliseconds=300)
+
+    backend.add_many([(2, soon + timedelta(milliseconds=200)), (1, soon)])
+
+    assert wait_for(2) == [1, 2]
+
+
+def test_apscheduler_batched_jobs_match_add_job(apscheduler):
+    backend = apscheduler
+    later = datetime.utcnow() + timedelta(days=1)
+
+    backend.add(1, later)
+    backend.add_many([(2, later)])
+
+    single, batched = (backend.jobstore.lookup_job(f"reminder-{i}") for i in (1, 2))
+    for attr in ("func_ref", "executor", "misfire_grace_time", "coalesce", "max_instances", "next_run_time"):
+        assert getattr(batched, attr) == getattr(single, attr), attr
@@ -82,17 +82,24 @@ const loadReminder = async () => {
     setPhoneNumber(formatPhoneForDisplay(reminder.phone_number))
     setTimezone(reminder.timezone || "America/New_York")
 
-    // Parse scheduled_time correctly
-    // The scheduled_time from API is a string like "2026-01-01T22:20:00"
-    // We need to parse it as-is, not convert timezones
-    const scheduledDateTime = reminder.scheduled_time
-    
-    // Extract date and time parts directly from the string
-    // Format: "2026-01-01T22:20:00" or "2026-01-01T22:20:00.000000"
-    const [datePart, timePart] = scheduledDateTime.split('T')
-    
-    setDate(datePart) // YYYY-MM-DD format (perfect for input[type="date"])
-    setTime(timePart.substring(0, 5)) // HH:MM format (perfect for input[type="time"])
+    // scheduled_time from the API is UTC ("2026-01-02T03:20:00Z");
+    // show it as wall-clock time in the reminder's own timezone
+    const parts = Object.fromEntries(
+      new Intl.DateTimeFormat("en-CA", {
+        timeZone: reminder.timezone || "America/New_York",
+        year: "numeric",
+        month: "2-digit",
+        day: "2-digit",
+        hour: "2-digit",
+        minute: "2-digit",
+        hourCycle: "h23",
+      })
+        .formatToParts(new Date(reminder.scheduled_time))
+        .map((part) => [part.type, part.value])
+    )
+
+    setDate(`${parts.year}-${parts.month}-${parts.day}`) // YYYY-MM-DD (input[type="date"])
+    setTime(`${parts.hour}:${parts.minute}`) // HH:MM (input[type="time"])
 
   } catch (error) {
     console.error("Error loading reminder:", error)
@@ -191,15 +198,15 @@ const loadReminder = async () => {
     try {
       setIsSaving(true)
 
-      // Combine date and time
-      const scheduledTime = new Date(`${date}T${time}`)
+      // Wall-clock time in the selected timezone; the API converts it to UTC
+      const scheduledTime = `${date}T${time}:00`
 
       // Update reminder
       await updateReminder(reminderId, {
         title: title.trim(),
         message: message.trim(),
         phone_number: formatPhoneForAPI(phoneNumber),
-        scheduled_time: scheduledTime.toISOString(),
+        scheduled_time: scheduledTime,
         timezone,
       })
 
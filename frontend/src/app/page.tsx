@@ -1,6 +1,6 @@
 "use client"
 
-import { useState, useEffect } from "react"
+import { useState, useEffect, useRef } from "react"
 import { CountdownBadge } from "@/components/countdown-badge"
 import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
@@ -14,7 +14,7 @@ import { Calendar, Clock, Edit, Plus, Search, Trash2, Phone, CheckCircle2, XCirc
 import { useToast } from "@/hooks/use-toast"
 import type { Reminder, ReminderStatus } from "@/types/reminder"
 import { cn } from "@/lib/utils"
-import { getReminders, deleteReminder } from "@/lib/api-client"
+import { getReminders, deleteReminder, subscribeToReminderEvents } from "@/lib/api-client"
 import { useRouter } from "next/navigation"
 import { QuickRescheduleModal } from "@/components/quick-reschedule-modal"
 import { updateReminder } from "@/lib/api-client"
@@ -46,14 +46,49 @@ export default function DashboardPage() {
   const [reschedulingReminder, setReschedulingReminder] = useState<Reminder | null>(null)
   const [retryingReminder, setRetryingReminder] = useState<Reminder | null>(null)
 
+  // The event handler below is registered once; read the filter through a ref
+  const statusFilterRef = useRef(statusFilter)
+
   // Fetch reminders on mount
   useEffect(() => {
     fetchReminders()
   }, [])
 
-  const fetchReminders = async () => {
+  // Reminders skipped by live events while a filter was active are
+  // fetched again when it is cleared
+  useEffect(() => {
+    if (statusFilterRef.current !== statusFilter && statusFilter === "all") {
+      fetchReminders(false)
+    }
+    statusFilterRef.current = statusFilter
+  }, [statusFilter])
+
+  // Apply live changes (status updates from calls, edits in other tabs)
+  useEffect(() => {
+    return subscribeToReminderEvents((event) => {
+      if (event.type === "deleted") {
+        setReminders((prev) => prev.filter((r) => r.id !== event.id))
+      } else if (event.type === "created" || event.type === "updated" || event.type === "status") {
+        const filter = statusFilterRef.current
+        // Occurrences of recurring reminders are not in the list (only their series)
+        const matches = !event.reminder.series_id && (filter === "all" || event.reminder.status === filter)
+        setReminders((prev) =>
+          prev.some((r) => r.id === event.reminder.id)
+            ? prev.map((r) => (r.id === event.reminder.id ? event.reminder : r))
+            : matches
+              ? [...prev, event.reminder]
+              : prev
+        )
+      } else {
+        // Missed events or a bulk create, reschedule or cancel: reload the list
+        fetchReminders(false)
+      }
+    })
+  }, [])
+
+  const fetchReminders = async (showLoading = true) => {
     try {
-      setIsLoading(true)
+      if (showLoading) setIsLoading(true)
       setError(null)
       const data = await getReminders()
       setReminders(data)
@@ -382,7 +417,7 @@ const formatTime = (dateTimeString: string) => {
             </div>
             <div className="flex items-center gap-2">
               <ThemeToggle />
-              <Button variant="outline" size="lg" onClick={fetchReminders} disabled={isLoading}>
+              <Button variant="outline" size="lg" onClick={() => fetchReminders()} disabled={isLoading}>
                 <RefreshCw className={cn("h-4 w-4 mr-2", isLoading && "animate-spin")} />
                 Refresh
               </Button>
@@ -504,7 +539,7 @@ const formatTime = (dateTimeString: string) => {
               <CardDescription>{error}</CardDescription>
             </CardHeader>
             <CardFooter>
-              <Button onClick={fetchReminders} variant="outline">
+              <Button onClick={() => fetchReminders()} variant="outline">
                 <RefreshCw className="h-4 w-4 mr-2" />
                 Try Again
               </Button>
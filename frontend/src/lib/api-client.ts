@@ -5,6 +5,8 @@
  * Base URL points to FastAPI backend running on port 8000.
  */
 
+import type { ReminderStatus } from "@/types/reminder"
+
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000"
 
 /**
@@ -67,11 +69,13 @@ export interface ReminderResponse {
   phone_number: string
   scheduled_time: string
   timezone: string
-  status: "scheduled" | "completed" | "failed" | "snoozed"
+  status: ReminderStatus
   created_at: string
   updated_at: string
   call_sid?: string
   error_message?: string
+  attempts?: number
+  next_attempt_at?: string
 }
 
 /**
@@ -126,6 +130,41 @@ export async function deleteReminder(id: number): Promise<void> {
   })
 }
 
+// GET /api/reminders/events - Live reminder changes (Server-Sent Events)
+export type ReminderEvent =
+  | { type: "created" | "updated" | "status"; reminder: ReminderResponse }
+  | { type: "deleted"; id: number }
+  | { type: "bulk_created" | "bulk_rescheduled" | "bulk_deleted" | "resync" }
+
+export function subscribeToReminderEvents(
+  onEvent: (event: ReminderEvent) => void,
+  params?: { status?: string; phone_number?: string; ids?: number[] }
+): () => void {
+  const searchParams = new URLSearchParams()
+  if (params?.status) searchParams.append("status", params.status)
+  if (params?.phone_number) searchParams.append("phone_number", params.phone_number)
+  if (params?.ids?.length) searchParams.append("ids", params.ids.join(","))
+
+  const query = searchParams.toString()
+  const source = new EventSource(
+    `${API_BASE_URL}/api/reminders/events${query ? `?${query}` : ""}`
+  )
+
+  for (const type of ["created", "updated", "status"] as const) {
+    source.addEventListener(type, (e) => {
+      onEvent({ type, reminder: JSON.parse((e as MessageEvent).data) })
+    })
+  }
+  source.addEventListener("deleted", (e) => {
+    onEvent({ type: "deleted", id: JSON.parse((e as MessageEvent).data).id })
+  })
+  for (const type of ["bulk_created", "bulk_rescheduled", "bulk_deleted", "resync"] as const) {
+    source.addEventListener(type, () => onEvent({ type }))
+  }
+
+  return () => source.close()
+}
+
 // Health check
 export async function healthCheck(): Promise<{ status: string }> {
   return apiFetch<{ status: string }>("/health")
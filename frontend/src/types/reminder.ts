@@ -2,7 +2,18 @@
  * Reminder types matching backend schema
  */
 
-export type ReminderStatus = "scheduled" | "completed" | "failed" | "snoozed"
+export type ReminderStatus =
+  | "scheduled"
+  | "calling"
+  | "ringing"
+  | "answered"
+  | "completed"
+  | "busy"
+  | "no-answer"
+  | "failed"
+  | "retrying"
+  | "missed"
+  | "snoozed"
 
 export interface Reminder {
   id: number
@@ -16,4 +27,8 @@ export interface Reminder {
   updated_at: string
   call_sid?: string
   error_message?: string
+  attempts?: number
+  next_attempt_at?: string
+  recurrence?: string | null  // RRULE, e.g. "FREQ=WEEKLY;BYDAY=MO,WE"
+  series_id?: number | null   // set on occurrences of a recurring reminder
 }
\ No newline at end of file